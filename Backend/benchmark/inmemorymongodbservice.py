@@ -0,0 +1,647 @@
+import asyncio
+import copy
+import threading
+import time
+import numpy as np
+from models.helper import Helper
+from services.mongodbservice import MongoDBService
+
+
+class InMemoryMongoDBService:
+    """Represents an in-memory stand-in for MongoDBService used by the benchmarks (no cluster is needed).
+    install() replaces the data access methods of MongoDBService, so every service of the backend
+    (PapersService, AbstractChunksService, TitleChunksService, CorpusVersionService, ...) reads from and writes to the in-memory store.
+    Supported queries: equality, $in, $nin, $gt, $gte, $lt, $lte, $ne, $exists, $and and $or (also on dotted paths and arrays),
+    inclusion and exclusion projections.
+    Supported aggregation stages: $vectorSearch (brute-force cosine similarity with optional filter), $match, $project
+    (including field references and {"$meta": "vectorSearchScore"}), $group ($max, $min, $sum, $first, $push), $sort, $limit,
+    $lookup (with sub-pipeline) and $unwind.
+    Every operation can be delayed by a simulated round trip time (see configure).
+    """
+    METHODS = ["get_data", "get_data_async", "aggregate_data", "aggregate_data_async", "insert_data", "insert_data_batch",
+               "insert_one_data", "create_search_index"]
+    __SCORE_FIELD = "__vectorSearchScore"
+    __databases = {}
+    __vector_matrices = {}
+    __originals = None
+    __latency_seconds = 0.0
+    __next_id = 0
+    __lock = threading.Lock()
+
+    @staticmethod
+    def install():
+        """Replaces the data access methods of MongoDBService with the ones of the in-memory store.
+        """
+        if InMemoryMongoDBService.__originals is not None:
+            return
+
+        InMemoryMongoDBService.__originals = {name: getattr(MongoDBService, name) for name in InMemoryMongoDBService.METHODS}
+
+        for name in InMemoryMongoDBService.METHODS:
+            setattr(MongoDBService, name, getattr(InMemoryMongoDBService, name))
+
+    @staticmethod
+    def uninstall():
+        """Restores the data access methods of MongoDBService.
+        """
+        if InMemoryMongoDBService.__originals is None:
+            return
+
+        for name, method in InMemoryMongoDBService.__originals.items():
+            setattr(MongoDBService, name, method)
+
+        InMemoryMongoDBService.__originals = None
+
+    @staticmethod
+    def configure(latency_ms: float = 0.0):
+        """Configures the simulated round trip time of every operation.
+
+        Args:
+            latency_ms (float, optional): The round trip time in milliseconds. Defaults to 0.0.
+
+        Raises:
+            TypeError: Is thrown if latency_ms is not a number.
+            ValueError: Is thrown if latency_ms is negative.
+        """
+        if type(latency_ms) not in [int, float]:
+            raise TypeError("latency_ms must be a number!")
+        if latency_ms < 0:
+            raise ValueError("latency_ms cannot be negative!")
+
+        InMemoryMongoDBService.__latency_seconds = latency_ms / 1000
+
+    @staticmethod
+    def clear():
+        """Removes all databases of the in-memory store.
+        """
+        with InMemoryMongoDBService.__lock:
+            InMemoryMongoDBService.__databases = {}
+            InMemoryMongoDBService.__vector_matrices = {}
+
+    def get_data(self, db_name: str, collection_name: str, query: dict) -> list:
+        """Fetches the documents matching the query.
+
+        Args:
+            db_name (str): The name of the database.
+            collection_name (str): The collection name.
+            query (dict): The query specified as a dictionary.
+
+        Returns:
+            list: A list of retrieved results.
+        """
+        InMemoryMongoDBService.__wait()
+        return InMemoryMongoDBService.find(db_name, collection_name, query)
+
+    async def get_data_async(self, db_name: str, collection_name: str, query: dict, projection: dict = None) -> list:
+        """Fetches the documents matching the query (after the simulated round trip time).
+
+        Args:
+            db_name (str): The name of the database.
+            collection_name (str): The collection name.
+            query (dict): The query specified as a dictionary.
+            projection (dict, optional): The fields to return. Defaults to None (all fields).
+
+        Returns:
+            list: A list of retrieved results.
+        """
+        await InMemoryMongoDBService.__wait_async()
+        return InMemoryMongoDBService.find(db_name, collection_name, query, projection)
+
+    def aggregate_data(self, db_name: str, collection_name: str, aggregation_data: list[dict]) -> list:
+        """Runs an aggregation pipeline.
+
+        Args:
+            db_name (str): The name of the database.
+            collection_name (str): The collection name.
+            aggregation_data (list[dict]): The aggregation stages.
+
+        Returns:
+            list: A list of aggregated results.
+        """
+        InMemoryMongoDBService.__wait()
+        return InMemoryMongoDBService.aggregate(db_name, collection_name, aggregation_data)
+
+    async def aggregate_data_async(self, db_name: str, collection_name: str, aggregation_data: list[dict]) -> list:
+        """Runs an aggregation pipeline (after the simulated round trip time).
+
+        Args:
+            db_name (str): The name of the database.
+            collection_name (str): The collection name.
+            aggregation_data (list[dict]): The aggregation stages.
+
+        Returns:
+            list: A list of aggregated results.
+        """
+        await InMemoryMongoDBService.__wait_async()
+        return InMemoryMongoDBService.aggregate(db_name, collection_name, aggregation_data)
+
+    def insert_data(self, db_name: str, collection_name: str, data: list[dict]):
+        """Inserts documents.
+
+        Args:
+            db_name (str): The name of the database.
+            collection_name (str): The collection name.
+            data (list[dict]): The documents.
+        """
+        InMemoryMongoDBService.insert(db_name, collection_name, data)
+
+    def insert_data_batch(self, db_name: str, collection_name: str, data: list[dict], batch_size: int):
+        """Inserts documents (the batch size is ignored).
+
+        Args:
+            db_name (str): The name of the database.
+            collection_name (str): The collection name.
+            data (list[dict]): The documents.
+            batch_size (int): The batch size.
+        """
+        InMemoryMongoDBService.insert(db_name, collection_name, data)
+
+    def insert_one_data(self, db_name: str, collection_name: str, data: dict):
+        """Inserts one document.
+
+        Args:
+            db_name (str): The name of the database.
+            collection_name (str): The collection name.
+            data (dict): The document.
+        """
+        InMemoryMongoDBService.insert(db_name, collection_name, [data])
+
+    def create_search_index(self, db_name: str, collection_name: str, index_dict: dict):
+        """Does nothing, $vectorSearch scans the whole collection.
+
+        Args:
+            db_name (str): The name of the database.
+            collection_name (str): The collection name.
+            index_dict (dict): The index information as a dictionary.
+        """
+        pass
+
+    @staticmethod
+    def insert(db_name: str, collection_name: str, documents: list[dict]):
+        """Inserts documents into the store (documents without _id get a generated one).
+
+        Args:
+            db_name (str): The name of the database.
+            collection_name (str): The collection name.
+            documents (list[dict]): The documents.
+        """
+        Helper.ensure_list_of_type(documents, dict, "documents must be a list!", "documents must contain elements of type dict!")
+
+        with InMemoryMongoDBService.__lock:
+            collection = InMemoryMongoDBService.__databases.setdefault(db_name, {}).setdefault(collection_name, [])
+
+            for document in documents:
+                if "_id" not in document:
+                    document["_id"] = InMemoryMongoDBService.__next_id
+                    InMemoryMongoDBService.__next_id += 1
+                collection.append(document)
+
+            for key in [el for el in InMemoryMongoDBService.__vector_matrices.keys() if el[:2] == (db_name, collection_name)]:
+                del InMemoryMongoDBService.__vector_matrices[key]
+
+    @staticmethod
+    def find(db_name: str, collection_name: str, query: dict, projection: dict = None) -> list:
+        """Gets copies of the documents matching the query.
+
+        Args:
+            db_name (str): The name of the database.
+            collection_name (str): The collection name.
+            query (dict): The query.
+            projection (dict, optional): The fields to return. Defaults to None (all fields).
+
+        Returns:
+            list: The documents.
+        """
+        documents = InMemoryMongoDBService.__get_collection(db_name, collection_name)
+        return [InMemoryMongoDBService.__project(el, projection) for el in documents if InMemoryMongoDBService.__matches(el, query)]
+
+    @staticmethod
+    def aggregate(db_name: str, collection_name: str, pipeline: list[dict]) -> list:
+        """Runs an aggregation pipeline on the store.
+
+        Args:
+            db_name (str): The name of the database.
+            collection_name (str): The collection name.
+            pipeline (list[dict]): The aggregation stages.
+
+        Raises:
+            ValueError: Is thrown if a stage is not supported.
+
+        Returns:
+            list: The aggregated documents.
+        """
+        documents = InMemoryMongoDBService.__get_collection(db_name, collection_name)
+        copied = False
+
+        for i, stage in enumerate(pipeline):
+            name, spec = next(iter(stage.items()))
+
+            if name == "$vectorSearch":
+                if i != 0:
+                    raise ValueError("$vectorSearch has to be the first stage!")
+                documents = InMemoryMongoDBService.__vector_search(db_name, collection_name, spec)
+            elif name == "$match":
+                documents = [el for el in documents if InMemoryMongoDBService.__matches(el, spec)]
+            elif name == "$project":
+                documents = [InMemoryMongoDBService.__project(el, spec) for el in documents]
+                copied = True
+            elif name == "$group":
+                documents = InMemoryMongoDBService.__group(documents, spec)
+                copied = True
+            elif name == "$sort":
+                documents = InMemoryMongoDBService.__sort(documents, spec)
+            elif name == "$limit":
+                documents = documents[:spec]
+            elif name == "$lookup":
+                documents = [InMemoryMongoDBService.__lookup(db_name, el, spec) for el in documents]
+            elif name == "$unwind":
+                documents = InMemoryMongoDBService.__unwind(documents, spec)
+            else:
+                raise ValueError("Unsupported aggregation stage: " + name + "!")
+
+        if not copied:
+            documents = [copy.deepcopy(el) for el in documents]
+
+        for document in documents:
+            document.pop(InMemoryMongoDBService.__SCORE_FIELD, None)
+
+        return documents
+
+    @staticmethod
+    def __wait():
+        """Waits for the simulated round trip time.
+        """
+        if InMemoryMongoDBService.__latency_seconds > 0:
+            time.sleep(InMemoryMongoDBService.__latency_seconds)
+
+    @staticmethod
+    async def __wait_async():
+        """Waits for the simulated round trip time without blocking the event loop.
+        """
+        if InMemoryMongoDBService.__latency_seconds > 0:
+            await asyncio.sleep(InMemoryMongoDBService.__latency_seconds)
+
+    @staticmethod
+    def __get_collection(db_name: str, collection_name: str) -> list:
+        """Gets the documents of a collection (an empty list if it does not exist).
+
+        Args:
+            db_name (str): The name of the database.
+            collection_name (str): The collection name.
+
+        Returns:
+            list: The stored documents (not copied).
+        """
+        with InMemoryMongoDBService.__lock:
+            return list(InMemoryMongoDBService.__databases.get(db_name, {}).get(collection_name, []))
+
+    @staticmethod
+    def __vector_search(db_name: str, collection_name: str, spec: dict) -> list:
+        """Runs an exact $vectorSearch: scores all (filtered) documents with the cosine similarity
+        and returns the best ones with the score normalized to [0, 1] like Atlas does.
+
+        Args:
+            db_name (str): The name of the database.
+            collection_name (str): The collection name.
+            spec (dict): The specification of the stage (queryVector, path, limit, filter).
+
+        Returns:
+            list: Shallow copies of the best documents (carrying their score).
+        """
+        key = (db_name, collection_name, spec["path"])
+
+        with InMemoryMongoDBService.__lock:
+            if key not in InMemoryMongoDBService.__vector_matrices:
+                documents = [el for el in InMemoryMongoDBService.__databases.get(db_name, {}).get(collection_name, []) if spec["path"] in el]
+                matrix = np.asarray([el[spec["path"]] for el in documents], dtype=np.float32).reshape(len(documents), -1)
+                norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+                InMemoryMongoDBService.__vector_matrices[key] = (documents, matrix / np.clip(norms, 1e-12, None))
+
+            documents, matrix = InMemoryMongoDBService.__vector_matrices[key]
+
+        if len(documents) == 0:
+            return []
+
+        query_vector = np.asarray(spec["queryVector"], dtype=np.float32)
+        scores = matrix @ (query_vector / max(float(np.linalg.norm(query_vector)), 1e-12))
+
+        if "filter" in spec:
+            mask = np.asarray([InMemoryMongoDBService.__matches(el, spec["filter"]) for el in documents], dtype=bool)
+            scores = np.where(mask, scores, -np.inf)
+
+        limit = min(spec["limit"], len(documents))
+
+        if limit <= 0:
+            return []
+
+        best = np.argpartition(-scores, limit - 1)[:limit]
+        best = best[np.argsort(-scores[best], kind="stable")]
+        return [dict(documents[i], **{InMemoryMongoDBService.__SCORE_FIELD: float((1 + scores[i]) / 2)}) for i in best if scores[i] != -np.inf]
+
+    @staticmethod
+    def __get_values(document, path: str) -> list:
+        """Gets all values of a dotted path (arrays on the way are expanded, arrays at the end are expanded and kept).
+
+        Args:
+            document (_type_): The document.
+            path (str): The dotted path.
+
+        Returns:
+            list: The values.
+        """
+        values = [document]
+
+        for part in path.split("."):
+            next_values = []
+
+            for value in values:
+                if isinstance(value, list):
+                    next_values += [el[part] for el in value if isinstance(el, dict) and part in el]
+                elif isinstance(value, dict) and part in value:
+                    next_values.append(value[part])
+
+            values = next_values
+
+        result = []
+
+        for value in values:
+            if isinstance(value, list):
+                result += value
+            result.append(value)
+
+        return result
+
+    @staticmethod
+    def __matches(document: dict, query: dict) -> bool:
+        """Checks whether a document matches a query.
+
+        Args:
+            document (dict): The document.
+            query (dict): The query.
+
+        Raises:
+            ValueError: Is thrown if an operator is not supported.
+
+        Returns:
+            bool: Boolean indicating whether the document matches.
+        """
+        for key, condition in query.items():
+            if key == "$and":
+                if not all(InMemoryMongoDBService.__matches(document, el) for el in condition):
+                    return False
+                continue
+            if key == "$or":
+                if not any(InMemoryMongoDBService.__matches(document, el) for el in condition):
+                    return False
+                continue
+
+            values = InMemoryMongoDBService.__get_values(document, key)
+
+            if not isinstance(condition, dict) or not all(el.startswith("$") for el in condition.keys()):
+                if condition not in values:
+                    return False
+                continue
+
+            for operator, operand in condition.items():
+                if operator == "$in":
+                    matched = any(el in operand for el in values if not isinstance(el, list))
+                elif operator == "$nin":
+                    matched = not any(el in operand for el in values if not isinstance(el, list))
+                elif operator == "$eq":
+                    matched = operand in values
+                elif operator == "$ne":
+                    matched = operand not in values
+                elif operator == "$exists":
+                    matched = (len(values) > 0) == bool(operand)
+                elif operator in ["$gt", "$gte", "$lt", "$lte"]:
+                    matched = any(InMemoryMongoDBService.__compare(el, operator, operand) for el in values if not isinstance(el, list))
+                else:
+                    raise ValueError("Unsupported query operator: " + operator + "!")
+
+                if not matched:
+                    return False
+
+        return True
+
+    @staticmethod
+    def __compare(value, operator: str, operand) -> bool:
+        """Compares a value with an operand (values of other types never match).
+
+        Args:
+            value (_type_): The value of the document.
+            operator (str): The operator ($gt, $gte, $lt or $lte).
+            operand (_type_): The operand of the query.
+
+        Returns:
+            bool: The result of the comparison.
+        """
+        try:
+            if operator == "$gt":
+                return value > operand
+            if operator == "$gte":
+                return value >= operand
+            if operator == "$lt":
+                return value < operand
+            return value <= operand
+        except TypeError:
+            return False
+
+    @staticmethod
+    def __evaluate(document: dict, expression):
+        """Evaluates an aggregation expression (field reference, {"$meta": "vectorSearchScore"}, object of expressions or literal).
+
+        Args:
+            document (dict): The document.
+            expression (_type_): The expression.
+
+        Returns:
+            _type_: The value (None if a referenced field is missing).
+        """
+        if isinstance(expression, str) and expression.startswith("$"):
+            value = document
+
+            for part in expression[1:].split("."):
+                value = value.get(part) if isinstance(value, dict) else None
+
+            return value
+        if isinstance(expression, dict) and expression.get("$meta") == "vectorSearchScore":
+            return document.get(InMemoryMongoDBService.__SCORE_FIELD)
+        if isinstance(expression, dict):
+            return {key: InMemoryMongoDBService.__evaluate(document, value) for key, value in expression.items()}
+        return expression
+
+    @staticmethod
+    def __project(document: dict, projection: dict) -> dict:
+        """Applies a projection ($project stage or projection of find) to a copy of the document.
+
+        Args:
+            document (dict): The document.
+            projection (dict): The projection or None (the whole document is copied).
+
+        Returns:
+            dict: The projected document.
+        """
+        if projection is None or len(projection) == 0:
+            return copy.deepcopy(document)
+
+        included = [(key, value) for key, value in projection.items() if value not in [0, False]]
+
+        if len([el for el in included if el[0] != "_id"]) == 0:
+            excluded = set([key for key, value in projection.items() if value in [0, False]])
+            return copy.deepcopy({key: value for key, value in document.items() if key not in excluded})
+
+        result = {}
+
+        if "_id" not in projection and "_id" in document:
+            result["_id"] = document["_id"]
+
+        for key, value in included:
+            if value in [1, True]:
+                InMemoryMongoDBService.__copy_path(document, result, key.split("."))
+            else:
+                result[key] = InMemoryMongoDBService.__evaluate(document, value)
+
+        if InMemoryMongoDBService.__SCORE_FIELD in document:
+            result[InMemoryMongoDBService.__SCORE_FIELD] = document[InMemoryMongoDBService.__SCORE_FIELD]
+
+        return result
+
+    @staticmethod
+    def __copy_path(source, target: dict, parts: list[str]):
+        """Copies a dotted path of an inclusion projection (arrays of sub-documents are projected element-wise).
+
+        Args:
+            source (_type_): The source document.
+            target (dict): The projected document.
+            parts (list[str]): The parts of the path.
+        """
+        if not isinstance(source, dict) or parts[0] not in source:
+            return
+
+        value = source[parts[0]]
+
+        if len(parts) == 1:
+            target[parts[0]] = copy.deepcopy(value)
+        elif isinstance(value, list):
+            existing = target.setdefault(parts[0], [{} for _ in value])
+
+            for element, projected in zip(value, existing):
+                InMemoryMongoDBService.__copy_path(element, projected, parts[1:])
+        elif isinstance(value, dict):
+            InMemoryMongoDBService.__copy_path(value, target.setdefault(parts[0], {}), parts[1:])
+
+    @staticmethod
+    def __group(documents: list[dict], spec: dict) -> list[dict]:
+        """Runs a $group stage (groups are kept in the order of their first document).
+
+        Args:
+            documents (list[dict]): The documents.
+            spec (dict): The specification of the stage.
+
+        Raises:
+            ValueError: Is thrown if an accumulator is not supported.
+
+        Returns:
+            list[dict]: The groups.
+        """
+        groups = {}
+
+        for document in documents:
+            key = InMemoryMongoDBService.__evaluate(document, spec["_id"])
+
+            if key not in groups:
+                groups[key] = {"_id": key}
+
+            group = groups[key]
+
+            for field, accumulator in spec.items():
+                if field == "_id":
+                    continue
+
+                operator, expression = next(iter(accumulator.items()))
+                value = InMemoryMongoDBService.__evaluate(document, expression)
+
+                if operator == "$push":
+                    group.setdefault(field, []).append(value)
+                elif operator == "$sum":
+                    group[field] = group.get(field, 0) + value
+                elif operator == "$first":
+                    group.setdefault(field, value)
+                elif operator == "$max":
+                    group[field] = value if field not in group or value > group[field] else group[field]
+                elif operator == "$min":
+                    group[field] = value if field not in group or value < group[field] else group[field]
+                else:
+                    raise ValueError("Unsupported accumulator: " + operator + "!")
+
+        return list(groups.values())
+
+    @staticmethod
+    def __sort(documents: list[dict], spec: dict) -> list[dict]:
+        """Runs a $sort stage (stable, the first key has the highest priority).
+
+        Args:
+            documents (list[dict]): The documents.
+            spec (dict): The fields and their directions (1 ascending, -1 descending).
+
+        Returns:
+            list[dict]: The sorted documents.
+        """
+        result = list(documents)
+
+        for field, direction in reversed(list(spec.items())):
+            result.sort(key=lambda el: InMemoryMongoDBService.__evaluate(el, "$" + field), reverse=direction < 0)
+
+        return result
+
+    @staticmethod
+    def __lookup(db_name: str, document: dict, spec: dict) -> dict:
+        """Runs a $lookup stage for one document (equality join with an optional sub-pipeline).
+
+        Args:
+            db_name (str): The name of the database.
+            document (dict): The document.
+            spec (dict): The specification of the stage (from, localField, foreignField, pipeline, as).
+
+        Returns:
+            dict: The document with the joined documents.
+        """
+        local_values = [el for el in InMemoryMongoDBService.__get_values(document, spec["localField"]) if not isinstance(el, list)]
+        joined = [el for el in InMemoryMongoDBService.__get_collection(db_name, spec["from"])
+                  if any(value in local_values for value in InMemoryMongoDBService.__get_values(el, spec["foreignField"]))]
+
+        for stage in spec.get("pipeline", []):
+            name, stage_spec = next(iter(stage.items()))
+
+            if name == "$limit":
+                joined = joined[:stage_spec]
+            elif name == "$project":
+                joined = [InMemoryMongoDBService.__project(el, stage_spec) for el in joined]
+            elif name == "$match":
+                joined = [el for el in joined if InMemoryMongoDBService.__matches(el, stage_spec)]
+
+        return dict(document, **{spec["as"]: joined})
+
+    @staticmethod
+    def __unwind(documents: list[dict], spec) -> list[dict]:
+        """Runs an $unwind stage (documents with a missing or empty array are dropped).
+
+        Args:
+            documents (list[dict]): The documents.
+            spec (_type_): The path ("$field") or {"path": "$field"}.
+
+        Returns:
+            list[dict]: The unwound documents.
+        """
+        field = (spec["path"] if isinstance(spec, dict) else spec)[1:]
+        result = []
+
+        for document in documents:
+            values = document.get(field)
+
+            if isinstance(values, list):
+                result += [dict(document, **{field: el}) for el in values]
+            elif values is not None:
+                result.append(document)
+
+        return result
@@ -0,0 +1,129 @@
+import hashlib
+import re
+import time
+import numpy as np
+from models.helper import Helper
+from services.embeddingservice import EmbeddingService
+from services.lrucache import LRUCache
+
+
+class StubEmbeddingService(EmbeddingService):
+    """Represents a deterministic stand-in for the sentence transformer used by the benchmarks (no model is loaded).
+    A text is embedded by hashing its lowercase words into the dimensions of the vector (signed feature hashing)
+    and normalizing the vector, so that texts sharing words are similar and equal texts always get equal embeddings.
+    The inference time of the model can be simulated per call.
+
+    Args:
+        EmbeddingService (_type_): The base embedding service.
+    """
+    def __init__(self, dimensions: int = 384, latency_ms: float = 0.0, model_name: str = "stub", cache: LRUCache = None):
+        """Initializes a new instance of StubEmbeddingService.
+
+        Args:
+            dimensions (int, optional): The dimensions of the embeddings. Defaults to 384 (like all-MiniLM-L6-v2).
+            latency_ms (float, optional): The simulated inference time per call (single text or batch) in milliseconds. Defaults to 0.0.
+            model_name (str, optional): The name of the model (part of the cache key). Defaults to "stub".
+            cache (LRUCache, optional): The cache of the embeddings. Defaults to None (no caching).
+
+        Raises:
+            ValueError: Is thrown if dimensions is not positive or latency_ms is negative.
+        """
+        Helper.ensure_type(dimensions, int, "dimensions must be an int!")
+        Helper.ensure_type(model_name, str, "model_name must be a str!")
+
+        if type(latency_ms) not in [int, float]:
+            raise TypeError("latency_ms must be a number!")
+        if dimensions <= 0:
+            raise ValueError("dimensions must be positive!")
+        if latency_ms < 0:
+            raise ValueError("latency_ms cannot be negative!")
+        if cache is not None:
+            Helper.ensure_instance(cache, LRUCache, "cache must be of type LRUCache!")
+
+        self.dimensions = dimensions
+        self.latency_ms = latency_ms
+        self.model_name = model_name
+        self.cache = cache
+
+    def create_embedding(self, text: str) -> list[float]:
+        """Creates the embedding of the text.
+
+        Args:
+            text (str): The text to embed.
+
+        Returns:
+            list[float]: The resulting embedding vector.
+        """
+        Helper.ensure_type(text, str, "text must be a str!")
+        return self.create_embeddings([text])[0]
+
+    def create_embeddings(self, texts: list[str]) -> list[list[float]]:
+        """Creates the embeddings of multiple texts (the inference time is simulated once for the whole batch).
+        Texts found in the cache are not embedded again.
+
+        Args:
+            texts (list[str]): The texts to embed.
+
+        Returns:
+            list[list[float]]: The resulting embedding vectors (in the order of the texts).
+        """
+        Helper.ensure_list_of_type(texts, str, "texts must be a list!", "texts must contain elements of type str!")
+        result = [None] * len(texts)
+        missing = []
+
+        for i, text in enumerate(texts):
+            found, text_embedding = self.cache.get((self.model_name, " ".join(text.split()))) if self.cache is not None else (False, None)
+
+            if found:
+                result[i] = list(text_embedding)
+            else:
+                missing.append(i)
+
+        if len(missing) > 0 and self.latency_ms > 0:
+            time.sleep(self.latency_ms / 1000)
+
+        for i in missing:
+            text_embedding = self.embed(texts[i])
+
+            if self.cache is not None:
+                self.cache.put((self.model_name, " ".join(texts[i].split())), text_embedding)
+
+            result[i] = list(text_embedding)
+
+        return result
+
+    def embed(self, text: str) -> list[float]:
+        """Computes the embedding of the text without the simulated inference time and without the cache
+        (used to embed the synthetic corpus).
+
+        Args:
+            text (str): The text to embed.
+
+        Returns:
+            list[float]: The normalized embedding vector (the first dimension is set if the text has no words).
+        """
+        vector = np.zeros(self.dimensions, dtype=np.float64)
+
+        for word in re.findall(r"\w+", text.lower()):
+            digest = hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest()
+            value = int.from_bytes(digest, "little")
+            vector[value % self.dimensions] += 1.0 if (value >> 63) == 0 else -1.0
+
+        norm = np.linalg.norm(vector)
+
+        if norm == 0:
+            vector[0] = 1.0
+            norm = 1.0
+
+        return [float(el) for el in vector / norm]
+
+    def get_cache_statistics(self) -> dict:
+        """Gets the hit, miss and eviction counters of the embedding cache.
+
+        Returns:
+            dict: The statistics (see LRUCache.get_statistics) or an empty dictionary if caching is disabled.
+        """
+        if self.cache is None:
+            return {}
+
+        return self.cache.get_statistics()
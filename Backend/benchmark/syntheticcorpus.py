@@ -0,0 +1,155 @@
+import datetime
+import random
+from models.helper import Helper
+from benchmark.inmemorymongodbservice import InMemoryMongoDBService
+from benchmark.stubembeddingservice import StubEmbeddingService
+
+
+class SyntheticCorpus:
+    """Represents a reproducible synthetic corpus of papers in the format of the ETL pipelines
+    (papers, abstract chunks and title chunks with their embeddings and the denormalized filter fields).
+    The texts are drawn from a fixed vocabulary, so that lexical and semantic queries built from the same vocabulary find matches.
+    """
+    WORDS = ["health", "system", "european", "policy", "care", "patient", "hospital", "digital", "economy", "growth", "climate", "energy",
+             "transition", "education", "students", "learning", "network", "neural", "model", "analysis", "survey", "impact", "social",
+             "media", "public", "trust", "market", "labour", "migration", "urban", "mobility", "data", "privacy", "security", "risk",
+             "elderly", "nursing", "home", "dementia", "quality", "workforce", "cost", "funding", "reform", "outcome", "wellbeing"]
+    FIRST_NAMES = ["Anna", "Ben", "Clara", "David", "Eva", "Felix", "Grace", "Hugo", "Ines", "Jonas", "Karin", "Lukas", "Mia", "Noah"]
+    LAST_NAMES = ["Bauer", "Fischer", "Gruber", "Huber", "Koch", "Mayer", "Novak", "Schmid", "Wagner", "Weber", "Wolf", "Young"]
+    SOURCES = ["arxiv", "semanticscholar"]
+
+    def __init__(self, embedding_service: StubEmbeddingService, paper_amount: int = 1000, seed: int = 42):
+        """Initializes a new instance of SyntheticCorpus.
+
+        Args:
+            embedding_service (StubEmbeddingService): The service that embeds the chunks.
+            paper_amount (int, optional): The amount of papers. Defaults to 1000.
+            seed (int, optional): The seed of the random generator. Defaults to 42.
+
+        Raises:
+            ValueError: Is thrown if paper_amount is not positive.
+        """
+        Helper.ensure_instance(embedding_service, StubEmbeddingService, "embedding_service must be of type StubEmbeddingService!")
+        Helper.ensure_type(paper_amount, int, "paper_amount must be an int!")
+        Helper.ensure_type(seed, int, "seed must be an int!")
+
+        if paper_amount <= 0:
+            raise ValueError("paper_amount must be positive!")
+
+        self.embedding_service = embedding_service
+        self.paper_amount = paper_amount
+        self.seed = seed
+
+    def create_papers(self) -> list[dict]:
+        """Creates the papers (same seed, same papers).
+
+        Returns:
+            list[dict]: The papers.
+            Dictionary format: {"id": <paper-id>, "title": <paper-title>, "abstract": <paper-abstract>, "publicationDate": <paper-publication-date>,
+            "source": <source>, "authors": [{"fullName": <name>}, ...]}.
+        """
+        generator = random.Random(self.seed)
+        start = datetime.datetime(2000, 1, 1)
+        papers = []
+
+        for i in range(self.paper_amount):
+            papers.append({
+                "id": "synthetic-" + str(i),
+                "title": self.__create_sentence(generator, 4, 12).capitalize(),
+                "abstract": " ".join(self.__create_sentence(generator, 8, 20).capitalize() + "." for _ in range(generator.randint(3, 8))),
+                "publicationDate": start + datetime.timedelta(days=generator.randint(0, 9000)),
+                "source": generator.choice(SyntheticCorpus.SOURCES),
+                "authors": [{"fullName": generator.choice(SyntheticCorpus.FIRST_NAMES) + " " + generator.choice(SyntheticCorpus.LAST_NAMES)}
+                            for _ in range(generator.randint(1, 4))]
+            })
+
+        return papers
+
+    def create_abstract_chunks(self, papers: list[dict]) -> list[dict]:
+        """Creates the abstract chunks of the papers (one chunk per sentence, like the abstract chunking pipeline).
+
+        Args:
+            papers (list[dict]): The papers (see create_papers).
+
+        Returns:
+            list[dict]: The chunks.
+            Dictionary format: {"paperId": <paper-id>, "chunk": <chunk>, "chunkVector": <embedding-vector>,
+            "publicationDate": <publication-date>, "source": <source>, "authorNames": [<author-name>, ...]}.
+        """
+        Helper.ensure_list_of_type(papers, dict, "papers must be a list!", "papers must contain elements of type dict!")
+        chunks = []
+
+        for paper in papers:
+            for sentence in [el.strip() + "." for el in paper["abstract"].split(".") if el.strip() != ""]:
+                chunks.append(self.__create_chunk(paper, sentence))
+
+        return chunks
+
+    def create_title_chunks(self, papers: list[dict]) -> list[dict]:
+        """Creates the title chunks of the papers (one chunk per title).
+
+        Args:
+            papers (list[dict]): The papers (see create_papers).
+
+        Returns:
+            list[dict]: The chunks (see create_abstract_chunks).
+        """
+        Helper.ensure_list_of_type(papers, dict, "papers must be a list!", "papers must contain elements of type dict!")
+        return [self.__create_chunk(el, el["title"]) for el in papers]
+
+    def create_queries(self, amount: int, seed: int = None) -> list[str]:
+        """Creates search queries of 2 to 6 words of the vocabulary.
+
+        Args:
+            amount (int): The amount of queries.
+            seed (int, optional): The seed of the random generator. Defaults to None (the seed of the corpus).
+
+        Returns:
+            list[str]: The queries.
+        """
+        Helper.ensure_type(amount, int, "amount must be an int!")
+        generator = random.Random(self.seed if seed is None else seed)
+        return [self.__create_sentence(generator, 2, 6) for _ in range(amount)]
+
+    def load(self) -> dict:
+        """Creates the corpus and inserts it into the in-memory store (database papersDB, like the ETL pipelines).
+
+        Returns:
+            dict: The amounts of inserted documents.
+            Dictionary format: {"papers": <amount>, "abstractChunks": <amount>, "titleChunks": <amount>}.
+        """
+        papers = self.create_papers()
+        abstract_chunks = self.create_abstract_chunks(papers)
+        title_chunks = self.create_title_chunks(papers)
+        InMemoryMongoDBService.insert("papersDB", "papers", papers)
+        InMemoryMongoDBService.insert("papersDB", "abstractChunks", abstract_chunks)
+        InMemoryMongoDBService.insert("papersDB", "titleChunks", title_chunks)
+        InMemoryMongoDBService.insert("papersDB", "corpusVersion", [{"_id": "corpus", "version": 1}])
+        return {"papers": len(papers), "abstractChunks": len(abstract_chunks), "titleChunks": len(title_chunks)}
+
+    def __create_chunk(self, paper: dict, text: str) -> dict:
+        """Creates a chunk of a paper with its embedding and the filter fields of the paper.
+
+        Args:
+            paper (dict): The paper.
+            text (str): The text of the chunk.
+
+        Returns:
+            dict: The chunk.
+        """
+        return {"paperId": paper["id"], "chunk": text, "chunkVector": self.embedding_service.embed(text),
+                "publicationDate": paper["publicationDate"], "source": paper["source"],
+                "authorNames": [el["fullName"] for el in paper["authors"]]}
+
+    def __create_sentence(self, generator: random.Random, min_words: int, max_words: int) -> str:
+        """Creates a sentence of random words of the vocabulary.
+
+        Args:
+            generator (random.Random): The random generator.
+            min_words (int): The minimum amount of words.
+            max_words (int): The maximum amount of words.
+
+        Returns:
+            str: The sentence.
+        """
+        return " ".join(generator.choice(SyntheticCorpus.WORDS) for _ in range(generator.randint(min_words, max_words)))
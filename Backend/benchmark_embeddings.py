@@ -0,0 +1,95 @@
+import argparse
+import random
+import time
+import numpy as np
+from dotenv import load_dotenv
+from services.embeddingservicefactory import EmbeddingServiceFactory
+from services.resourceregistry import ResourceRegistry
+
+# Compares the latency, the throughput and the agreement (cosine similarity to the PyTorch embeddings)
+# of the embedding backends. Run "python bundle_resources.py --onnx" before.
+# Run "python benchmark_embeddings.py" (synthetic queries) or "python benchmark_embeddings.py --file queries.txt" (one query per line).
+WORDS = ["health", "system", "european", "policy", "care", "patient", "hospital", "digital", "economy", "growth", "climate", "energy",
+         "transition", "education", "students", "learning", "network", "neural", "model", "analysis", "survey", "impact", "social",
+         "media", "public", "trust", "market", "labour", "migration", "urban", "mobility", "data", "privacy", "security", "risk"]
+
+
+def create_queries(amount: int, seed: int) -> list[str]:
+    """Creates synthetic search queries of 2 to 12 words.
+
+    Args:
+        amount (int): The amount of queries.
+        seed (int): The seed of the random generator.
+
+    Returns:
+        list[str]: The queries.
+    """
+    generator = random.Random(seed)
+    return [" ".join(generator.choice(WORDS) for _ in range(generator.randint(2, 12))) for _ in range(amount)]
+
+
+def benchmark(embedding_service, queries: list[str], batch_size: int) -> tuple:
+    """Measures the single-query latency and the batched throughput of an embedding service.
+
+    Args:
+        embedding_service (_type_): The embedding service (without cache).
+        queries (list[str]): The queries.
+        batch_size (int): The amount of queries per batch.
+
+    Returns:
+        tuple: (latencies in milliseconds, queries per second, embeddings as float32 matrix).
+    """
+    embedding_service.create_embeddings(queries[:batch_size])
+    latencies = []
+
+    for query in queries:
+        start = time.perf_counter()
+        embedding_service.create_embedding(query)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    embeddings = []
+
+    for i in range(0, len(queries), batch_size):
+        embeddings.extend(embedding_service.create_embeddings(queries[i:i + batch_size]))
+
+    throughput = len(queries) / (time.perf_counter() - start)
+    return np.array(latencies), throughput, np.asarray(embeddings, dtype=np.float32)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compares the PyTorch and the ONNX Runtime embedding backends.")
+    parser.add_argument("--file", default=None, help="A file with one query per line (default: synthetic queries).")
+    parser.add_argument("--amount", type=int, default=500, help="The amount of synthetic queries.")
+    parser.add_argument("--batch-size", type=int, default=32, help="The amount of queries per batch.")
+    parser.add_argument("--seed", type=int, default=42, help="The seed of the synthetic queries.")
+    args = parser.parse_args()
+
+    load_dotenv()
+
+    if args.file is not None:
+        with open(args.file, "r", encoding="utf-8") as file:
+            queries = [el.strip() for el in file if el.strip() != ""]
+    else:
+        queries = create_queries(args.amount, args.seed)
+
+    reference = None
+    print("backend".ljust(12) + "p50 ms".rjust(10) + "p95 ms".rjust(10) + "mean ms".rjust(10) + "queries/s".rjust(12)
+          + "mean cos".rjust(10) + "min cos".rjust(10))
+
+    for name, backend, quantized in [("torch", "torch", False), ("onnx", "onnx", False), ("onnx-int8", "onnx", True)]:
+        try:
+            embedding_service = EmbeddingServiceFactory.create(backend, ResourceRegistry.DEFAULT_MODEL, None, quantized)
+        except FileNotFoundError as e:
+            print(name.ljust(12) + "skipped: " + str(e))
+            continue
+
+        latencies, throughput, embeddings = benchmark(embedding_service, queries, args.batch_size)
+
+        if reference is None:
+            reference = embeddings
+
+        cosines = (embeddings * reference).sum(axis=1) / (np.linalg.norm(embeddings, axis=1) * np.linalg.norm(reference, axis=1))
+        print(name.ljust(12) + ("%.2f" % np.percentile(latencies, 50)).rjust(10) + ("%.2f" % np.percentile(latencies, 95)).rjust(10)
+              + ("%.2f" % latencies.mean()).rjust(10) + ("%.1f" % throughput).rjust(12)
+              + ("%.4f" % cosines.mean()).rjust(10) + ("%.4f" % cosines.min()).rjust(10))
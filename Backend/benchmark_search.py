@@ -0,0 +1,162 @@
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import httpx
+import numpy as np
+from benchmark.inmemorymongodbservice import InMemoryMongoDBService
+from benchmark.stubembeddingservice import StubEmbeddingService
+from benchmark.syntheticcorpus import SyntheticCorpus
+
+# Measures the throughput and the latency of the search endpoints at fixed concurrency levels.
+# By default the application runs in-process on a synthetic corpus: MongoDBService is replaced by an in-memory store
+# (brute-force $vectorSearch) and the sentence transformer by a deterministic stub, so that no cluster and no model are needed.
+# Run "python benchmark_search.py" (in-process) or "python benchmark_search.py --url http://localhost:8000" (a running backend).
+ENDPOINTS = ["/abstract/search", "/abstract/searchlex", "/title/search", "/title/searchlex"]
+STOPWORDS = ["a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is", "it", "of", "on", "or", "that", "the", "to", "with"]
+
+
+def create_app(args: argparse.Namespace):
+    """Loads the synthetic corpus into the in-memory store, replaces the model and the stopwords by stand-ins,
+    builds the local vector indexes (engines hnsw and bruteforce) and imports the application.
+
+    Args:
+        args (argparse.Namespace): The arguments of the benchmark.
+
+    Returns:
+        _type_: The FastAPI application.
+    """
+    InMemoryMongoDBService.install()
+    InMemoryMongoDBService.configure(args.db_latency_ms)
+    amounts = SyntheticCorpus(StubEmbeddingService(), args.papers, args.seed).load()
+    print("corpus: " + ", ".join(key + "=" + str(value) for key, value in amounts.items()))
+
+    from services.embeddingservicefactory import EmbeddingServiceFactory
+    from services.resourceregistry import ResourceRegistry
+    EmbeddingServiceFactory.create = staticmethod(lambda backend, model_name, cache=None, quantized=True:
+                                                  StubEmbeddingService(latency_ms=args.model_latency_ms, model_name=model_name, cache=cache))
+    ResourceRegistry.get_stopwords = staticmethod(lambda language="english": list(STOPWORDS))
+
+    index_path = tempfile.mkdtemp(prefix="benchmark_indexes_")
+    os.environ["MONGODB_URL"] = "mongodb://localhost:27017"
+    os.environ["RESOURCE_WARM_UP"] = "false"
+    os.environ["VECTOR_SEARCH_ENGINE"] = args.engine
+    os.environ["LEXICAL_INDEX_PATH"] = index_path
+    os.environ["VECTOR_INDEX_PATH"] = index_path
+    os.environ.setdefault("RESPONSE_CACHE_SIZE", "0")
+    os.environ.setdefault("EMBEDDING_CACHE_SIZE", "0")
+
+    if args.engine != "atlas":
+        from services.abstractchunksservice import AbstractChunksService
+        from services.titlechunksservice import TitleChunksService
+        from services.vectorsearchservicefactory import VectorSearchServiceFactory
+
+        for chunks_service, index_name in [(AbstractChunksService(os.environ["MONGODB_URL"]), "AbstractSearchIndex"),
+                                           (TitleChunksService(os.environ["MONGODB_URL"]), "TitleSearchIndex")]:
+            VectorSearchServiceFactory.build_index(args.engine, chunks_service, os.path.join(index_path, index_name))
+
+    from main import app
+    return app
+
+
+async def run_level(client: httpx.AsyncClient, endpoint: str, queries: list[str], concurrency: int, amount: int) -> tuple:
+    """Sends one request per query with the given amount of concurrent clients.
+
+    Args:
+        client (httpx.AsyncClient): The HTTP client.
+        endpoint (str): The endpoint.
+        queries (list[str]): The queries.
+        concurrency (int): The amount of concurrent clients.
+        amount (int): The amount of results per request.
+
+    Returns:
+        tuple: (latencies in milliseconds, requests per second, amount of failed requests).
+    """
+    pending = iter(queries)
+    latencies = []
+    errors = 0
+
+    async def worker():
+        nonlocal errors
+
+        for query in pending:
+            start = time.perf_counter()
+
+            try:
+                response = await client.post(endpoint, json={"query": query, "amount": amount})
+
+                if response.status_code != 200:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    return np.array(latencies), len(queries) / (time.perf_counter() - start), errors
+
+
+async def run(args: argparse.Namespace, app=None):
+    """Runs the benchmark of every endpoint and concurrency level and prints the results.
+
+    Args:
+        args (argparse.Namespace): The arguments of the benchmark.
+        app (_type_, optional): The in-process application. Defaults to None (args.url is used).
+    """
+    queries = SyntheticCorpus(StubEmbeddingService(), 1, args.seed).create_queries(args.requests)
+    levels = [int(el) for el in args.concurrency.split(",")]
+    endpoints = ENDPOINTS if args.endpoints is None else args.endpoints.split(",")
+
+    if app is None:
+        client = httpx.AsyncClient(base_url=args.url, timeout=args.timeout)
+    else:
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://benchmark", timeout=args.timeout)
+
+    async with client:
+        print("endpoint".ljust(22) + "clients".rjust(8) + "requests/s".rjust(12) + "p50 ms".rjust(10) + "p95 ms".rjust(10)
+              + "p99 ms".rjust(10) + "errors".rjust(8))
+
+        for endpoint in endpoints:
+            await run_level(client, endpoint, queries[:args.warm_up], 1, args.amount)
+
+            for concurrency in levels:
+                latencies, throughput, errors = await run_level(client, endpoint, queries, concurrency, args.amount)
+                print(endpoint.ljust(22) + str(concurrency).rjust(8) + ("%.1f" % throughput).rjust(12)
+                      + ("%.2f" % np.percentile(latencies, 50)).rjust(10) + ("%.2f" % np.percentile(latencies, 95)).rjust(10)
+                      + ("%.2f" % np.percentile(latencies, 99)).rjust(10) + str(errors).rjust(8))
+
+
+async def run_in_process(args: argparse.Namespace):
+    """Starts the application in-process (with its lifespan) and runs the benchmark against it.
+
+    Args:
+        args (argparse.Namespace): The arguments of the benchmark.
+    """
+    app = create_app(args)
+
+    async with app.router.lifespan_context(app):
+        await run(args, app)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measures the throughput and the latency of the search endpoints.")
+    parser.add_argument("--url", default=None, help="The URL of a running backend (default: in-process with the stand-ins).")
+    parser.add_argument("--engine", default="atlas", choices=["atlas", "hnsw", "bruteforce"], help="The vector search engine (in-process).")
+    parser.add_argument("--papers", type=int, default=2000, help="The amount of synthetic papers (in-process).")
+    parser.add_argument("--db-latency-ms", type=float, default=0.0, help="The simulated round trip time of the database (in-process).")
+    parser.add_argument("--model-latency-ms", type=float, default=0.0, help="The simulated inference time of the model (in-process).")
+    parser.add_argument("--endpoints", default=None, help="Comma-separated endpoints (default: " + ",".join(ENDPOINTS) + ").")
+    parser.add_argument("--concurrency", default="1,8,32", help="Comma-separated amounts of concurrent clients.")
+    parser.add_argument("--requests", type=int, default=500, help="The amount of requests per endpoint and concurrency level.")
+    parser.add_argument("--warm-up", type=int, default=20, help="The amount of requests per endpoint before measuring.")
+    parser.add_argument("--amount", type=int, default=10, help="The amount of results per request.")
+    parser.add_argument("--timeout", type=float, default=60.0, help="The timeout of a request in seconds.")
+    parser.add_argument("--seed", type=int, default=42, help="The seed of the corpus and the queries.")
+    args = parser.parse_args()
+
+    if args.url is None:
+        asyncio.run(run_in_process(args))
+    else:
+        asyncio.run(run(args))
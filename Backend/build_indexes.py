@@ -0,0 +1,45 @@
+import argparse
+import os
+from dotenv import load_dotenv
+from services.abstractchunksservice import AbstractChunksService
+from services.basicenglishpreprocessingservice import BasicEnglishPreprocessingService
+from services.bm25indexservice import BM25IndexService
+from services.corpusversionservice import CorpusVersionService
+from services.lexicalindexmanager import LexicalIndexManager
+from services.papersservice import PapersService
+from services.resourceregistry import ResourceRegistry
+from services.titlechunksservice import TitleChunksService
+from services.trigramindexservice import TrigramIndexService
+from services.vectorsearchservicefactory import VectorSearchServiceFactory
+
+# Rebuilds the local indexes from the MongoDB collections.
+# Run "python build_indexes.py" (lexical indexes only) or "python build_indexes.py --engine bruteforce" (or hnsw)
+# after the papers or chunk collections have changed. A running backend rebuilds its lexical indexes by itself
+# whenever the version stamp of the corpus changes.
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuilds the local lexical and vector indexes from the MongoDB collections.")
+    parser.add_argument("--engine", choices=["hnsw", "bruteforce"], default=None, help="The vector search engine to build the index for.")
+    args = parser.parse_args()
+
+    load_dotenv()
+    url = os.getenv("MONGODB_URL")
+    vector_index_path = os.getenv("VECTOR_INDEX_PATH", "./indexes")
+    lexical_index_path = os.getenv("LEXICAL_INDEX_PATH", "./indexes")
+    preprocessing_service = BasicEnglishPreprocessingService(ResourceRegistry.get_stopwords("english"))
+    papers_service = PapersService(url)
+    corpus_version_service = CorpusVersionService(url)
+
+    abstract_lexical_index_file = os.path.join(lexical_index_path, "AbstractLexicalIndex.json")
+    print("Building lexical index: " + abstract_lexical_index_file)
+    LexicalIndexManager(lambda: BM25IndexService(preprocessing_service), papers_service, "abstract", abstract_lexical_index_file,
+                        corpus_version_service).build()
+
+    title_lexical_index_file = os.path.join(lexical_index_path, "TitleLexicalIndex.json")
+    print("Building lexical index: " + title_lexical_index_file)
+    LexicalIndexManager(lambda: TrigramIndexService(), papers_service, "title", title_lexical_index_file, corpus_version_service).build()
+
+    if args.engine is not None:
+        for chunks_service, index_name in [(AbstractChunksService(url), "AbstractSearchIndex"), (TitleChunksService(url), "TitleSearchIndex")]:
+            directory = os.path.join(vector_index_path, index_name)
+            print("Building " + args.engine + " index: " + directory)
+            VectorSearchServiceFactory.build_index(args.engine, chunks_service, directory)
@@ -0,0 +1,17 @@
+import argparse
+from dotenv import load_dotenv
+from services.resourceregistry import ResourceRegistry
+
+# Downloads the models and NLTK resources of the backend into the local bundle (RESOURCE_BUNDLE_PATH),
+# so that the backend starts without network access.
+# Run "python bundle_resources.py" once (or while building the container image).
+# Add "--onnx" to export the models to ONNX graphs (plain and int8-quantized) for EMBEDDING_BACKEND=onnx.
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Downloads the models and NLTK resources into the local bundle.")
+    parser.add_argument("--model", action="append", default=None, help="The name of a model to bundle (can be repeated).")
+    parser.add_argument("--onnx", action="store_true", help="Exports the models to ONNX graphs (plain and int8-quantized).")
+    args = parser.parse_args()
+
+    load_dotenv()
+    print("Bundling resources into: " + ResourceRegistry.get_bundle_path())
+    ResourceRegistry.bundle(args.model, args.onnx)
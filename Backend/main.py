@@ -1,12 +1,98 @@
-from fastapi import FastAPI
+import os
+import time
+from contextlib import asynccontextmanager
+from dotenv import load_dotenv
+from brotli_asgi import BrotliMiddleware
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse
 from routers import titlesearch_controller
 from routers import abstractsearch_controller
+from services.mongodbclientmanager import MongoDBClientManager
+from services.executormanager import ExecutorManager
+from services.resourceregistry import ResourceRegistry
+from services.metricsservice import MetricsService
+
+load_dotenv()
+metrics_enabled = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+server_timing_enabled = os.getenv("SERVER_TIMING_ENABLED", "true").lower() == "true"
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Owns the long-lived resources of the application.
+    Opens the shared MongoDB clients, the worker pools and the lexical indexes on startup and closes them on shutdown.
+    Unless RESOURCE_WARM_UP is set to false, the models are run once before the first request is accepted.
+
+    Args:
+        app (FastAPI): The application.
+    """
+    MongoDBClientManager.open(os.getenv("MONGODB_URL"))
+    ExecutorManager.configure_from_env()
+    await abstractsearch_controller.abstract_lexical_index_manager.open()
+    await titlesearch_controller.title_lexical_index_manager.open()
+
+    if os.getenv("RESOURCE_WARM_UP", "true").lower() == "true":
+        await ExecutorManager.run_inference(ResourceRegistry.warm_up)
+
+    yield
+    ExecutorManager.shutdown()
+    await MongoDBClientManager.close()
 
 # Initialize the API and create routers
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 app.include_router(titlesearch_controller.router)
 app.include_router(abstractsearch_controller.router)
 
+# Compress the responses with brotli or gzip (negotiated through the Accept-Encoding header of the client)
+if os.getenv("RESPONSE_COMPRESSION", "true").lower() == "true":
+    app.add_middleware(BrotliMiddleware, minimum_size=int(os.getenv("RESPONSE_COMPRESSION_MIN_SIZE", "1000")), gzip_fallback=True)
+
+@app.middleware("http")
+async def record_first_request(request: Request, call_next):
+    """Records the time to the first request that was served (see ResourceRegistry.get_statistics).
+
+    Args:
+        request (Request): The request.
+        call_next (_type_): The next handler.
+
+    Returns:
+        _type_: The response.
+    """
+    response = await call_next(request)
+    ResourceRegistry.mark_request_served()
+    return response
+
+@app.middleware("http")
+async def record_metrics(request: Request, call_next):
+    """Records the duration and the stage durations of the request (see MetricsService)
+    and adds them to the response as Server-Timing header.
+
+    Args:
+        request (Request): The request.
+        call_next (_type_): The next handler.
+
+    Returns:
+        _type_: The response.
+    """
+    if not metrics_enabled:
+        return await call_next(request)
+
+    token = MetricsService.begin_request()
+    start = time.perf_counter()
+    status = 500
+
+    try:
+        response = await call_next(request)
+        status = response.status_code
+    finally:
+        seconds = time.perf_counter() - start
+        route = request.scope.get("route")
+        stages = MetricsService.end_request(token, route.path if route is not None else "unmatched", request.method, status, seconds)
+
+    if server_timing_enabled:
+        response.headers["Server-Timing"] = MetricsService.get_server_timing(stages, seconds)
+
+    return response
+
 @app.get("/")
 async def root():
     """The root of the application.
@@ -15,3 +101,32 @@ async def root():
         _type_: The return message.
     """
     return {"message": "200"}
+
+
+@app.get("/stats")
+async def stats():
+    """Gets the runtime statistics of the application (resources, worker pools, embedding caches, batching and lexical indexes).
+
+    Returns:
+        _type_: The statistics.
+    """
+    return {
+        "resources": ResourceRegistry.get_statistics(),
+        "executors": ExecutorManager.get_statistics(),
+        "abstract": {"embeddingCache": abstractsearch_controller.embeddings_service.get_cache_statistics(),
+                     "embeddingBatching": abstractsearch_controller.embedding_batching_service.get_statistics(),
+                     "lexicalIndex": abstractsearch_controller.abstract_lexical_index_manager.get_statistics()},
+        "title": {"embeddingCache": titlesearch_controller.embeddings_service.get_cache_statistics(),
+                  "embeddingBatching": titlesearch_controller.embedding_batching_service.get_statistics(),
+                  "lexicalIndex": titlesearch_controller.title_lexical_index_manager.get_statistics()}
+    }
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Gets the latency histograms and request counters in the Prometheus text format.
+
+    Returns:
+        _type_: The metrics.
+    """
+    return PlainTextResponse(MetricsService.export(), media_type="text/plain; version=0.0.4")
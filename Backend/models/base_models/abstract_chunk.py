@@ -1,10 +1,13 @@
+from typing import Optional
 from pydantic import BaseModel
 
 
 class AbstractChunk(BaseModel):
-    """Represents a chunk (piece of text information) taken from the abstract.
+    """Represents a chunk (piece of text information) taken from the abstract
+    (the score is the similarity to the query if the chunk was found by the semantic search).
     Args:
         BaseModel (_type_): The base model used by pydantic.
     """
     paperId: str
     chunkText: str
+    score: Optional[float] = None
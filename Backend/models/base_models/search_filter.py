@@ -0,0 +1,15 @@
+import datetime
+from typing import Optional
+from pydantic import BaseModel
+
+
+class SearchFilter(BaseModel):
+    """Represents a filter restricting the search to papers published in a date range, by given sources or by given authors
+    (all given conditions have to match, an author or source matches if it is one of the listed ones).
+    Args:
+        BaseModel (_type_): The base model used by pydantic.
+    """
+    publishedFrom: Optional[datetime.date] = None
+    publishedTo: Optional[datetime.date] = None
+    sources: Optional[list[str]] = None
+    authors: Optional[list[str]] = None
@@ -0,0 +1,15 @@
+from typing import Optional
+from pydantic import BaseModel
+from models.base_models.search_filter import SearchFilter
+
+
+class AbstractSearchBatchRequestBody(BaseModel):
+    """Represents a HTTP request body that can be used to trigger semantic search in the paper's abstract for multiple queries at once.
+    The optional filter restricts the results by publication date, source and authors.
+    Args:
+        BaseModel (_type_): The base model used by pydantic.
+    """
+
+    queries: list[str]
+    amount: int
+    filter: Optional[SearchFilter] = None
@@ -1,11 +1,15 @@
+from typing import Optional
 from pydantic import BaseModel
+from models.base_models.search_filter import SearchFilter
 
 
 class AbstractSearchRequestBody(BaseModel):
     """Represents a HTTP request body that can be used to trigger semantic search in the paper's abstract.
+    The optional filter restricts the results by publication date, source and authors.
     Args:
         BaseModel (_type_): The base model used by pydantic.
     """
 
     query: str
     amount: int
+    filter: Optional[SearchFilter] = None
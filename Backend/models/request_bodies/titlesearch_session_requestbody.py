@@ -0,0 +1,17 @@
+from typing import Optional
+from pydantic import BaseModel
+from models.base_models.search_filter import SearchFilter
+
+
+class TitleSearchSessionRequestBody(BaseModel):
+    """Represents a HTTP request body that can be used to open a search session (cursor) over the paper's titles.
+    The amount is the size of the first page, the mode is semantic, lexical or hybrid.
+    The optional filter restricts the results by publication date, source and authors.
+    Args:
+        BaseModel (_type_): The base model used by pydantic.
+    """
+
+    query: str
+    amount: int
+    mode: str = "semantic"
+    filter: Optional[SearchFilter] = None
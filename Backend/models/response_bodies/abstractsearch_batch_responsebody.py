@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+from models.base_models import paper_to_abstract_chunks
+
+
+class AbstractSearchBatchResponseBody(BaseModel):
+    """Represents a HTTP response body that contains results from the semantic search in the paper's abstract
+    for multiple queries (one result list per query, in the order of the queries).
+    Args:
+        BaseModel (_type_): The base model used by pydantic.
+    """
+
+    result: list[list[paper_to_abstract_chunks.PaperToAbstractChunks]]
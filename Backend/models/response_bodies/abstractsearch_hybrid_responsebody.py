@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+from models.base_models import paper_to_abstract_chunks
+
+
+class AbstractSearchHybridResponseBody(BaseModel):
+    """Represents a HTTP response body that contains results from the hybrid search in the paper's abstract
+    (papers matched only by the lexical search carry no chunks).
+    Args:
+        BaseModel (_type_): The base model used by pydantic.
+    """
+
+    result: list[paper_to_abstract_chunks.PaperToAbstractChunks]
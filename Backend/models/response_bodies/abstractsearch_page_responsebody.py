@@ -0,0 +1,17 @@
+from typing import Optional
+from pydantic import BaseModel
+from models.base_models import paper_to_abstract_chunks
+
+
+class AbstractSearchPageResponseBody(BaseModel):
+    """Represents a HTTP response body that contains one page of a search session over the paper's abstracts
+    (nextOffset is None on the last page).
+    Args:
+        BaseModel (_type_): The base model used by pydantic.
+    """
+
+    sessionId: str
+    offset: int
+    total: int
+    nextOffset: Optional[int] = None
+    result: list[paper_to_abstract_chunks.PaperToAbstractChunks]
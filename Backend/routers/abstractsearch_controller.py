@@ -1,47 +1,87 @@
+import asyncio
 import os
 from dotenv import load_dotenv
-from fastapi import APIRouter
-from fastapi.responses import JSONResponse
-from sentence_transformers import SentenceTransformer, SimilarityFunction
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse, Response
 from services.basicenglishpreprocessingservice import BasicEnglishPreprocessingService
 from services.conversionservice import ConversionService
+from services.compactserializationservice import CompactSerializationService
 from services.abstractchunksservice import AbstractChunksService
-from services.transfomerembeddingservice import TransformerEmbeddingService
-from models.base_models.author import Author
-from models.base_models.paper import Paper
-from models.helper import Helper
+from services.embeddingservicefactory import EmbeddingServiceFactory
+from services.embeddingbatchingservice import EmbeddingBatchingService
+from services.lrucache import LRUCache
+from services.corpusversionservice import CorpusVersionService
+from services.responsecache import ResponseCache
+from services.executormanager import ExecutorManager
+from services.metricsservice import MetricsService
+from services.rankfusionservice import RankFusionService
+from services.searchsessionservice import SearchSessionService
+from services.searchcontrollerservice import SearchControllerService
+from services.resourceregistry import ResourceRegistry
 from models.response_bodies.abstractsearch_lex_responsebody import AbstractSearchLexResponseBody
 from services.papersservice import PapersService
+from services.bm25indexservice import BM25IndexService
+from services.lexicalindexmanager import LexicalIndexManager
+from services.vectorsearchservicefactory import VectorSearchServiceFactory
 from models.response_bodies.abstractsearch_responsebody import AbstractSearchResponseBody
 from models.request_bodies.abstractsearch_requestbody import AbstractSearchRequestBody
 from models.request_bodies.abstractsearch_lex_requestbody import AbstractSearchLexRequestBody
-import nltk
-from nltk.corpus import stopwords
-nltk.data.path.append("./tokenizers")
-nltk.download("punkt", download_dir="./tokenizers")
-nltk.download("stopwords", download_dir="./tokenizers")
-nltk.download('punkt_tab', download_dir="./tokenizers")
+from models.request_bodies.abstractsearch_hybrid_requestbody import AbstractSearchHybridRequestBody
+from models.response_bodies.abstractsearch_hybrid_responsebody import AbstractSearchHybridResponseBody
+from models.request_bodies.abstractsearch_session_requestbody import AbstractSearchSessionRequestBody
+from models.request_bodies.abstractsearch_batch_requestbody import AbstractSearchBatchRequestBody
+from models.response_bodies.abstractsearch_batch_responsebody import AbstractSearchBatchResponseBody
+from models.response_bodies.abstractsearch_page_responsebody import AbstractSearchPageResponseBody
 
 # Load services
 load_dotenv()
 url = os.getenv("MONGODB_URL")
+vector_search_engine = os.getenv("VECTOR_SEARCH_ENGINE", "atlas")
+vector_index_path = os.getenv("VECTOR_INDEX_PATH", "./indexes")
+lexical_index_path = os.getenv("LEXICAL_INDEX_PATH", "./indexes")
 papers_service = PapersService(url)
 abstract_chunks_service = AbstractChunksService(url)
-embedder = SentenceTransformer("sentence-transformers/all-MiniLM-L6-v2", similarity_fn_name=SimilarityFunction.COSINE)
-embeddings_service = TransformerEmbeddingService(embedder)
-stopwords = list(set(stopwords.words('english')))
+embedding_cache = LRUCache(int(os.getenv("EMBEDDING_CACHE_SIZE", "1024")), float(os.getenv("EMBEDDING_CACHE_TTL_SECONDS", "3600")))
+embeddings_service = EmbeddingServiceFactory.create(os.getenv("EMBEDDING_BACKEND", "torch"), ResourceRegistry.DEFAULT_MODEL, embedding_cache,
+                                                    os.getenv("EMBEDDING_ONNX_QUANTIZED", "true").lower() == "true")
+embedding_batching_service = EmbeddingBatchingService(embeddings_service, int(os.getenv("EMBEDDING_BATCH_MAX_SIZE", "32")),
+                                                      float(os.getenv("EMBEDDING_BATCH_MAX_WAIT_MS", "5")))
+stopwords = ResourceRegistry.get_stopwords("english")
 preprocessing_service = BasicEnglishPreprocessingService(stopwords)
 conversion_service = ConversionService()
+compact_serialization_service = CompactSerializationService()
+response_cache = ResponseCache(LRUCache(int(os.getenv("RESPONSE_CACHE_SIZE", "1024")), float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "0"))),
+                               CorpusVersionService(url), float(os.getenv("CORPUS_VERSION_POLL_SECONDS", "5")))
+vector_search_service = VectorSearchServiceFactory.create(vector_search_engine, abstract_chunks_service, "AbstractSearchIndex", vector_index_path)
+rank_fusion_service = RankFusionService(int(os.getenv("HYBRID_RRF_K", "60")))
+hybrid_candidate_factor = int(os.getenv("HYBRID_CANDIDATE_FACTOR", "2"))
+search_session_service = SearchSessionService(papers_service, LRUCache(int(os.getenv("SEARCH_SESSION_CACHE_SIZE", "1024")),
+                                                                       float(os.getenv("SEARCH_SESSION_TTL_SECONDS", "300"))))
+search_session_max_results = int(os.getenv("SEARCH_SESSION_MAX_RESULTS", "200"))
+lexical_filter_over_fetch_factor = int(os.getenv("LEXICAL_FILTER_OVER_FETCH_FACTOR", "5"))
+over_fetch_factor = int(os.getenv("ABSTRACT_OVER_FETCH_FACTOR", "3"))
+batch_max_queries = int(os.getenv("BATCH_SEARCH_MAX_QUERIES", "1000"))
+abstract_lexical_index_manager = LexicalIndexManager(lambda: BM25IndexService(preprocessing_service), papers_service, "abstract",
+                                                     os.path.join(lexical_index_path, "AbstractLexicalIndex.json"), CorpusVersionService(url),
+                                                     float(os.getenv("CORPUS_VERSION_POLL_SECONDS", "5")), response_cache.cache.clear)
+search_controller_service = SearchControllerService(papers_service, abstract_lexical_index_manager, vector_search_service, preprocessing_service,
+                                                    embedding_batching_service, rank_fusion_service, search_session_service,
+                                                    compact_serialization_service, AbstractSearchPageResponseBody,
+                                                    conversion_service.paper_groups_to_class_object, hybrid_candidate_factor,
+                                                    lexical_filter_over_fetch_factor, over_fetch_factor)
 
 # Initialize the router
 router = APIRouter(prefix="/abstract")
 
 @router.post("/search", status_code=200, response_model=AbstractSearchResponseBody)
-async def search_by_abstract(request_body: AbstractSearchRequestBody) -> JSONResponse:
+async def search_by_abstract(request_body: AbstractSearchRequestBody, compact: bool = False, fields: str = None) -> JSONResponse:
     """Performs a semantic search in the papers' abstracts.
+    Returns up to amount distinct papers, each with all of its matching chunks and their scores.
 
     Args:
         request_body (AbstractSearchRequestBody): The request body of the controller.
+        compact (bool, optional): Boolean indicating whether the response is serialized directly from the documents with orjson. Defaults to False.
+        fields (str, optional): The comma-separated fields of the compact response (implies compact, e.g. paperId,title,chunks). Defaults to None (all fields).
 
     Returns:
         _type_: The response of the controller.
@@ -61,41 +101,49 @@ async def search_by_abstract(request_body: AbstractSearchRequestBody) -> JSONRes
         return JSONResponse(status_code=400, content={"message": "Query cannot be empty!"})  
 
     try:
-        query_preprocessed = preprocessing_service.preprocess(request_body.query)
-        query_embedded = embeddings_service.create_embedding(query_preprocessed)
-
-        results = abstract_chunks_service.aggregate_data([
-            {"$vectorSearch": {
-                "queryVector": query_embedded,
-                "path": "chunkVector",
-                "numCandidates": 100,
-                "limit": request_body.amount,
-                "index": "AbstractSearchIndex",
-                }
-            },
-            {
-                "$project":{
-                    "_id": 0,
-                    "chunkVector": 0
-                }
-            }  
-        ])
-        
-        copy_list = list(results).copy()
-        result_papers = papers_service.get_papers({"id": {"$in": [el["paperId"] for el in copy_list]}})
-        response_list = conversion_service.paper_abstract_chunks_to_class_object(result_papers, copy_list)
-        response = AbstractSearchResponseBody(result=response_list)
-        return response
+        selected_fields = search_controller_service.get_selected_fields(compact, fields, CompactSerializationService.GROUP_FIELDS)
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"message": str(e)})
+
+    try:
+        cache_key = await response_cache.get_key(search_controller_service.get_cache_endpoint("/abstract/search", selected_fields), request_body)
+        found, content = response_cache.get(cache_key)
+
+        if found:
+            return Response(content=content, media_type="application/json")
+
+        query_embedded = await search_controller_service.embed_query(request_body.query)
+
+        projection = compact_serialization_service.get_projection(selected_fields) if selected_fields is not None else None
+        paper_groups = await vector_search_service.search_papers_async(query_embedded, request_body.amount, papers_service, over_fetch_factor,
+                                                                       search_filter=request_body.filter, projection=projection)
+
+        if selected_fields is not None:
+            with MetricsService.measure("serialize"):
+                content = compact_serialization_service.paper_groups_to_json(paper_groups, selected_fields)
+
+            return Response(content=response_cache.put_content(cache_key, content), media_type="application/json")
+
+        with MetricsService.measure("convert"):
+            response_list = conversion_service.paper_groups_to_class_object(paper_groups)
+            response = AbstractSearchResponseBody(result=response_list)
+
+        with MetricsService.measure("serialize"):
+            content = response_cache.put(cache_key, response)
+
+        return Response(content=content, media_type="application/json")
     except Exception as e:
         return JSONResponse(status_code=500, content={"message": "Internal error: " + str(e)}) 
     
 
 @router.post("/searchlex", status_code=200, response_model=AbstractSearchLexResponseBody)
-async def search_by_abstract_lex(request_body: AbstractSearchLexRequestBody) -> JSONResponse:
+async def search_by_abstract_lex(request_body: AbstractSearchLexRequestBody, compact: bool = False, fields: str = None) -> JSONResponse:
     """Performs a lexical search in the papers' abstracts.
 
     Args:
         request_body (AbstractSearchLexRequestBody): The request body of the controller.
+        compact (bool, optional): Boolean indicating whether the response is serialized directly from the documents with orjson. Defaults to False.
+        fields (str, optional): The comma-separated fields of the compact response (implies compact, e.g. paperId,title). Defaults to None (all fields).
 
     Returns:
         _type_: The response of the controller.
@@ -115,20 +163,246 @@ async def search_by_abstract_lex(request_body: AbstractSearchLexRequestBody) ->
         return JSONResponse(status_code=400, content={"message": "Query cannot be empty!"})   
     
     try:
-        query = request_body.query
-        amount = request_body.amount
-        results = papers_service.get_papers({})
-        ids = [el["id"] for el in results]
-        abstracts = [el["abstract"] for el in results]
-        match_counts = [Helper.get_match_count(query, abstract) for abstract in abstracts]
-        list_zipped = list(zip(ids, abstracts, match_counts))
-        list_zipped = [el for el in list_zipped if el[2] != 0]
-        list_zipped = sorted(list_zipped, key=lambda x: x[2], reverse=True)
-        list_zipped = list_zipped[:amount]
-        ids = [el[0] for el in list_zipped]
-        papers_to_return = list(map(lambda x: [el for el in results if el["id"] == x][0], ids))
-        papers = [Paper(paperId=el["id"], title=el["title"], abstract=el["abstract"], publicationDate=str(el["publicationDate"]), authors=[Author(fullName=e["fullName"]) for e in el["authors"]]) for el in papers_to_return]
-        response = AbstractSearchLexResponseBody(result=papers)
-        return response 
+        selected_fields = search_controller_service.get_selected_fields(compact, fields, CompactSerializationService.PAPER_FIELDS)
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"message": str(e)})
+
+    try:
+        cache_key = await response_cache.get_key(search_controller_service.get_cache_endpoint("/abstract/searchlex", selected_fields), request_body)
+        found, content = response_cache.get(cache_key)
+
+        if found:
+            return Response(content=content, media_type="application/json")
+
+        lexical_index = await abstract_lexical_index_manager.get_index()
+
+        with MetricsService.measure("lexical_search"):
+            hits = await ExecutorManager.run_inference(lexical_index.search, request_body.query, request_body.amount)
+
+        paper_ids = [el[0] for el in hits]
+
+        if selected_fields is not None:
+            with MetricsService.measure("hydrate"):
+                result_papers = await papers_service.get_papers_async({"id": {"$in": paper_ids}}, compact_serialization_service.get_projection(selected_fields))
+
+            with MetricsService.measure("serialize"):
+                content = compact_serialization_service.papers_to_json(result_papers, paper_ids, selected_fields)
+
+            return Response(content=response_cache.put_content(cache_key, content), media_type="application/json")
+
+        with MetricsService.measure("hydrate"):
+            result_papers = await papers_service.get_papers_async({"id": {"$in": paper_ids}}, PapersService.RESULT_PROJECTION)
+
+        with MetricsService.measure("convert"):
+            papers = conversion_service.papers_to_class_object(result_papers, paper_ids)
+            response = AbstractSearchLexResponseBody(result=papers)
+
+        with MetricsService.measure("serialize"):
+            content = response_cache.put(cache_key, response)
+
+        return Response(content=content, media_type="application/json")
+    except Exception as e:
+        return JSONResponse(status_code=500, content={"message": "Internal error: " + str(e)})
+
+
+@router.post("/hybrid", status_code=200, response_model=AbstractSearchHybridResponseBody)
+async def search_by_abstract_hybrid(request_body: AbstractSearchHybridRequestBody, compact: bool = False, fields: str = None) -> JSONResponse:
+    """Performs a hybrid search in the papers' abstracts.
+    Runs the lexical and the semantic search concurrently and fuses their rankings of papers with reciprocal-rank fusion.
+
+    Args:
+        request_body (AbstractSearchHybridRequestBody): The request body of the controller.
+        compact (bool, optional): Boolean indicating whether the response is serialized directly from the documents with orjson. Defaults to False.
+        fields (str, optional): The comma-separated fields of the compact response (implies compact, e.g. paperId,title,chunks). Defaults to None (all fields).
+
+    Returns:
+        _type_: The response of the controller.
+        {"message": <content>} if error, AbstractSearchHybridResponseBody otherwise.
+    """
+    if request_body == None:
+        return JSONResponse(status_code=400, content={"message": "Empty request body!"})
+    if not(isinstance(request_body, AbstractSearchHybridRequestBody)):
+        return JSONResponse(status_code=400, content={"message": "Wrong format of the request body!"})
+    if not(type(request_body.amount) == int):
+        return JSONResponse(status_code=400, content={"message": "Amount of results has to be a number!"})
+    if request_body.amount < 0:
+        return JSONResponse(status_code=400, content={"message": "Amount of results cannot be negative!"})
+    if not(type(request_body.query) == str):
+        return JSONResponse(status_code=400, content={"message": "Query has to be a string!"})
+    if len(request_body.query) == 0:
+        return JSONResponse(status_code=400, content={"message": "Query cannot be empty!"})
+
+    try:
+        selected_fields = search_controller_service.get_selected_fields(compact, fields, CompactSerializationService.GROUP_FIELDS)
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"message": str(e)})
+
+    try:
+        cache_key = await response_cache.get_key(search_controller_service.get_cache_endpoint("/abstract/hybrid", selected_fields), request_body)
+        found, content = response_cache.get(cache_key)
+
+        if found:
+            return Response(content=content, media_type="application/json")
+
+        candidates = await search_controller_service.rank_candidates(request_body.query, "hybrid", request_body.amount, request_body.filter)
+        projection = compact_serialization_service.get_projection(selected_fields) if selected_fields is not None else None
+        page = await search_session_service.get_page(candidates, 0, request_body.amount, projection)
+
+        if selected_fields is not None:
+            with MetricsService.measure("serialize"):
+                content = compact_serialization_service.paper_groups_to_json(page, selected_fields)
+
+            return Response(content=response_cache.put_content(cache_key, content), media_type="application/json")
+
+        with MetricsService.measure("convert"):
+            response = AbstractSearchHybridResponseBody(result=conversion_service.paper_groups_to_class_object(page))
+
+        with MetricsService.measure("serialize"):
+            content = response_cache.put(cache_key, response)
+
+        return Response(content=content, media_type="application/json")
+    except Exception as e:
+        return JSONResponse(status_code=500, content={"message": "Internal error: " + str(e)})
+
+
+@router.post("/session", status_code=200, response_model=AbstractSearchPageResponseBody)
+async def create_abstract_search_session(request: Request, request_body: AbstractSearchSessionRequestBody, stream: bool = False) -> JSONResponse:
+    """Opens a search session over the papers' abstracts and returns its first page.
+    The ranked candidates (at most SEARCH_SESSION_MAX_RESULTS) are kept on the server, so that further pages
+    (GET /abstract/session/{session_id}) are served without searching again.
+
+    Args:
+        request (Request): The request.
+        request_body (AbstractSearchSessionRequestBody): The request body of the controller.
+        stream (bool, optional): Boolean indicating whether the page is streamed as NDJSON. Defaults to False.
+
+    Returns:
+        _type_: The response of the controller.
+        {"message": <content>} if error, AbstractSearchPageResponseBody (or NDJSON) otherwise.
+    """
+    if request_body == None:
+        return JSONResponse(status_code=400, content={"message": "Empty request body!"})
+    if not(isinstance(request_body, AbstractSearchSessionRequestBody)):
+        return JSONResponse(status_code=400, content={"message": "Wrong format of the request body!"})
+    if not(type(request_body.amount) == int):
+        return JSONResponse(status_code=400, content={"message": "Amount of results has to be a number!"})
+    if request_body.amount < 0:
+        return JSONResponse(status_code=400, content={"message": "Amount of results cannot be negative!"})
+    if not(type(request_body.query) == str):
+        return JSONResponse(status_code=400, content={"message": "Query has to be a string!"})
+    if len(request_body.query) == 0:
+        return JSONResponse(status_code=400, content={"message": "Query cannot be empty!"})
+    if request_body.mode not in SearchSessionService.MODES:
+        return JSONResponse(status_code=400, content={"message": "Mode has to be one of: " + ", ".join(SearchSessionService.MODES) + "!"})
+
+    try:
+        candidates = await search_controller_service.rank_candidates(request_body.query, request_body.mode,
+                                                                     max(search_session_max_results, request_body.amount), request_body.filter)
+        session_id = search_session_service.create(candidates)
+        return await search_controller_service.get_page_response(session_id, candidates, 0, request_body.amount, stream, request.scope["route"].path)
+    except Exception as e:
+        return JSONResponse(status_code=500, content={"message": "Internal error: " + str(e)})
+
+
+@router.get("/session/{session_id}", status_code=200, response_model=AbstractSearchPageResponseBody)
+async def get_abstract_search_page(request: Request, session_id: str, offset: int = 0, amount: int = 10, stream: bool = False) -> JSONResponse:
+    """Gets a page of an open search session over the papers' abstracts.
+
+    Args:
+        request (Request): The request.
+        session_id (str): The ID of the session.
+        offset (int, optional): The index of the first result of the page. Defaults to 0.
+        amount (int, optional): The amount of results of the page. Defaults to 10.
+        stream (bool, optional): Boolean indicating whether the page is streamed as NDJSON. Defaults to False.
+
+    Returns:
+        _type_: The response of the controller.
+        {"message": <content>} if error, AbstractSearchPageResponseBody (or NDJSON) otherwise.
+    """
+    if offset < 0:
+        return JSONResponse(status_code=400, content={"message": "Offset cannot be negative!"})
+    if amount < 0:
+        return JSONResponse(status_code=400, content={"message": "Amount of results cannot be negative!"})
+
+    try:
+        candidates = search_session_service.get_candidates(session_id)
+
+        if candidates is None:
+            return JSONResponse(status_code=404, content={"message": "The session does not exist or has expired!"})
+
+        return await search_controller_service.get_page_response(session_id, candidates, offset, amount, stream, request.scope["route"].path)
+    except Exception as e:
+        return JSONResponse(status_code=500, content={"message": "Internal error: " + str(e)})
+
+
+@router.post("/search/batch", status_code=200, response_model=AbstractSearchBatchResponseBody)
+async def search_by_abstract_batch(request_body: AbstractSearchBatchRequestBody, compact: bool = False, fields: str = None) -> JSONResponse:
+    """Performs a semantic search in the papers' abstracts for multiple queries.
+    The queries are embedded with one batched call of the model, the vector searches run concurrently
+    and the papers of all results are fetched with one deduplicated query.
+
+    Args:
+        request_body (AbstractSearchBatchRequestBody): The request body of the controller.
+        compact (bool, optional): Boolean indicating whether the response is serialized directly from the documents with orjson. Defaults to False.
+        fields (str, optional): The comma-separated fields of the compact response (implies compact, e.g. paperId,title,chunks). Defaults to None (all fields).
+
+    Returns:
+        _type_: The response of the controller.
+        {"message": <content>} if error, AbstractSearchBatchResponseBody otherwise.
+    """
+    if request_body == None:
+        return JSONResponse(status_code=400, content={"message": "Empty request body!"})
+    if not(isinstance(request_body, AbstractSearchBatchRequestBody)):
+        return JSONResponse(status_code=400, content={"message": "Wrong format of the request body!"})
+    if not(type(request_body.amount) == int):
+        return JSONResponse(status_code=400, content={"message": "Amount of results has to be a number!"})
+    if request_body.amount < 0:
+        return JSONResponse(status_code=400, content={"message": "Amount of results cannot be negative!"})
+    if len(request_body.queries) > batch_max_queries:
+        return JSONResponse(status_code=400, content={"message": "At most " + str(batch_max_queries) + " queries are allowed!"})
+    if len([el for el in request_body.queries if len(el) == 0]) > 0:
+        return JSONResponse(status_code=400, content={"message": "Queries cannot be empty!"})
+
+    try:
+        selected_fields = search_controller_service.get_selected_fields(compact, fields, CompactSerializationService.GROUP_FIELDS)
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"message": str(e)})
+
+    try:
+        with MetricsService.measure("preprocess"):
+            queries_preprocessed = await ExecutorManager.run_inference(lambda: [preprocessing_service.preprocess(el) for el in request_body.queries])
+
+        with MetricsService.measure("encode"):
+            queries_embedded = await ExecutorManager.run_inference(embeddings_service.create_embeddings, queries_preprocessed)
+
+        results = await asyncio.gather(*[vector_search_service.search_papers_async(el, request_body.amount, papers_service, over_fetch_factor, hydrate=False,
+                                                                                   search_filter=request_body.filter)
+                                         for el in queries_embedded])
+        paper_ids = list(set([group["paperId"] for groups in results for group in groups]))
+        projection = PapersService.RESULT_PROJECTION if selected_fields is None else compact_serialization_service.get_projection(selected_fields)
+
+        with MetricsService.measure("hydrate"):
+            papers = await papers_service.get_papers_async({"id": {"$in": paper_ids}}, projection) if len(paper_ids) > 0 else []
+
+        id_to_paper = {el["id"]: el for el in papers}
+
+        if selected_fields is not None:
+            with MetricsService.measure("serialize"):
+                content = compact_serialization_service.paper_group_lists_to_json([[dict(group, paper=id_to_paper[group["paperId"]])
+                                                                                    for group in groups if group["paperId"] in id_to_paper]
+                                                                                   for groups in results], selected_fields)
+
+            return Response(content=content, media_type="application/json")
+
+        with MetricsService.measure("convert"):
+            response_list = [conversion_service.paper_groups_to_class_object([dict(group, paper=id_to_paper[group["paperId"]])
+                                                                              for group in groups if group["paperId"] in id_to_paper])
+                             for groups in results]
+            response = AbstractSearchBatchResponseBody(result=response_list)
+
+        with MetricsService.measure("serialize"):
+            content = response.model_dump_json()
+
+        return Response(content=content, media_type="application/json")
     except Exception as e:
-        return JSONResponse(status_code=500, content={"message": "Internal error: " + str(e)})
\ No newline at end of file
+        return JSONResponse(status_code=500, content={"message": "Internal error: " + str(e)})
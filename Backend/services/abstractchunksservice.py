@@ -68,6 +68,30 @@ class AbstractChunksService(MongoDBService):
         return MongoDBService.aggregate_data(self, "papersDB", "abstractChunks", aggregation_data)
 
     
+    async def get_chunks_async(self, query: dict) -> list:
+        """Fetches the abstract chunks specified by a query without blocking the event loop.
+
+        Args:
+            query (dict): The query in dictionary format.
+
+        Returns:
+            list: A list including dictionaries of fetched data.
+        """
+        return await self.get_data_async("papersDB", "abstractChunks", query)
+
+    async def aggregate_data_async(self, aggregation_data: list[dict]) -> list:
+        """Aggregates the data using specific operations without blocking the event loop.
+
+        Args:
+            aggregation_data (list[dict]): Aggregation operations stored as a list of dictionaries.
+
+        Returns:
+            list: The aggregated result.
+        """
+        Helper.ensure_list_of_type(aggregation_data, dict, "aggregation_data must be a list!", "aggregation_data must contain elements of type dict!")
+
+        return await MongoDBService.aggregate_data_async(self, "papersDB", "abstractChunks", aggregation_data)
+
     def create_search_index(self, index_data: dict):
         """Creates a search index using specific index data.
 
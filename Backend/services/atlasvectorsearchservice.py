@@ -0,0 +1,223 @@
+from models.base_models.search_filter import SearchFilter
+from models.helper import Helper
+from services.metricsservice import MetricsService
+from services.mongodbservice import MongoDBService
+from services.papersservice import PapersService
+from services.searchfilterservice import SearchFilterService
+from services.vectorsearchservice import VectorSearchService
+
+
+class AtlasVectorSearchService(VectorSearchService):
+    """Represents a vector search service that delegates the search to the
+    $vectorSearch aggregation stage of a MongoDB Atlas cluster.
+
+    Args:
+        VectorSearchService (_type_): The abstract vector search service.
+    """
+    MAX_NUM_CANDIDATES = 10000
+
+    def __init__(self, chunks_service: MongoDBService, index_name: str, candidates_factor: int = 10):
+        """Initializes a new instance of AtlasVectorSearchService.
+
+        Args:
+            chunks_service (MongoDBService): The service that communicates with the chunk collection
+            (AbstractChunksService or TitleChunksService).
+            index_name (str): The name of the Atlas search index.
+            candidates_factor (int, optional): The amount of nearest neighbours considered by Atlas per returned chunk
+            (numCandidates = limit * candidates_factor, at most MAX_NUM_CANDIDATES). Defaults to 10.
+        """
+        Helper.ensure_instance(chunks_service, MongoDBService, "chunks_service must be an instance of MongoDBService!")
+        Helper.ensure_type(index_name, str, "index_name must be a str!")
+        Helper.ensure_type(candidates_factor, int, "candidates_factor must be an int!")
+
+        if candidates_factor <= 0:
+            raise ValueError("candidates_factor cannot be less or equal to 0!")
+
+        self.chunks_service = chunks_service
+        self.index_name = index_name
+        self.candidates_factor = candidates_factor
+
+    def search(self, query_vector: list[float], amount: int) -> list[dict]:
+        """Searches for the chunks that are the most similar to the query vector using $vectorSearch.
+
+        Args:
+            query_vector (list[float]): The embedded query.
+            amount (int): The amount of chunks to return.
+
+        Returns:
+            list[dict]: The matching chunks ordered by similarity.
+            Dictionary format: {"paperId": <paper-id>, "chunk": <chunk-text>, "score": <similarity>}.
+        """
+        Helper.ensure_type(query_vector, list, "query_vector must be a list!")
+        Helper.ensure_type(amount, int, "amount must be an int!")
+
+        results = self.chunks_service.aggregate_data(self.__get_pipeline(query_vector, amount))
+        return list(results)
+
+    async def search_async(self, query_vector: list[float], amount: int) -> list[dict]:
+        """Searches for the chunks that are the most similar to the query vector using $vectorSearch
+        on the asynchronous client, so the event loop is not blocked while waiting for the cluster.
+
+        Args:
+            query_vector (list[float]): The embedded query.
+            amount (int): The amount of chunks to return.
+
+        Returns:
+            list[dict]: The matching chunks ordered by similarity.
+            Dictionary format: {"paperId": <paper-id>, "chunk": <chunk-text>, "score": <similarity>}.
+        """
+        Helper.ensure_type(query_vector, list, "query_vector must be a list!")
+        Helper.ensure_type(amount, int, "amount must be an int!")
+
+        return await self.chunks_service.aggregate_data_async(self.__get_pipeline(query_vector, amount))
+
+    async def search_with_papers_async(self, query_vector: list[float], amount: int, papers_service: PapersService,
+                                       search_filter: SearchFilter = None, max_rounds: int = 4, projection: dict = None) -> list[dict]:
+        """Searches for the most similar chunks and joins their papers inside the same aggregation ($lookup),
+        so that the search and the hydration cost one round trip to the cluster.
+        Only the fields of the projection are fetched. Chunks without a matching paper are skipped.
+        The search filter is applied by $vectorSearch itself (pre-filtering on the denormalized fields of the chunks).
+
+        Args:
+            query_vector (list[float]): The embedded query.
+            amount (int): The amount of chunks to return.
+            papers_service (PapersService): The service that communicates with the papers collection (unused, the join happens on the cluster).
+            search_filter (SearchFilter, optional): The filter of the papers. Defaults to None (no filtering).
+            max_rounds (int, optional): Unused, pre-filtering needs a single round. Defaults to 4.
+            projection (dict, optional): The projection of the papers. Defaults to None (PapersService.RESULT_PROJECTION).
+
+        Returns:
+            list[dict]: The matching chunks ordered by similarity.
+            Dictionary format: {"paperId": <paper-id>, "chunk": <chunk-text>, "score": <similarity>, "paper": <paper>}.
+        """
+        Helper.ensure_type(query_vector, list, "query_vector must be a list!")
+        Helper.ensure_type(amount, int, "amount must be an int!")
+
+        pipeline = self.__get_pipeline(query_vector, amount, search_filter) + self.__get_lookup_stages("paperId", projection)
+        with MetricsService.measure("vector_search"):
+            return await self.chunks_service.aggregate_data_async(pipeline)
+
+    async def search_papers_async(self, query_vector: list[float], amount: int, papers_service: PapersService,
+                                  over_fetch_factor: int = 3, max_rounds: int = 4, hydrate: bool = True,
+                                  search_filter: SearchFilter = None, projection: dict = None) -> list[dict]:
+        """Searches for the most similar papers by grouping the most similar chunks by paper ($group)
+        and joins the papers inside the same aggregation ($lookup), so that every round costs one round trip.
+        Starts with amount * over_fetch_factor chunks and doubles the amount of chunks while fewer than amount papers were found
+        and $vectorSearch returned as many chunks as requested, at most max_rounds times.
+        The search filter is applied by $vectorSearch itself (pre-filtering on the denormalized fields of the chunks).
+
+        Args:
+            query_vector (list[float]): The embedded query.
+            amount (int): The amount of papers to return.
+            papers_service (PapersService): The service that communicates with the papers collection (unused, the join happens on the cluster).
+            over_fetch_factor (int, optional): The amount of chunks fetched per requested paper in the first round. Defaults to 3.
+            max_rounds (int, optional): The maximum amount of searches. Defaults to 4.
+            hydrate (bool, optional): Boolean indicating whether the papers are joined. Defaults to True.
+            search_filter (SearchFilter, optional): The filter of the papers. Defaults to None (no filtering).
+            projection (dict, optional): The projection of the papers. Defaults to None (PapersService.RESULT_PROJECTION).
+
+        Returns:
+            list[dict]: The matching papers ordered by similarity.
+            Dictionary format: {"paperId": <paper-id>, "score": <best-chunk-score>, "chunks": [<chunk>, ...], "paper": <paper>}.
+        """
+        Helper.ensure_type(query_vector, list, "query_vector must be a list!")
+        Helper.ensure_type(amount, int, "amount must be an int!")
+
+        if amount <= 0:
+            return []
+
+        limit = amount * over_fetch_factor
+
+        for i in range(max_rounds):
+            pipeline = self.__get_pipeline(query_vector, limit, search_filter) + [
+                {
+                    "$group": {
+                        "_id": "$paperId",
+                        "score": {"$max": "$score"},
+                        "chunks": {"$push": {"paperId": "$paperId", "chunk": "$chunk", "score": "$score"}}
+                    }
+                },
+                {"$sort": {"score": -1}},
+                {"$limit": amount}
+            ] + (self.__get_lookup_stages("_id", projection) if hydrate else []) + [
+                {"$project": {"_id": 0, "paperId": "$_id", "score": 1, "chunks": 1, "paper": 1}}
+            ]
+
+            with MetricsService.measure("vector_search"):
+                groups = await self.chunks_service.aggregate_data_async(pipeline)
+
+            if len(groups) >= amount or sum([len(el["chunks"]) for el in groups]) < limit:
+                break
+            limit *= 2
+
+        return groups
+
+    def get_num_candidates(self, limit: int) -> int:
+        """Gets the amount of nearest neighbours considered by Atlas for the given amount of returned chunks.
+
+        Args:
+            limit (int): The amount of chunks to return.
+
+        Returns:
+            int: The amount of candidates.
+        """
+        return max(limit, min(limit * self.candidates_factor, AtlasVectorSearchService.MAX_NUM_CANDIDATES))
+
+    def __get_lookup_stages(self, local_field: str, projection: dict = None) -> list[dict]:
+        """Creates the aggregation stages that join the paper of every document (only the fields of the projection).
+        Documents without a matching paper are dropped.
+
+        Args:
+            local_field (str): The field holding the paper ID.
+            projection (dict, optional): The projection of the papers. Defaults to None (PapersService.RESULT_PROJECTION).
+
+        Returns:
+            list[dict]: The aggregation operations.
+        """
+        return [
+            {
+                "$lookup": {
+                    "from": "papers",
+                    "localField": local_field,
+                    "foreignField": "id",
+                    "pipeline": [{"$limit": 1}, {"$project": PapersService.RESULT_PROJECTION if projection is None else projection}],
+                    "as": "paper"
+                }
+            },
+            {"$unwind": "$paper"}
+        ]
+
+    def __get_pipeline(self, query_vector: list[float], amount: int, search_filter: SearchFilter = None) -> list[dict]:
+        """Creates the aggregation pipeline of the vector search.
+
+        Args:
+            query_vector (list[float]): The embedded query.
+            amount (int): The amount of chunks to return.
+            search_filter (SearchFilter, optional): The filter of the papers. Defaults to None (no filtering).
+
+        Returns:
+            list[dict]: The aggregation operations.
+        """
+        vector_search = {
+            "queryVector": query_vector,
+            "path": "chunkVector",
+            "numCandidates": self.get_num_candidates(amount),
+            "limit": amount,
+            "index": self.index_name,
+        }
+        chunk_filter = SearchFilterService.to_chunk_filter(search_filter)
+
+        if chunk_filter is not None:
+            vector_search["filter"] = chunk_filter
+
+        return [
+            {"$vectorSearch": vector_search},
+            {
+                "$project":{
+                    "_id": 0,
+                    "paperId": 1,
+                    "chunk": 1,
+                    "score": {"$meta": "vectorSearchScore"}
+                }
+            }
+        ]
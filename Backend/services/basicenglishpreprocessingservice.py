@@ -17,6 +17,7 @@ class BasicEnglishPreprocessingService(PreprocessingService):
         """
         Helper.ensure_list_of_type(stopwords, str, "stopwords must be a list!", "stopwords must contain elements of type string!")
         self.stopwords = list(set([el.lower() for el in stopwords]))
+        self.__stopword_set = set(self.stopwords)
 
     def preprocess(self, data: str) -> str:
         """Preprocesses the data passed as a text string.
@@ -30,6 +31,6 @@ class BasicEnglishPreprocessingService(PreprocessingService):
         Helper.ensure_type(data, str, "data must be a str!")
         lowercased = data.lower()
         word_tokens = re.findall(r"\d+|\w+", lowercased)
-        word_tokens = [el for el in word_tokens if el not in self.stopwords]
+        word_tokens = [el for el in word_tokens if el not in self.__stopword_set]
         result = " ".join(word_tokens)
         return result
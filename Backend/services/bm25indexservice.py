@@ -0,0 +1,168 @@
+import heapq
+import json
+import math
+import os
+from models.helper import Helper
+from services.preprocessingservice import PreprocessingService
+
+
+class BM25IndexService:
+    """Represents a persistent inverted index with positional postings that ranks papers using BM25.
+    The text field of every paper is tokenized by the preprocessing service (lowercasing, stopword removal),
+    so that a query only touches the posting lists of its own terms instead of every paper.
+    """
+    def __init__(self, preprocessing_service: PreprocessingService, k1: float = 1.2, b: float = 0.75):
+        """Initializes a new (empty) instance of BM25IndexService.
+
+        Args:
+            preprocessing_service (PreprocessingService): The preprocessing service used to tokenize papers and queries.
+            k1 (float, optional): The term frequency saturation parameter of BM25. Defaults to 1.2.
+            b (float, optional): The document length normalization parameter of BM25. Defaults to 0.75.
+        """
+        Helper.ensure_instance(preprocessing_service, PreprocessingService, "preprocessing_service must be an instance of PreprocessingService!")
+        Helper.ensure_type(k1, float, "k1 must be a float!")
+        Helper.ensure_type(b, float, "b must be a float!")
+        self.preprocessing_service = preprocessing_service
+        self.k1 = k1
+        self.b = b
+        self.paper_ids = []
+        self.lengths = []
+        self.postings = {}
+        self.__average_length = 0
+
+    def build(self, papers: list[dict], field: str):
+        """Builds the index from the given papers.
+
+        Args:
+            papers (list[dict]): The papers fetched from the papers collection. Dictionary format: {"id": <paper-id>, <field>: <text>, ...}.
+            field (str): The text field of the papers to index (e.g. "abstract").
+        """
+        Helper.ensure_list_of_type(papers, dict, "papers must be a list!", "papers must contain elements of type dict!")
+        Helper.ensure_type(field, str, "field must be a str!")
+        self.paper_ids = []
+        self.lengths = []
+        self.postings = {}
+
+        for document, paper in enumerate(papers):
+            tokens = self.tokenize(paper[field])
+            self.paper_ids.append(paper["id"])
+            self.lengths.append(len(tokens))
+
+            for position, token in enumerate(tokens):
+                self.postings.setdefault(token, {}).setdefault(document, []).append(position)
+
+        self.__update_statistics()
+
+    def search(self, query: str, amount: int) -> list[tuple]:
+        """Searches for the papers that contain all terms of the query.
+        Papers that contain the terms as a phrase are ranked first, the rest of the ordering is given by the BM25 score.
+
+        Args:
+            query (str): The query.
+            amount (int): The amount of papers to return.
+
+        Returns:
+            list[tuple]: The matching papers as (paper ID, score) tuples ordered by relevance.
+        """
+        Helper.ensure_type(query, str, "query must be a str!")
+        Helper.ensure_type(amount, int, "amount must be an int!")
+        terms = self.tokenize(query)
+
+        if len(terms) == 0 or amount <= 0:
+            return []
+        if any([el not in self.postings for el in terms]):
+            return []
+
+        unique_terms = sorted(set(terms), key=lambda x: len(self.postings[x]))
+        candidates = [el for el in self.postings[unique_terms[0]] if all([el in self.postings[t] for t in unique_terms[1:]])]
+        document_count = len(self.paper_ids)
+        idfs = {el: math.log(1 + (document_count - len(self.postings[el]) + 0.5) / (len(self.postings[el]) + 0.5)) for el in unique_terms}
+        scored = []
+
+        for document in candidates:
+            length_norm = self.k1 * (1 - self.b + self.b * self.lengths[document] / self.__average_length)
+            score = 0
+
+            for term in unique_terms:
+                frequency = len(self.postings[term][document])
+                score += idfs[term] * frequency * (self.k1 + 1) / (frequency + length_norm)
+
+            scored.append((self.__contains_phrase(terms, document), score, document))
+
+        top = heapq.nlargest(amount, scored)
+        return [(self.paper_ids[el[2]], el[1]) for el in top]
+
+    def tokenize(self, text: str) -> list[str]:
+        """Tokenizes the text using the preprocessing service.
+
+        Args:
+            text (str): The text.
+
+        Returns:
+            list[str]: The tokens.
+        """
+        return self.preprocessing_service.preprocess(text).split()
+
+    def save(self, path: str):
+        """Saves the index as a JSON file (written to a temporary file first and moved into place afterwards).
+
+        Args:
+            path (str): The path of the file.
+        """
+        Helper.ensure_type(path, str, "path must be a str!")
+        directory = os.path.dirname(path)
+
+        if directory != "":
+            os.makedirs(directory, exist_ok=True)
+
+        temp_path = path + ".tmp-" + str(os.getpid())
+
+        with open(temp_path, "w") as index_file:
+            json.dump({"paperIds": self.paper_ids, "lengths": self.lengths,
+                       "postings": {term: [[document, positions] for document, positions in postings.items()] for term, postings in self.postings.items()}},
+                      index_file)
+
+        os.replace(temp_path, path)
+
+    def load(self, path: str):
+        """Loads an index saved as a JSON file.
+
+        Args:
+            path (str): The path of the file.
+        """
+        Helper.ensure_type(path, str, "path must be a str!")
+
+        with open(path) as index_file:
+            data = json.load(index_file)
+
+        self.paper_ids = data["paperIds"]
+        self.lengths = data["lengths"]
+        self.postings = {term: {el[0]: el[1] for el in postings} for term, postings in data["postings"].items()}
+        self.__update_statistics()
+
+    def __contains_phrase(self, terms: list[str], document: int) -> bool:
+        """Checks whether the document contains the terms at consecutive positions.
+
+        Args:
+            terms (list[str]): The terms of the query.
+            document (int): The document.
+
+        Returns:
+            bool: Boolean indicating whether the document contains the phrase.
+        """
+        if len(terms) == 1:
+            return True
+
+        following_positions = [set(self.postings[el][document]) for el in terms[1:]]
+
+        for position in self.postings[terms[0]][document]:
+            if all([position + i + 1 in el for i, el in enumerate(following_positions)]):
+                return True
+
+        return False
+
+    def __update_statistics(self):
+        """Updates the statistics of the corpus used by BM25.
+        """
+        self.__average_length = sum(self.lengths) / len(self.lengths) if len(self.lengths) > 0 else 0
+        self.__average_length = max(self.__average_length, 1)
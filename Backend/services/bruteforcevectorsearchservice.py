@@ -0,0 +1,94 @@
+import numpy as np
+from models.helper import Helper
+from services.chunkvectorstore import ChunkVectorStore
+from services.vectorsearchservice import VectorSearchService
+
+
+class BruteForceVectorSearchService(VectorSearchService):
+    """Represents a vector search service that performs an exact k nearest neighbour search in-process.
+    The query is compared to every chunk with one matrix-vector product over the memory-mapped,
+    normalized float32 matrix of the chunk vector store (perfect recall).
+
+    Args:
+        VectorSearchService (_type_): The abstract vector search service.
+    """
+    def __init__(self, directory: str):
+        """Initializes a new instance of BruteForceVectorSearchService.
+
+        Args:
+            directory (str): The directory of the chunk vector store.
+        """
+        self.store = ChunkVectorStore(directory)
+
+    def search(self, query_vector: list[float], amount: int) -> list[dict]:
+        """Searches for the chunks that are the most similar to the query vector.
+
+        Args:
+            query_vector (list[float]): The embedded query.
+            amount (int): The amount of chunks to return.
+
+        Returns:
+            list[dict]: The matching chunks ordered by cosine similarity.
+            Dictionary format: {"paperId": <paper-id>, "chunk": <chunk-text>, "score": <cosine-similarity>}.
+        """
+        Helper.ensure_type(query_vector, list, "query_vector must be a list!")
+
+        return self.search_batch([query_vector], amount)[0]
+
+    def search_batch(self, query_vectors: list[list[float]], amount: int) -> list[list[dict]]:
+        """Searches for the most similar chunks of multiple query vectors with one matrix-matrix product.
+
+        Args:
+            query_vectors (list[list[float]]): The embedded queries.
+            amount (int): The amount of chunks to return per query.
+
+        Returns:
+            list[list[dict]]: The matching chunks of every query ordered by cosine similarity.
+        """
+        Helper.ensure_list_of_type(query_vectors, list, "query_vectors must be a list!", "query_vectors must contain elements of type list!")
+        Helper.ensure_type(amount, int, "amount must be an int!")
+
+        if len(query_vectors) == 0:
+            return []
+
+        if amount <= 0:
+            return [[] for el in query_vectors]
+
+        queries = ChunkVectorStore.normalize(query_vectors)
+        scores = queries @ self.store.vectors.T
+        indices = BruteForceVectorSearchService.top_k(scores, amount)
+        result = []
+
+        for row, row_indices in enumerate(indices.tolist()):
+            row_result = []
+
+            for index in row_indices:
+                chunk = self.store.get_chunk(index)
+                chunk["score"] = float(scores[row, index])
+                row_result.append(chunk)
+
+            result.append(row_result)
+
+        return result
+
+    @staticmethod
+    def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+        """Gets the column indices of the k highest scores of every row, ordered by descending score.
+        Uses argpartition (linear time), so only the k selected columns are sorted.
+
+        Args:
+            scores (np.ndarray): The score matrix of shape (queries, chunks).
+            k (int): The amount of indices per row.
+
+        Returns:
+            np.ndarray: The index matrix of shape (queries, min(k, chunks)).
+        """
+        k = min(k, scores.shape[1])
+
+        if k < scores.shape[1]:
+            indices = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            indices = np.tile(np.arange(scores.shape[1]), (scores.shape[0], 1))
+
+        order = np.argsort(-np.take_along_axis(scores, indices, axis=1), axis=1)
+        return np.take_along_axis(indices, order, axis=1)
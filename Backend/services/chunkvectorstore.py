@@ -0,0 +1,236 @@
+import os
+import shutil
+import numpy as np
+from models.helper import Helper
+
+
+class ChunkVectorStore:
+    """Represents a directory on disk that stores the chunk embeddings as one contiguous,
+    L2-normalized float32 matrix together with a parallel table of paper IDs and chunk texts.
+    All files are NumPy arrays that are memory-mapped when the store is opened, so the
+    operating system pages the data in on demand and shares it between processes.
+
+    Layout of the directory:
+        vectors.npy: float32 matrix of shape (chunk count, dimensions).
+        paper_ids.npy / paper_ids_offsets.npy: UTF-8 bytes of all paper IDs and their start/end offsets.
+        chunks.npy / chunks_offsets.npy: UTF-8 bytes of all chunk texts and their start/end offsets.
+    """
+    VECTORS_FILE = "vectors.npy"
+    PAPER_IDS_TABLE = "paper_ids"
+    CHUNKS_TABLE = "chunks"
+
+    def __init__(self, directory: str):
+        """Initializes a new instance of ChunkVectorStore by memory-mapping an exported store.
+
+        Args:
+            directory (str): The directory of the store.
+
+        Raises:
+            FileNotFoundError: Is thrown if the directory does not contain an exported store.
+        """
+        Helper.ensure_type(directory, str, "directory must be a str!")
+
+        if not ChunkVectorStore.exists(directory):
+            raise FileNotFoundError("No chunk vector store found in " + directory + "!")
+
+        self.directory = directory
+        self.vectors = np.load(os.path.join(directory, ChunkVectorStore.VECTORS_FILE), mmap_mode="r")
+        self.__paper_ids, self.__paper_ids_offsets = ChunkVectorStore.__load_string_table(directory, ChunkVectorStore.PAPER_IDS_TABLE)
+        self.__chunks, self.__chunks_offsets = ChunkVectorStore.__load_string_table(directory, ChunkVectorStore.CHUNKS_TABLE)
+
+    def __len__(self) -> int:
+        """Gets the amount of stored chunks.
+
+        Returns:
+            int: The amount of stored chunks.
+        """
+        return self.vectors.shape[0]
+
+    def get_dimensions(self) -> int:
+        """Gets the dimensionality of the stored vectors.
+
+        Returns:
+            int: The amount of dimensions.
+        """
+        return self.vectors.shape[1]
+
+    def get_paper_id(self, index: int) -> str:
+        """Gets the paper ID of the chunk at the given row.
+
+        Args:
+            index (int): The row of the chunk.
+
+        Returns:
+            str: The paper ID.
+        """
+        return ChunkVectorStore.__read_string(self.__paper_ids, self.__paper_ids_offsets, index)
+
+    def get_chunk(self, index: int) -> dict:
+        """Gets the chunk at the given row.
+
+        Args:
+            index (int): The row of the chunk.
+
+        Returns:
+            dict: The chunk. Dictionary format: {"paperId": <paper-id>, "chunk": <chunk-text>}.
+        """
+        return {"paperId": self.get_paper_id(index),
+                "chunk": ChunkVectorStore.__read_string(self.__chunks, self.__chunks_offsets, index)}
+
+    @staticmethod
+    def exists(directory: str) -> bool:
+        """Checks whether the directory contains an exported store.
+
+        Args:
+            directory (str): The directory of the store.
+
+        Returns:
+            bool: Boolean indicating whether the store exists.
+        """
+        Helper.ensure_type(directory, str, "directory must be a str!")
+        files = [ChunkVectorStore.VECTORS_FILE]
+
+        for table in [ChunkVectorStore.PAPER_IDS_TABLE, ChunkVectorStore.CHUNKS_TABLE]:
+            files += [table + ".npy", table + "_offsets.npy"]
+
+        return all([os.path.isfile(os.path.join(directory, el)) for el in files])
+
+    @staticmethod
+    def export(chunks: list[dict], directory: str):
+        """Exports chunks fetched from a chunk collection into the directory.
+        The vectors are L2-normalized, so that the dot product equals the cosine similarity.
+        The store is written into a fresh temporary directory first, which then replaces the whole directory,
+        so that readers never observe a partially written store and no files of an earlier index
+        (e.g. the graph of an HNSW index) survive the export.
+
+        Args:
+            chunks (list[dict]): The chunks. Dictionary format: {"paperId": <paper-id>, "chunk": <chunk-text>, "chunkVector": <embedding-vector>}.
+            directory (str): The directory of the store.
+
+        Raises:
+            ValueError: Is thrown if chunks is empty.
+        """
+        Helper.ensure_type(directory, str, "directory must be a str!")
+        temp_directory = ChunkVectorStore.create_temp_directory(directory)
+        ChunkVectorStore.write(chunks, temp_directory)
+        ChunkVectorStore.replace_directory(temp_directory, directory)
+
+    @staticmethod
+    def write(chunks: list[dict], directory: str):
+        """Writes the files of the store into the directory (used to fill a temporary directory before it is swapped in).
+
+        Args:
+            chunks (list[dict]): The chunks. Dictionary format: {"paperId": <paper-id>, "chunk": <chunk-text>, "chunkVector": <embedding-vector>}.
+            directory (str): The directory.
+
+        Raises:
+            ValueError: Is thrown if chunks is empty.
+        """
+        Helper.ensure_list_of_type(chunks, dict, "chunks must be a list!", "chunks must contain elements of type dict!")
+        Helper.ensure_type(directory, str, "directory must be a str!")
+
+        if len(chunks) == 0:
+            raise ValueError("chunks cannot be empty!")
+
+        vectors = np.asarray([el["chunkVector"] for el in chunks], dtype=np.float32)
+        vectors = ChunkVectorStore.normalize(vectors)
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, ChunkVectorStore.VECTORS_FILE), np.ascontiguousarray(vectors))
+        ChunkVectorStore.__save_string_table(directory, ChunkVectorStore.PAPER_IDS_TABLE, [el["paperId"] for el in chunks])
+        ChunkVectorStore.__save_string_table(directory, ChunkVectorStore.CHUNKS_TABLE, [el["chunk"] for el in chunks])
+
+    @staticmethod
+    def normalize(vectors: np.ndarray) -> np.ndarray:
+        """L2-normalizes the rows of the matrix (zero rows remain zero).
+
+        Args:
+            vectors (np.ndarray): The matrix or a single vector.
+
+        Returns:
+            np.ndarray: The normalized float32 matrix or vector.
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        norms[norms == 0] = 1
+        return vectors / norms
+
+    @staticmethod
+    def create_temp_directory(directory: str) -> str:
+        """Creates an empty temporary directory next to the directory (a leftover of a failed export is removed).
+
+        Args:
+            directory (str): The directory that is replaced by the temporary directory later.
+
+        Returns:
+            str: The path of the temporary directory.
+        """
+        temp_directory = os.path.abspath(directory) + ".tmp-" + str(os.getpid())
+        shutil.rmtree(temp_directory, ignore_errors=True)
+        os.makedirs(temp_directory)
+        return temp_directory
+
+    @staticmethod
+    def replace_directory(source: str, target: str):
+        """Replaces the whole target directory by the source directory.
+        The target is renamed out of the way first, so that the swap consists of two renames,
+        and removed afterwards (stores that are still memory-mapped stay readable until they are closed).
+
+        Args:
+            source (str): The source directory.
+            target (str): The target directory.
+        """
+        target = os.path.abspath(target)
+        old_directory = target + ".old-" + str(os.getpid())
+        shutil.rmtree(old_directory, ignore_errors=True)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+
+        if os.path.isdir(target):
+            os.replace(target, old_directory)
+
+        os.replace(source, target)
+        shutil.rmtree(old_directory, ignore_errors=True)
+
+    @staticmethod
+    def __save_string_table(directory: str, name: str, values: list[str]):
+        """Saves the strings as one UTF-8 byte array and an offset array.
+
+        Args:
+            directory (str): The directory.
+            name (str): The name of the table.
+            values (list[str]): The strings to save.
+        """
+        encoded = [el.encode("utf-8") for el in values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(el) for el in encoded])
+        data = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+        np.save(os.path.join(directory, name + ".npy"), data)
+        np.save(os.path.join(directory, name + "_offsets.npy"), offsets)
+
+    @staticmethod
+    def __load_string_table(directory: str, name: str) -> tuple:
+        """Memory-maps a string table.
+
+        Args:
+            directory (str): The directory.
+            name (str): The name of the table.
+
+        Returns:
+            tuple: The byte array and the offset array.
+        """
+        data = np.load(os.path.join(directory, name + ".npy"), mmap_mode="r")
+        offsets = np.load(os.path.join(directory, name + "_offsets.npy"), mmap_mode="r")
+        return data, offsets
+
+    @staticmethod
+    def __read_string(data: np.ndarray, offsets: np.ndarray, index: int) -> str:
+        """Reads a string from a string table.
+
+        Args:
+            data (np.ndarray): The byte array.
+            offsets (np.ndarray): The offset array.
+            index (int): The index of the string.
+
+        Returns:
+            str: The string.
+        """
+        return data[offsets[index]:offsets[index + 1]].tobytes().decode("utf-8")
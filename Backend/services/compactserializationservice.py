@@ -0,0 +1,148 @@
+import orjson
+from models.helper import Helper
+
+
+class CompactSerializationService:
+    """Represents a service that serializes search results directly from the MongoDB documents with orjson.
+    The documents are not converted to pydantic Base models and not validated again, and only the selected fields are written.
+    The JSON has the same shape as the one of the pydantic response bodies (missing fields are the ones that were not selected).
+    """
+    PAPER_FIELDS = ["paperId", "title", "abstract", "publicationDate", "authors"]
+    GROUP_FIELDS = PAPER_FIELDS + ["chunks"]
+    __FIELD_TO_PATH = {"paperId": "id", "title": "title", "abstract": "abstract", "publicationDate": "publicationDate", "authors": "authors.fullName"}
+
+    def parse_fields(self, fields: str, allowed_fields: list[str]) -> list[str]:
+        """Parses a comma-separated field selection.
+
+        Args:
+            fields (str): The selected fields (e.g. "paperId,title,chunks") or None (all fields).
+            allowed_fields (list[str]): The fields that can be selected (PAPER_FIELDS or GROUP_FIELDS).
+
+        Raises:
+            ValueError: Is thrown if a field cannot be selected.
+
+        Returns:
+            list[str]: The selected fields.
+        """
+        if fields is None or len(fields.strip()) == 0:
+            return list(allowed_fields)
+
+        Helper.ensure_type(fields, str, "fields must be a str!")
+        selected = [el.strip() for el in fields.split(",") if len(el.strip()) > 0]
+
+        for field in selected:
+            if field not in allowed_fields:
+                raise ValueError("Unknown field: " + field + "! Allowed fields: " + ", ".join(allowed_fields) + "!")
+
+        return selected
+
+    def get_projection(self, fields: list[str]) -> dict:
+        """Creates the projection of the papers collection that fetches only the selected fields.
+
+        Args:
+            fields (list[str]): The selected fields.
+
+        Returns:
+            dict: The projection (the ID is always fetched).
+        """
+        projection = {"_id": 0, "id": 1}
+
+        for field in fields:
+            if field in CompactSerializationService.__FIELD_TO_PATH:
+                projection[CompactSerializationService.__FIELD_TO_PATH[field]] = 1
+
+        return projection
+
+    def papers_to_json(self, papers: list[dict], paper_ids: list[str], fields: list[str]) -> bytes:
+        """Serializes papers ordered by the given paper IDs as {"result": [<paper>, ...]}.
+        IDs without a matching paper are skipped.
+
+        Args:
+            papers (list[dict]): Paper information as list of dictionaries.
+            Dictionary format: {"id": <paper-id>, "title": <paper-title>, "abstract": <paper-abstract>, "publicationDate": <paper-publication-date>,
+            "authors": [{"fullName": <name>}, ...]}.
+            paper_ids (list[str]): The IDs of the papers in the order of the result.
+            fields (list[str]): The selected fields.
+
+        Returns:
+            bytes: The JSON.
+        """
+        Helper.ensure_list_of_type(papers, dict, "papers must be a list!", "papers must contain elements of type dict!")
+        Helper.ensure_list_of_type(paper_ids, str, "paper_ids must be a list!", "paper_ids must contain elements of type str!")
+        id_to_paper = {el["id"]: el for el in papers}
+        result = [self.__paper_to_dict(id_to_paper[el], fields) for el in paper_ids if el in id_to_paper]
+        return orjson.dumps({"result": result})
+
+    def paper_groups_to_json(self, paper_groups: list[dict], fields: list[str]) -> bytes:
+        """Serializes papers grouped with their matching abstract chunks as {"result": [{"paper": <paper>, "chunks": [<chunk>, ...]}, ...]}.
+
+        Args:
+            paper_groups (list[dict]): The papers with their chunks.
+            Dictionary format: {"paperId": <paper-id>, "paper": <paper>, "chunks": [{"paperId": <paper-id>, "chunk": <chunk-text>, "score": <score>}, ...]}.
+            fields (list[str]): The selected fields.
+
+        Returns:
+            bytes: The JSON.
+        """
+        return orjson.dumps({"result": self.paper_groups_to_list(paper_groups, fields)})
+
+    def paper_group_lists_to_json(self, paper_group_lists: list[list[dict]], fields: list[str]) -> bytes:
+        """Serializes the grouped papers of multiple searches as {"result": [[{"paper": <paper>, "chunks": [<chunk>, ...]}, ...], ...]}.
+
+        Args:
+            paper_group_lists (list[list[dict]]): The papers with their chunks of every search (see paper_groups_to_json).
+            fields (list[str]): The selected fields.
+
+        Returns:
+            bytes: The JSON.
+        """
+        Helper.ensure_type(paper_group_lists, list, "paper_group_lists must be a list!")
+        return orjson.dumps({"result": [self.paper_groups_to_list(el, fields) for el in paper_group_lists]})
+
+    def paper_groups_to_list(self, paper_groups: list[dict], fields: list[str]) -> list[dict]:
+        """Converts papers grouped with their matching abstract chunks to plain dictionaries of the selected fields.
+
+        Args:
+            paper_groups (list[dict]): The papers with their chunks (see paper_groups_to_json).
+            fields (list[str]): The selected fields.
+
+        Returns:
+            list[dict]: The dictionaries.
+            Dictionary format: {"paper": <paper>, "chunks": [{"paperId": <paper-id>, "chunkText": <chunk-text>, "score": <score>}, ...]}.
+        """
+        Helper.ensure_list_of_type(paper_groups, dict, "paper_groups must be a list!", "paper_groups must contain elements of type dict!")
+        result = []
+
+        for group in paper_groups:
+            to_append = {"paper": self.__paper_to_dict(group["paper"], fields)}
+
+            if "chunks" in fields:
+                to_append["chunks"] = [{"paperId": el["paperId"], "chunkText": el["chunk"], "score": el.get("score")} for el in group["chunks"]]
+
+            result.append(to_append)
+
+        return result
+
+    def __paper_to_dict(self, paper: dict, fields: list[str]) -> dict:
+        """Converts a paper document to a dictionary of the selected fields (in the format of the Paper model).
+
+        Args:
+            paper (dict): The paper.
+            fields (list[str]): The selected fields.
+
+        Returns:
+            dict: The dictionary.
+        """
+        result = {}
+
+        for field in fields:
+            if field == "paperId":
+                result["paperId"] = paper["id"]
+            elif field == "publicationDate":
+                result["publicationDate"] = str(paper["publicationDate"])
+            elif field == "authors":
+                result["authors"] = [{"fullName": el["fullName"]} for el in paper["authors"]]
+            elif field in CompactSerializationService.PAPER_FIELDS:
+                result[field] = paper[field]
+
+        return result
@@ -23,10 +23,11 @@ class ConversionService:
         """
         Helper.ensure_list_of_type(papers, dict, "papers must be a list!", "papers must contain elements of type dict!")  
         Helper.ensure_list_of_type(paper_id_chunk_dicts, dict, "paper_id_chunk_dicts must be a list!", "paper_id_chunk_dicts must contain elements of type dict!")          
+        id_to_paper = {el["id"]: el for el in papers}
         result = []
 
         for ch_dict in paper_id_chunk_dicts:
-            paper = [el for el in papers if el["id"] == ch_dict["paperId"]][0]
+            paper = id_to_paper[ch_dict["paperId"]]
             paper_obj = Paper(paperId=paper["id"],  title=paper["title"], abstract=paper["abstract"], publicationDate=str(paper["publicationDate"]),
                               authors=[Author(fullName=e["fullName"]) for e in paper["authors"]])
             chunk = AbstractChunk(paperId=ch_dict["paperId"], chunkText=ch_dict["chunk"])
@@ -51,12 +52,63 @@ class ConversionService:
         """
         Helper.ensure_list_of_type(papers, dict, "papers must be a list!", "papers must contain elements of type dict!")  
         Helper.ensure_list_of_type(paper_id_chunk_dicts, dict, "paper_id_chunk_dicts must be a list!", "paper_id_chunk_dicts must contain elements of type dict!")                  
+        id_to_paper = {el["id"]: el for el in papers}
         result = []
 
         for ch_dict in paper_id_chunk_dicts:
-            paper = [el for el in papers if el["id"] == ch_dict["paperId"]][0]
+            paper = id_to_paper[ch_dict["paperId"]]
             paper_obj = Paper(paperId=paper["id"],  title=paper["title"], abstract=paper["abstract"], publicationDate=str(paper["publicationDate"]),
                               authors=[Author(fullName=e["fullName"]) for e in paper["authors"]])
             result.append(paper_obj)
 
-        return result
\ No newline at end of file
+        return result
+    
+    def papers_to_class_object(self, papers: list[dict], paper_ids: list[str]) -> list[Paper]:
+        """Converts paper dictionaries to pydantic Base models ordered by the given paper IDs.
+        IDs without a matching paper are skipped.
+
+        Args:
+            papers (list[dict]): Paper information as list of dictionaries.
+            Dictionary format: {"id": <paper-id>, "title": <paper-title>, "abstract": <paper-abstract>, "publicationDate": <paper-publication-date>,
+            "authors": [{"fullName": <name>}, ...]}.
+            paper_ids (list[str]): The IDs of the papers in the order of the result.
+
+        Returns:
+            list[Paper]: List of instances of Paper.
+        """
+        Helper.ensure_list_of_type(papers, dict, "papers must be a list!", "papers must contain elements of type dict!")
+        Helper.ensure_list_of_type(paper_ids, str, "paper_ids must be a list!", "paper_ids must contain elements of type str!")
+        id_to_paper = {el["id"]: el for el in papers}
+        result = []
+
+        for paper_id in paper_ids:
+            if paper_id not in id_to_paper:
+                continue
+            paper = id_to_paper[paper_id]
+            paper_obj = Paper(paperId=paper["id"],  title=paper["title"], abstract=paper["abstract"], publicationDate=str(paper["publicationDate"]),
+                              authors=[Author(fullName=e["fullName"]) for e in paper["authors"]])
+            result.append(paper_obj)
+
+        return result
+
+    def paper_groups_to_class_object(self, paper_groups: list[dict]) -> list[PaperToAbstractChunks]:
+        """Converts papers grouped with their matching abstract chunks to a specific pydantic Base model (one instance per paper).
+
+        Args:
+            paper_groups (list[dict]): The papers with their chunks.
+            Dictionary format: {"paperId": <paper-id>, "paper": <paper>, "chunks": [{"paperId": <paper-id>, "chunk": <chunk-text>, "score": <score>}, ...]}.
+
+        Returns:
+            list[PaperToAbstractChunks]: List of instances of PaperToAbstractChunks.
+        """
+        Helper.ensure_list_of_type(paper_groups, dict, "paper_groups must be a list!", "paper_groups must contain elements of type dict!")
+        result = []
+
+        for group in paper_groups:
+            paper = group["paper"]
+            paper_obj = Paper(paperId=paper["id"],  title=paper["title"], abstract=paper["abstract"], publicationDate=str(paper["publicationDate"]),
+                              authors=[Author(fullName=e["fullName"]) for e in paper["authors"]])
+            chunks = [AbstractChunk(paperId=el["paperId"], chunkText=el["chunk"], score=el.get("score")) for el in group["chunks"]]
+            result.append(PaperToAbstractChunks(paper=paper_obj, chunks=chunks))
+
+        return result
@@ -0,0 +1,35 @@
+from services.mongodbservice import MongoDBService
+
+class CorpusVersionService(MongoDBService):
+    """Represents a service that deals with data from MongoDB.
+    It communicates with a collection that stores the version stamp of the corpus.
+    The ETL pipelines bump the stamp whenever they write papers, abstract chunks or title chunks.
+
+    Args:
+        MongoDBService (_type_): Service that communicates with MongoDB database.
+    """
+    def __init__(self, url):
+        """Initializes a new instance of CorpusVersionService.
+
+        Args:
+            url (str): The URL of the MongoDB cluster.
+        """
+        MongoDBService.__init__(self, url)
+
+    def get_version(self) -> int:
+        """Fetches the version stamp of the corpus.
+
+        Returns:
+            int: The version (0 if the corpus was never stamped).
+        """
+        result = self.get_data("papersDB", "corpusVersion", {"_id": "corpus"})
+        return result[0]["version"] if len(result) > 0 else 0
+
+    async def get_version_async(self) -> int:
+        """Fetches the version stamp of the corpus without blocking the event loop.
+
+        Returns:
+            int: The version (0 if the corpus was never stamped).
+        """
+        result = await self.get_data_async("papersDB", "corpusVersion", {"_id": "corpus"})
+        return result[0]["version"] if len(result) > 0 else 0
@@ -0,0 +1,107 @@
+import asyncio
+from models.helper import Helper
+from services.embeddingservice import EmbeddingService
+from services.executormanager import ExecutorManager
+
+
+class EmbeddingBatchingService:
+    """Represents a request coalescer around an embedding service.
+    Concurrent create_embedding_async calls are collected for a few milliseconds (or until the maximum batch size is reached),
+    embedded with one batched call of create_embeddings and the vectors are handed back to the waiting coroutines.
+    This keeps the model busy with batches instead of running it once per request.
+    """
+    def __init__(self, embedding_service: EmbeddingService, max_batch_size: int = 32, max_wait_ms: float = 5.0):
+        """Initializes a new instance of EmbeddingBatchingService.
+
+        Args:
+            embedding_service (EmbeddingService): The embedding service that embeds the batches.
+            max_batch_size (int, optional): The maximum amount of texts per batch. Defaults to 32.
+            max_wait_ms (float, optional): The maximum time the first text of a batch waits for other texts in milliseconds. Defaults to 5.0.
+
+        Raises:
+            ValueError: Is thrown if max_batch_size is not positive or max_wait_ms is negative.
+        """
+        Helper.ensure_instance(embedding_service, EmbeddingService, "embedding_service must be an instance of EmbeddingService!")
+        Helper.ensure_type(max_batch_size, int, "max_batch_size must be an int!")
+
+        if type(max_wait_ms) not in [int, float]:
+            raise TypeError("max_wait_ms must be a number!")
+        if max_batch_size <= 0:
+            raise ValueError("max_batch_size cannot be less or equal to 0!")
+        if max_wait_ms < 0:
+            raise ValueError("max_wait_ms cannot be negative!")
+
+        self.embedding_service = embedding_service
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.batch_count = 0
+        self.text_count = 0
+        self.__pending = []
+        self.__timer = None
+        self.__tasks = set()
+
+    async def create_embedding_async(self, text: str) -> list[float]:
+        """Creates an embedding for the given text as part of the next batch.
+
+        Args:
+            text (str): The text to embed.
+
+        Returns:
+            list[float]: The resulting embedding vector.
+        """
+        Helper.ensure_type(text, str, "text must be a str!")
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.__pending.append((text, future))
+
+        if len(self.__pending) >= self.max_batch_size:
+            self.__flush()
+        elif self.__timer is None:
+            self.__timer = loop.call_later(self.max_wait_ms / 1000, self.__flush)
+
+        return await future
+
+    def get_statistics(self) -> dict:
+        """Gets the counters of the coalescer.
+
+        Returns:
+            dict: Dictionary format: {"batches": <batch-count>, "texts": <text-count>, "averageBatchSize": <average>}.
+        """
+        average = self.text_count / self.batch_count if self.batch_count > 0 else 0
+        return {"batches": self.batch_count, "texts": self.text_count, "averageBatchSize": average}
+
+    def __flush(self):
+        """Starts embedding the pending texts as one batch.
+        """
+        if self.__timer is not None:
+            self.__timer.cancel()
+            self.__timer = None
+
+        if len(self.__pending) == 0:
+            return
+
+        batch = self.__pending
+        self.__pending = []
+        task = asyncio.ensure_future(self.__embed_batch(batch))
+        self.__tasks.add(task)
+        task.add_done_callback(self.__tasks.discard)
+
+    async def __embed_batch(self, batch: list[tuple]):
+        """Embeds a batch in the inference pool and resolves the futures of the waiting coroutines.
+
+        Args:
+            batch (list[tuple]): The batch as (text, future) tuples.
+        """
+        self.batch_count += 1
+        self.text_count += len(batch)
+
+        try:
+            text_embeddings = await ExecutorManager.run_inference(self.embedding_service.create_embeddings, [el[0] for el in batch])
+
+            for (text, future), text_embedding in zip(batch, text_embeddings):
+                if not future.done():
+                    future.set_result(text_embedding)
+        except Exception as e:
+            for text, future in batch:
+                if not future.done():
+                    future.set_exception(e)
@@ -18,3 +18,15 @@ class EmbeddingService(ABC):
             list[float]: The resulting embedding vector.
         """
         pass
+
+    def create_embeddings(self, texts: list[str]) -> list[list[float]]:
+        """Creates embeddings for multiple texts.
+        Embeds the texts one by one unless overridden by a service that supports batched inference.
+
+        Args:
+            texts (list[str]): The texts to embed.
+
+        Returns:
+            list[list[float]]: The resulting embedding vectors (in the order of the texts).
+        """
+        return [self.create_embedding(el) for el in texts]
@@ -0,0 +1,47 @@
+from models.helper import Helper
+from services.embeddingservice import EmbeddingService
+from services.lrucache import LRUCache
+from services.resourceregistry import ResourceRegistry
+
+
+class EmbeddingServiceFactory:
+    """Represents a factory that creates the embedding service selected by the configuration.
+    Supported backends:
+        torch: the sentence transformer running on PyTorch (default).
+        onnx: the exported ONNX graph of the transformer running on ONNX Runtime (int8-quantized unless disabled).
+    The models are taken from the ResourceRegistry, so that every backend is loaded once per process.
+    The modules of a backend are only imported when it is created.
+    """
+    BACKENDS = ["torch", "onnx"]
+
+    @staticmethod
+    def create(backend: str, model_name: str, cache: LRUCache = None, quantized: bool = True) -> EmbeddingService:
+        """Creates the embedding service for the given backend.
+        Falls back to torch if the backend is empty.
+
+        Args:
+            backend (str): The name of the backend (see BACKENDS).
+            model_name (str): The name of the model.
+            cache (LRUCache, optional): The cache of the embeddings. Defaults to None (no caching).
+            quantized (bool, optional): Boolean indicating whether the onnx backend uses the int8-quantized graph. Defaults to True.
+
+        Raises:
+            ValueError: Is thrown if the backend is not supported.
+
+        Returns:
+            EmbeddingService: The embedding service.
+        """
+        Helper.ensure_type(backend, str, "backend must be a str!")
+        Helper.ensure_type(model_name, str, "model_name must be a str!")
+        backend = backend.strip().lower()
+
+        if backend == "" or backend == "torch":
+            from services.transfomerembeddingservice import TransformerEmbeddingService
+            return TransformerEmbeddingService(ResourceRegistry.get_model(model_name), model_name, cache)
+
+        if backend not in EmbeddingServiceFactory.BACKENDS:
+            raise ValueError("Unsupported embedding backend: " + backend + "!")
+
+        from services.onnxembeddingservice import ONNXEmbeddingService
+        return ONNXEmbeddingService(ResourceRegistry.get_onnx_session(model_name, quantized), ResourceRegistry.get_tokenizer(model_name),
+                                    model_name + ("#onnx-int8" if quantized else "#onnx"), cache)
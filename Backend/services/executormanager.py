@@ -0,0 +1,150 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from models.helper import Helper
+
+
+class ExecutorManager:
+    """Represents the owner of the bounded worker pools used to keep blocking work off the event loop.
+    Two thread pools are kept:
+        io: blocking I/O (e.g. synchronous driver calls, file access).
+        inference: model inference and other CPU-bound work (vector and lexical index search).
+    Thread pools are used for inference as well, because PyTorch and NumPy release the GIL while computing
+    and a process pool would have to load the model once per process.
+    Every pool counts queued, active and completed tasks. If a maximum queue size is configured,
+    tasks submitted to a full queue are rejected with a RuntimeError instead of piling up.
+    """
+    __pools = None
+    __statistics = {}
+    __max_queue_size = 0
+    __lock = threading.Lock()
+
+    @staticmethod
+    def configure(io_workers: int, inference_workers: int, max_queue_size: int = 0):
+        """Creates the worker pools (existing pools are shut down).
+
+        Args:
+            io_workers (int): The amount of threads of the I/O pool.
+            inference_workers (int): The amount of threads of the inference pool.
+            max_queue_size (int, optional): The maximum amount of queued tasks per pool (0 means unbounded). Defaults to 0.
+
+        Raises:
+            ValueError: Is thrown if a worker count is not positive or max_queue_size is negative.
+        """
+        Helper.ensure_type(io_workers, int, "io_workers must be an int!")
+        Helper.ensure_type(inference_workers, int, "inference_workers must be an int!")
+        Helper.ensure_type(max_queue_size, int, "max_queue_size must be an int!")
+
+        if io_workers <= 0 or inference_workers <= 0:
+            raise ValueError("The amount of workers cannot be less or equal to 0!")
+        if max_queue_size < 0:
+            raise ValueError("max_queue_size cannot be negative!")
+
+        ExecutorManager.shutdown()
+        ExecutorManager.__pools = {"io": ThreadPoolExecutor(io_workers, thread_name_prefix="io"),
+                                   "inference": ThreadPoolExecutor(inference_workers, thread_name_prefix="inference")}
+        ExecutorManager.__statistics = {"io": {"workers": io_workers, "queued": 0, "active": 0, "completed": 0, "rejected": 0},
+                                        "inference": {"workers": inference_workers, "queued": 0, "active": 0, "completed": 0, "rejected": 0}}
+        ExecutorManager.__max_queue_size = max_queue_size
+
+    @staticmethod
+    def configure_from_env():
+        """Creates the worker pools using the environment variables EXECUTOR_IO_WORKERS (default: CPU count + 4, at most 32),
+        EXECUTOR_INFERENCE_WORKERS (default: CPU count) and EXECUTOR_MAX_QUEUE_SIZE (default: 0).
+        """
+        cpu_count = os.cpu_count() or 1
+        ExecutorManager.configure(int(os.getenv("EXECUTOR_IO_WORKERS", str(min(32, cpu_count + 4)))),
+                                  int(os.getenv("EXECUTOR_INFERENCE_WORKERS", str(cpu_count))),
+                                  int(os.getenv("EXECUTOR_MAX_QUEUE_SIZE", "0")))
+
+    @staticmethod
+    async def run_io(func, *args, **kwargs):
+        """Runs a blocking I/O function in the I/O pool.
+
+        Args:
+            func (_type_): The function.
+
+        Returns:
+            _type_: The result of the function.
+        """
+        return await ExecutorManager.__run("io", func, *args, **kwargs)
+
+    @staticmethod
+    async def run_inference(func, *args, **kwargs):
+        """Runs a CPU-bound function (e.g. model inference) in the inference pool.
+
+        Args:
+            func (_type_): The function.
+
+        Returns:
+            _type_: The result of the function.
+        """
+        return await ExecutorManager.__run("inference", func, *args, **kwargs)
+
+    @staticmethod
+    def get_statistics() -> dict:
+        """Gets the sizes and the queue-depth counters of the pools.
+
+        Returns:
+            dict: Dictionary format: {<pool>: {"workers": <workers>, "queued": <queued>, "active": <active>, "completed": <completed>, "rejected": <rejected>}}.
+        """
+        with ExecutorManager.__lock:
+            return {pool: dict(statistics) for pool, statistics in ExecutorManager.__statistics.items()}
+
+    @staticmethod
+    def shutdown():
+        """Shuts the pools down (waits for running tasks).
+        """
+        if ExecutorManager.__pools is None:
+            return
+
+        for pool in ExecutorManager.__pools.values():
+            pool.shutdown(wait=True)
+
+        ExecutorManager.__pools = None
+
+    @staticmethod
+    async def __run(pool_name: str, func, *args, **kwargs):
+        """Runs the function in the given pool and keeps the counters of the pool up to date.
+
+        Args:
+            pool_name (str): The name of the pool.
+            func (_type_): The function.
+
+        Raises:
+            RuntimeError: Is thrown if the queue of the pool is full.
+
+        Returns:
+            _type_: The result of the function.
+        """
+        if ExecutorManager.__pools is None:
+            ExecutorManager.configure_from_env()
+
+        statistics = ExecutorManager.__statistics[pool_name]
+
+        with ExecutorManager.__lock:
+            if ExecutorManager.__max_queue_size > 0 and statistics["queued"] >= ExecutorManager.__max_queue_size:
+                statistics["rejected"] += 1
+                raise RuntimeError("The " + pool_name + " queue is full!")
+            statistics["queued"] += 1
+
+        def run():
+            with ExecutorManager.__lock:
+                statistics["queued"] -= 1
+                statistics["active"] += 1
+            try:
+                return func(*args, **kwargs)
+            finally:
+                with ExecutorManager.__lock:
+                    statistics["active"] -= 1
+                    statistics["completed"] += 1
+
+        def on_done(future):
+            if future.cancelled():
+                with ExecutorManager.__lock:
+                    statistics["queued"] -= 1
+
+        future = ExecutorManager.__pools[pool_name].submit(run)
+        future.add_done_callback(on_done)
+        return await asyncio.wrap_future(future)
@@ -0,0 +1,176 @@
+import json
+import os
+import numpy as np
+from models.helper import Helper
+from services.chunkvectorstore import ChunkVectorStore
+from services.vectorsearchservice import VectorSearchService
+
+
+class HNSWVectorSearchService(VectorSearchService):
+    """Represents a vector search service that answers k nearest neighbour queries in-process
+    using a Hierarchical Navigable Small World (HNSW) graph over the chunk embeddings (hnswlib).
+    The graph is built offline (build_indexes.py) and stored next to the chunk vector store,
+    which resolves the returned rows to their paper IDs and chunk texts.
+    Unlike the memory-mapped chunk vector store, the graph is read into memory by hnswlib when it is loaded
+    (about (dimensions * 4 + m * 8) bytes per chunk), so every backend process holds its own copy.
+
+    Layout of the graph files:
+        hnsw_index.bin: the hnswlib index (inner product space over the normalized vectors, labels are the rows of the store).
+        hnsw_meta.json: the amount of nodes, the dimensions and the build parameters.
+
+    Args:
+        VectorSearchService (_type_): The abstract vector search service.
+    """
+    INDEX_FILE = "hnsw_index.bin"
+    META_FILE = "hnsw_meta.json"
+
+    def __init__(self, directory: str, ef_search: int = 64, threads: int = 1):
+        """Initializes a new instance of HNSWVectorSearchService by loading a built index.
+
+        Args:
+            directory (str): The directory containing the chunk vector store and the graph.
+            ef_search (int, optional): The size of the dynamic candidate list during the search
+            (higher means better recall and slower queries). Defaults to 64.
+            threads (int, optional): The amount of threads per batch of queries
+            (single queries already run concurrently in the inference pool). Defaults to 1.
+
+        Raises:
+            FileNotFoundError: Is thrown if the directory does not contain a built index
+            or if the graph was built for another store (the amount of nodes or the dimensions differ).
+            ValueError: Is thrown if ef_search or threads is not positive.
+        """
+        import hnswlib
+        Helper.ensure_type(directory, str, "directory must be a str!")
+        Helper.ensure_type(ef_search, int, "ef_search must be an int!")
+        Helper.ensure_type(threads, int, "threads must be an int!")
+
+        if ef_search <= 0:
+            raise ValueError("ef_search must be positive!")
+        if threads <= 0:
+            raise ValueError("threads must be positive!")
+        if not HNSWVectorSearchService.exists(directory):
+            raise FileNotFoundError("No HNSW index found in " + directory + "! Run python build_indexes.py --engine hnsw.")
+
+        self.store = ChunkVectorStore(directory)
+
+        with open(os.path.join(directory, HNSWVectorSearchService.META_FILE)) as meta_file:
+            meta = json.load(meta_file)
+
+        if meta.get("nodes") != len(self.store) or meta.get("dimensions") != self.store.get_dimensions():
+            raise FileNotFoundError("The HNSW index in " + directory + " does not match its chunk vector store! "
+                                    "Run python build_indexes.py --engine hnsw.")
+
+        self.ef_search = ef_search
+        self.__index = hnswlib.Index(space="ip", dim=self.store.get_dimensions())
+        self.__index.load_index(os.path.join(directory, HNSWVectorSearchService.INDEX_FILE), max_elements=len(self.store))
+        self.__index.set_ef(ef_search)
+        self.__index.set_num_threads(threads)
+
+    def search(self, query_vector: list[float], amount: int) -> list[dict]:
+        """Searches for the chunks that are the most similar to the query vector by traversing the graph.
+
+        Args:
+            query_vector (list[float]): The embedded query.
+            amount (int): The amount of chunks to return.
+
+        Returns:
+            list[dict]: The matching chunks ordered by cosine similarity.
+            Dictionary format: {"paperId": <paper-id>, "chunk": <chunk-text>, "score": <cosine-similarity>}.
+        """
+        Helper.ensure_type(query_vector, list, "query_vector must be a list!")
+
+        return self.search_batch([query_vector], amount)[0]
+
+    def search_batch(self, query_vectors: list[list[float]], amount: int) -> list[list[dict]]:
+        """Searches for the most similar chunks of multiple query vectors with one call into the graph.
+
+        Args:
+            query_vectors (list[list[float]]): The embedded queries.
+            amount (int): The amount of chunks to return per query.
+
+        Returns:
+            list[list[dict]]: The matching chunks of every query ordered by cosine similarity.
+        """
+        Helper.ensure_list_of_type(query_vectors, list, "query_vectors must be a list!", "query_vectors must contain elements of type list!")
+        Helper.ensure_type(amount, int, "amount must be an int!")
+
+        if len(query_vectors) == 0:
+            return []
+
+        amount = min(amount, len(self.store))
+
+        if amount <= 0:
+            return [[] for el in query_vectors]
+
+        # hnswlib searches with max(ef_search, amount) candidates, so amount results are returned even if amount > ef_search
+        labels, distances = self.__index.knn_query(ChunkVectorStore.normalize(query_vectors), k=amount)
+        result = []
+
+        for row_labels, row_distances in zip(labels.tolist(), distances.tolist()):
+            row_result = []
+
+            for index, distance in zip(row_labels, row_distances):
+                chunk = self.store.get_chunk(index)
+                chunk["score"] = 1.0 - distance
+                row_result.append(chunk)
+
+            result.append(row_result)
+
+        return result
+
+    @staticmethod
+    def exists(directory: str) -> bool:
+        """Checks whether the directory contains a built index.
+
+        Args:
+            directory (str): The directory of the index.
+
+        Returns:
+            bool: Boolean indicating whether the index exists.
+        """
+        Helper.ensure_type(directory, str, "directory must be a str!")
+        files = [HNSWVectorSearchService.INDEX_FILE, HNSWVectorSearchService.META_FILE]
+        return ChunkVectorStore.exists(directory) and all([os.path.isfile(os.path.join(directory, el)) for el in files])
+
+    @staticmethod
+    def build(chunks: list[dict], directory: str, m: int = 16, ef_construction: int = 200, seed: int = 42, threads: int = -1):
+        """Builds the HNSW graph over the chunk vectors and persists it together with the chunk vector store.
+        The store and the graph are written into a fresh temporary directory that replaces the whole directory afterwards,
+        so that a graph and a store of different builds are never combined.
+
+        Args:
+            chunks (list[dict]): The chunks fetched from a chunk collection.
+            Dictionary format: {"paperId": <paper-id>, "chunk": <chunk-text>, "chunkVector": <embedding-vector>}.
+            directory (str): The directory of the index.
+            m (int, optional): The maximum amount of neighbours per node on the upper levels (2 * m on level 0). Defaults to 16.
+            ef_construction (int, optional): The size of the dynamic candidate list during the construction. Defaults to 200.
+            seed (int, optional): The seed of the random level generator. Defaults to 42.
+            threads (int, optional): The amount of threads inserting the vectors. Defaults to -1 (all CPU cores).
+
+        Raises:
+            ValueError: Is thrown if m is less than 2 or ef_construction is not positive.
+        """
+        import hnswlib
+        Helper.ensure_type(m, int, "m must be an int!")
+        Helper.ensure_type(ef_construction, int, "ef_construction must be an int!")
+        Helper.ensure_type(seed, int, "seed must be an int!")
+        Helper.ensure_type(threads, int, "threads must be an int!")
+
+        if m < 2:
+            raise ValueError("m cannot be less than 2!")
+        if ef_construction <= 0:
+            raise ValueError("ef_construction cannot be less or equal to 0!")
+
+        Helper.ensure_type(directory, str, "directory must be a str!")
+        temp_directory = ChunkVectorStore.create_temp_directory(directory)
+        ChunkVectorStore.write(chunks, temp_directory)
+        vectors = np.array(ChunkVectorStore(temp_directory).vectors)
+        index = hnswlib.Index(space="ip", dim=vectors.shape[1])
+        index.init_index(max_elements=vectors.shape[0], M=m, ef_construction=ef_construction, random_seed=seed)
+        index.add_items(vectors, np.arange(vectors.shape[0]), num_threads=threads)
+        index.save_index(os.path.join(temp_directory, HNSWVectorSearchService.INDEX_FILE))
+
+        with open(os.path.join(temp_directory, HNSWVectorSearchService.META_FILE), "w") as meta_file:
+            json.dump({"nodes": int(vectors.shape[0]), "dimensions": int(vectors.shape[1]), "m": m, "efConstruction": ef_construction}, meta_file)
+
+        ChunkVectorStore.replace_directory(temp_directory, directory)
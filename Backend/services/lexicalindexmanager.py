@@ -0,0 +1,161 @@
+import asyncio
+import json
+import os
+import time
+from models.helper import Helper
+from services.corpusversionservice import CorpusVersionService
+from services.executormanager import ExecutorManager
+from services.papersservice import PapersService
+
+
+class LexicalIndexManager:
+    """Represents the owner of a lexical index (e.g. BM25IndexService or TrigramIndexService) over a text field of the papers.
+    The index is stored as a JSON file next to a version file ("<file>.version") that records the version stamp of the corpus
+    the index was built from. Nothing is read or built while the application is imported:
+        open loads the stored index on startup (or builds it if there is none).
+        get_index polls the version stamp at most once per polling interval and rebuilds the index in the background
+        as soon as the ETL pipelines have bumped the stamp. Requests are served by the previous index until the new one is swapped in.
+    build rebuilds the index synchronously (used by build_indexes.py).
+    """
+    def __init__(self, create_index, papers_service: PapersService, field: str, path: str,
+                 corpus_version_service: CorpusVersionService, poll_seconds: float = 5.0, on_rebuilt=None):
+        """Initializes a new instance of LexicalIndexManager.
+
+        Args:
+            create_index (_type_): Function () -> a new, empty index (with the methods build, save and load).
+            papers_service (PapersService): The service that communicates with the papers collection.
+            field (str): The text field of the papers to index (e.g. "abstract").
+            path (str): The path of the index file.
+            corpus_version_service (CorpusVersionService): The service used to fetch the version stamp of the corpus.
+            poll_seconds (float, optional): The interval between two fetches of the version stamp in seconds. Defaults to 5.0.
+            on_rebuilt (_type_, optional): Function () that is called after a rebuilt index was swapped in
+            (e.g. to clear the responses computed from the previous index). Defaults to None.
+        """
+        Helper.ensure_instance(papers_service, PapersService, "papers_service must be of type PapersService!")
+        Helper.ensure_type(field, str, "field must be a str!")
+        Helper.ensure_type(path, str, "path must be a str!")
+        Helper.ensure_instance(corpus_version_service, CorpusVersionService, "corpus_version_service must be of type CorpusVersionService!")
+        self.create_index = create_index
+        self.papers_service = papers_service
+        self.field = field
+        self.path = path
+        self.corpus_version_service = corpus_version_service
+        self.poll_seconds = poll_seconds
+        self.on_rebuilt = on_rebuilt
+        self.rebuilds = 0
+        self.last_error = None
+        self.__index = None
+        self.__version = None
+        self.__version_fetched_at = 0
+        self.__rebuild_task = None
+
+    async def open(self):
+        """Loads the stored index without blocking the event loop (builds and stores it if there is no stored index).
+        """
+        if os.path.isfile(self.path):
+            self.__index, self.__version = await ExecutorManager.run_io(self.__load)
+        else:
+            await self.__rebuild(await self.corpus_version_service.get_version_async())
+
+        self.__version_fetched_at = time.monotonic()
+
+    async def get_index(self):
+        """Gets the current index (opened on first use).
+        Starts a rebuild in the background if the version stamp of the corpus differs from the one of the index.
+
+        Returns:
+            _type_: The index.
+        """
+        if self.__index is None:
+            await self.open()
+
+        now = time.monotonic()
+
+        if now - self.__version_fetched_at >= self.poll_seconds and (self.__rebuild_task is None or self.__rebuild_task.done()):
+            self.__version_fetched_at = now
+            version = await self.corpus_version_service.get_version_async()
+
+            if version != self.__version:
+                self.__rebuild_task = asyncio.create_task(self.__rebuild_in_background(version))
+
+        return self.__index
+
+    def build(self):
+        """Rebuilds the index from the papers collection and stores it (blocking).
+        """
+        version = self.corpus_version_service.get_version()
+        index = self.create_index()
+        index.build(self.papers_service.get_papers({}), self.field)
+        self.__save(index, version)
+        self.__index = index
+        self.__version = version
+
+    def get_statistics(self) -> dict:
+        """Gets the version stamp of the corpus the index was built from and the rebuild counters.
+
+        Returns:
+            dict: Dictionary format: {"corpusVersion": <version>, "rebuilds": <rebuilds>, "rebuilding": <bool>, "lastError": <message>}.
+        """
+        return {"corpusVersion": self.__version, "rebuilds": self.rebuilds,
+                "rebuilding": self.__rebuild_task is not None and not self.__rebuild_task.done(), "lastError": self.last_error}
+
+    async def __rebuild(self, version: int):
+        """Rebuilds the index from the papers collection, stores it and swaps it in.
+        The version stamp is fetched before the papers, so that papers written during the rebuild trigger another one.
+
+        Args:
+            version (int): The version stamp of the corpus.
+        """
+        papers = await self.papers_service.get_papers_async({}, {"_id": 0, "id": 1, self.field: 1})
+        index = self.create_index()
+        await ExecutorManager.run_inference(index.build, papers, self.field)
+        await ExecutorManager.run_io(self.__save, index, version)
+        self.__index = index
+        self.__version = version
+        self.rebuilds += 1
+
+        if self.on_rebuilt is not None:
+            self.on_rebuilt()
+
+    async def __rebuild_in_background(self, version: int):
+        """Rebuilds the index and records the error if the rebuild fails (the previous index is kept and the rebuild is retried on the next poll).
+
+        Args:
+            version (int): The version stamp of the corpus.
+        """
+        try:
+            await self.__rebuild(version)
+            self.last_error = None
+        except Exception as e:
+            self.last_error = str(e)
+
+    def __load(self) -> tuple:
+        """Loads the stored index and the version stamp it was built from.
+
+        Returns:
+            tuple: (index, version stamp or None if the version file is missing).
+        """
+        index = self.create_index()
+        index.load(self.path)
+        version_path = self.path + ".version"
+
+        if not os.path.isfile(version_path):
+            return index, None
+
+        with open(version_path) as version_file:
+            return index, json.load(version_file)["corpusVersion"]
+
+    def __save(self, index, version: int):
+        """Stores the index and then the version stamp it was built from.
+
+        Args:
+            index (_type_): The index.
+            version (int): The version stamp of the corpus.
+        """
+        index.save(self.path)
+        temp_path = self.path + ".version.tmp-" + str(os.getpid())
+
+        with open(temp_path, "w") as version_file:
+            json.dump({"corpusVersion": version}, version_file)
+
+        os.replace(temp_path, self.path + ".version")
@@ -0,0 +1,105 @@
+import threading
+import time
+from collections import OrderedDict
+from models.helper import Helper
+
+
+class LRUCache:
+    """Represents a thread-safe, bounded cache with least-recently-used and time-to-live eviction.
+    Counts hits, misses and evictions (entries removed because the cache was full or the entry expired).
+    """
+    def __init__(self, max_size: int, ttl_seconds: float):
+        """Initializes a new instance of LRUCache.
+
+        Args:
+            max_size (int): The maximum amount of entries (0 disables the cache).
+            ttl_seconds (float): The time to live of an entry in seconds (0 means entries never expire).
+
+        Raises:
+            ValueError: Is thrown if max_size or ttl_seconds is negative.
+        """
+        Helper.ensure_type(max_size, int, "max_size must be an int!")
+
+        if type(ttl_seconds) not in [int, float]:
+            raise TypeError("ttl_seconds must be a number!")
+        if max_size < 0:
+            raise ValueError("max_size cannot be negative!")
+        if ttl_seconds < 0:
+            raise ValueError("ttl_seconds cannot be negative!")
+
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def get(self, key) -> tuple:
+        """Gets the value stored under the key and marks it as recently used.
+
+        Args:
+            key (_type_): The key (must be hashable).
+
+        Returns:
+            tuple: (True, value) if the key is cached, (False, None) otherwise.
+        """
+        with self.__lock:
+            if key not in self.__entries:
+                self.misses += 1
+                return False, None
+
+            value, expires_at = self.__entries[key]
+
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self.__entries[key]
+                self.evictions += 1
+                self.misses += 1
+                return False, None
+
+            self.__entries.move_to_end(key)
+            self.hits += 1
+            return True, value
+
+    def put(self, key, value):
+        """Stores the value under the key and evicts the least recently used entries if the cache is full.
+
+        Args:
+            key (_type_): The key (must be hashable).
+            value (_type_): The value.
+        """
+        if self.max_size == 0:
+            return
+
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds > 0 else None
+
+        with self.__lock:
+            self.__entries[key] = (value, expires_at)
+            self.__entries.move_to_end(key)
+
+            while len(self.__entries) > self.max_size:
+                self.__entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Removes all entries (the counters are kept).
+        """
+        with self.__lock:
+            self.__entries.clear()
+
+    def __len__(self) -> int:
+        """Gets the amount of cached entries.
+
+        Returns:
+            int: The amount of entries.
+        """
+        return len(self.__entries)
+
+    def get_statistics(self) -> dict:
+        """Gets the counters of the cache.
+
+        Returns:
+            dict: Dictionary format: {"size": <entries>, "maxSize": <max-size>, "hits": <hits>, "misses": <misses>, "evictions": <evictions>}.
+        """
+        with self.__lock:
+            return {"size": len(self.__entries), "maxSize": self.max_size, "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
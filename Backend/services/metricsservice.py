@@ -0,0 +1,212 @@
+import bisect
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from models.helper import Helper
+
+
+class MetricsService:
+    """Represents the owner of the latency histograms and request counters of the application.
+    The stages of a request (e.g. preprocess, encode, vector_search, hydrate, convert) are timed with measure.
+    Their durations are collected per request (context variable) and recorded once when the request ends,
+    so that the hot path only reads the clock and no lock is taken while the request is served.
+    Stages that run while a streamed response body is sent (after the request was recorded) are collected with collect
+    and recorded with record_stages.
+    The metrics are exported in the Prometheus text format (see export).
+    """
+    BUCKETS = [0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+    __HELP = {
+        "search_request_duration_seconds": ("histogram", "Duration of the HTTP requests."),
+        "search_stage_duration_seconds": ("histogram", "Duration of the stages of the HTTP requests."),
+        "search_requests_total": ("counter", "Amount of HTTP requests.")
+    }
+    __stages = contextvars.ContextVar("metrics_stages", default=None)
+    __histograms = {}
+    __counters = {}
+    __lock = threading.Lock()
+
+    @staticmethod
+    def begin_request() -> contextvars.Token:
+        """Starts collecting the stage durations of the current request.
+
+        Returns:
+            contextvars.Token: The token passed to end_request.
+        """
+        return MetricsService.__stages.set({})
+
+    @staticmethod
+    def end_request(token: contextvars.Token, route: str, method: str, status: int, seconds: float) -> dict:
+        """Stops collecting the stage durations of the current request and records them together with the request.
+
+        Args:
+            token (contextvars.Token): The token returned by begin_request.
+            route (str): The route template of the request (e.g. /abstract/search).
+            method (str): The HTTP method.
+            status (int): The status code of the response.
+            seconds (float): The duration of the request in seconds.
+
+        Returns:
+            dict: The stage durations in seconds.
+            Dictionary format: {<stage>: <seconds>, ...}.
+        """
+        stages = MetricsService.__stages.get() or {}
+        MetricsService.__stages.reset(token)
+
+        with MetricsService.__lock:
+            MetricsService.__increment("search_requests_total", (("route", route), ("method", method), ("status", str(status))))
+            MetricsService.__observe("search_request_duration_seconds", (("route", route),), seconds)
+
+            for stage, stage_seconds in stages.items():
+                MetricsService.__observe("search_stage_duration_seconds", (("route", route), ("stage", stage)), stage_seconds)
+
+        return stages
+
+    @staticmethod
+    @contextmanager
+    def measure(stage: str):
+        """Times a stage of the current request (durations of repeated stages are added up).
+        Does nothing but reading the clock if no request is being collected.
+
+        Args:
+            stage (str): The name of the stage.
+        """
+        stages = MetricsService.__stages.get()
+        start = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            if stages is not None:
+                stages[stage] = stages.get(stage, 0.0) + time.perf_counter() - start
+
+    @staticmethod
+    @contextmanager
+    def collect(stages: dict):
+        """Collects the durations of the stages measured inside the block into the given dictionary
+        (e.g. while the body of a streamed response is produced, after the request was recorded).
+
+        Args:
+            stages (dict): The stage durations in seconds (durations of repeated stages are added up).
+        """
+        Helper.ensure_type(stages, dict, "stages must be a dict!")
+        token = MetricsService.__stages.set(stages)
+
+        try:
+            yield
+        finally:
+            MetricsService.__stages.reset(token)
+
+    @staticmethod
+    def record_stages(route: str, stages: dict):
+        """Records stage durations of a request whose duration was already recorded (see collect).
+
+        Args:
+            route (str): The route template of the request (e.g. /abstract/session/{session_id}).
+            stages (dict): The stage durations in seconds.
+        """
+        Helper.ensure_type(route, str, "route must be a str!")
+        Helper.ensure_type(stages, dict, "stages must be a dict!")
+
+        with MetricsService.__lock:
+            for stage, stage_seconds in stages.items():
+                MetricsService.__observe("search_stage_duration_seconds", (("route", route), ("stage", stage)), stage_seconds)
+
+    @staticmethod
+    def get_server_timing(stages: dict, seconds: float) -> str:
+        """Creates the value of the Server-Timing header.
+
+        Args:
+            stages (dict): The stage durations in seconds.
+            seconds (float): The duration of the request in seconds.
+
+        Returns:
+            str: The header value (e.g. "preprocess;dur=0.21, encode;dur=8.03, total;dur=12.47", durations in milliseconds).
+        """
+        Helper.ensure_type(stages, dict, "stages must be a dict!")
+        timings = [stage + ";dur=" + format(stage_seconds * 1000, ".2f") for stage, stage_seconds in stages.items()]
+        return ", ".join(timings + ["total;dur=" + format(seconds * 1000, ".2f")])
+
+    @staticmethod
+    def export() -> str:
+        """Exports the metrics in the Prometheus text format.
+
+        Returns:
+            str: The metrics.
+        """
+        lines = []
+
+        with MetricsService.__lock:
+            histograms = {key: (list(value[0]), value[1], value[2]) for key, value in MetricsService.__histograms.items()}
+            counters = dict(MetricsService.__counters)
+
+        for name, (metric_type, description) in MetricsService.__HELP.items():
+            lines.append("# HELP " + name + " " + description)
+            lines.append("# TYPE " + name + " " + metric_type)
+
+            for (metric_name, labels), value in sorted(counters.items()):
+                if metric_name == name:
+                    lines.append(name + MetricsService.__format_labels(labels) + " " + str(value))
+
+            for (metric_name, labels), (buckets, total, count) in sorted(histograms.items()):
+                if metric_name != name:
+                    continue
+
+                cumulative = 0
+
+                for bound, bucket_count in zip(MetricsService.BUCKETS, buckets):
+                    cumulative += bucket_count
+                    lines.append(name + "_bucket" + MetricsService.__format_labels(labels + (("le", str(bound)),)) + " " + str(cumulative))
+
+                lines.append(name + "_bucket" + MetricsService.__format_labels(labels + (("le", "+Inf"),)) + " " + str(count))
+                lines.append(name + "_sum" + MetricsService.__format_labels(labels) + " " + repr(total))
+                lines.append(name + "_count" + MetricsService.__format_labels(labels) + " " + str(count))
+
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def __observe(name: str, labels: tuple, seconds: float):
+        """Records a duration in a histogram (the lock has to be held).
+
+        Args:
+            name (str): The name of the histogram.
+            labels (tuple): The labels as (name, value) tuples.
+            seconds (float): The duration in seconds.
+        """
+        key = (name, labels)
+
+        if key not in MetricsService.__histograms:
+            MetricsService.__histograms[key] = [[0] * len(MetricsService.BUCKETS), 0.0, 0]
+
+        histogram = MetricsService.__histograms[key]
+        index = bisect.bisect_left(MetricsService.BUCKETS, seconds)
+
+        if index < len(MetricsService.BUCKETS):
+            histogram[0][index] += 1
+
+        histogram[1] += seconds
+        histogram[2] += 1
+
+    @staticmethod
+    def __increment(name: str, labels: tuple):
+        """Increments a counter (the lock has to be held).
+
+        Args:
+            name (str): The name of the counter.
+            labels (tuple): The labels as (name, value) tuples.
+        """
+        key = (name, labels)
+        MetricsService.__counters[key] = MetricsService.__counters.get(key, 0) + 1
+
+    @staticmethod
+    def __format_labels(labels: tuple) -> str:
+        """Formats labels in the Prometheus text format.
+
+        Args:
+            labels (tuple): The labels as (name, value) tuples.
+
+        Returns:
+            str: The labels (e.g. {route="/abstract/search",stage="encode"}).
+        """
+        escaped = [name + "=\"" + value.replace("\\", "\\\\").replace("\"", "\\\"") + "\"" for name, value in labels]
+        return "{" + ",".join(escaped) + "}"
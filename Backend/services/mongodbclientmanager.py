@@ -0,0 +1,120 @@
+import os
+import pymongo
+from models.helper import Helper
+
+
+class MongoDBClientManager:
+    """Represents the owner of the long-lived MongoDB clients of the application.
+    Every cluster URL gets one synchronous (pymongo.MongoClient) and one asynchronous (pymongo.AsyncMongoClient) client,
+    each holding its own connection pool that is shared by all services. The clients are created lazily
+    (or eagerly by open()) and closed by close() when the application shuts down.
+    Unless configure() is called before, the options are read from the environment on first use.
+    """
+    __options = None
+    __clients = {}
+    __async_clients = {}
+
+    @staticmethod
+    def configure(max_pool_size: int = 100, min_pool_size: int = 0, connect_timeout_ms: int = 20000,
+                  server_selection_timeout_ms: int = 30000, socket_timeout_ms: int = 0, read_preference: str = "primary"):
+        """Configures the options of the clients created afterwards.
+
+        Args:
+            max_pool_size (int, optional): The maximum amount of connections per pool. Defaults to 100.
+            min_pool_size (int, optional): The minimum amount of connections kept open per pool. Defaults to 0.
+            connect_timeout_ms (int, optional): The timeout of establishing a connection in milliseconds. Defaults to 20000.
+            server_selection_timeout_ms (int, optional): The timeout of selecting a server in milliseconds. Defaults to 30000.
+            socket_timeout_ms (int, optional): The timeout of a socket operation in milliseconds (0 means no timeout). Defaults to 0.
+            read_preference (str, optional): The read preference (e.g. primary, primaryPreferred, secondaryPreferred, nearest). Defaults to "primary".
+        """
+        Helper.ensure_type(max_pool_size, int, "max_pool_size must be an int!")
+        Helper.ensure_type(min_pool_size, int, "min_pool_size must be an int!")
+        Helper.ensure_type(connect_timeout_ms, int, "connect_timeout_ms must be an int!")
+        Helper.ensure_type(server_selection_timeout_ms, int, "server_selection_timeout_ms must be an int!")
+        Helper.ensure_type(socket_timeout_ms, int, "socket_timeout_ms must be an int!")
+        Helper.ensure_type(read_preference, str, "read_preference must be a str!")
+
+        MongoDBClientManager.__options = {
+            "maxPoolSize": max_pool_size,
+            "minPoolSize": min_pool_size,
+            "connectTimeoutMS": connect_timeout_ms,
+            "serverSelectionTimeoutMS": server_selection_timeout_ms,
+            "socketTimeoutMS": socket_timeout_ms if socket_timeout_ms > 0 else None,
+            "readPreference": read_preference
+        }
+
+    @staticmethod
+    def configure_from_env():
+        """Configures the options of the clients using the environment variables
+        MONGODB_MAX_POOL_SIZE, MONGODB_MIN_POOL_SIZE, MONGODB_CONNECT_TIMEOUT_MS,
+        MONGODB_SERVER_SELECTION_TIMEOUT_MS, MONGODB_SOCKET_TIMEOUT_MS and MONGODB_READ_PREFERENCE.
+        """
+        MongoDBClientManager.configure(max_pool_size=int(os.getenv("MONGODB_MAX_POOL_SIZE", "100")),
+                                       min_pool_size=int(os.getenv("MONGODB_MIN_POOL_SIZE", "0")),
+                                       connect_timeout_ms=int(os.getenv("MONGODB_CONNECT_TIMEOUT_MS", "20000")),
+                                       server_selection_timeout_ms=int(os.getenv("MONGODB_SERVER_SELECTION_TIMEOUT_MS", "30000")),
+                                       socket_timeout_ms=int(os.getenv("MONGODB_SOCKET_TIMEOUT_MS", "0")),
+                                       read_preference=os.getenv("MONGODB_READ_PREFERENCE", "primary"))
+
+    @staticmethod
+    def get_client(url: str) -> pymongo.MongoClient:
+        """Gets the shared synchronous client of the cluster (creates it on first use).
+
+        Args:
+            url (str): The URL of the MongoDB cluster.
+
+        Returns:
+            MongoClient: The shared MongoDB client.
+        """
+        Helper.ensure_type(url, str, "url must be a string!")
+
+        if MongoDBClientManager.__options is None:
+            MongoDBClientManager.configure_from_env()
+
+        if url not in MongoDBClientManager.__clients:
+            MongoDBClientManager.__clients[url] = pymongo.MongoClient(url, **MongoDBClientManager.__options)
+
+        return MongoDBClientManager.__clients[url]
+
+    @staticmethod
+    def get_async_client(url: str) -> pymongo.AsyncMongoClient:
+        """Gets the shared asynchronous client of the cluster (creates it on first use).
+
+        Args:
+            url (str): The URL of the MongoDB cluster.
+
+        Returns:
+            AsyncMongoClient: The shared asynchronous MongoDB client.
+        """
+        Helper.ensure_type(url, str, "url must be a string!")
+
+        if MongoDBClientManager.__options is None:
+            MongoDBClientManager.configure_from_env()
+
+        if url not in MongoDBClientManager.__async_clients:
+            MongoDBClientManager.__async_clients[url] = pymongo.AsyncMongoClient(url, **MongoDBClientManager.__options)
+
+        return MongoDBClientManager.__async_clients[url]
+
+    @staticmethod
+    def open(url: str):
+        """Creates the clients of the cluster eagerly (used by the startup hook of the application).
+
+        Args:
+            url (str): The URL of the MongoDB cluster.
+        """
+        MongoDBClientManager.get_client(url)
+        MongoDBClientManager.get_async_client(url)
+
+    @staticmethod
+    async def close():
+        """Closes all clients and their connection pools (used by the shutdown hook of the application).
+        """
+        for client in MongoDBClientManager.__clients.values():
+            client.close()
+
+        for client in MongoDBClientManager.__async_clients.values():
+            await client.close()
+
+        MongoDBClientManager.__clients = {}
+        MongoDBClientManager.__async_clients = {}
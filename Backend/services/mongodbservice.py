@@ -1,5 +1,6 @@
 import pymongo
 from models.helper import Helper
+from services.mongodbclientmanager import MongoDBClientManager
 
 class MongoDBService:
     """Represents a service that communicates with a MongoDB cluster.
@@ -13,12 +14,21 @@ class MongoDBService:
         self.__set_url(url)
 
     def get_client(self) -> pymongo.MongoClient:
-        """Creates a MongoDB connection client.
+        """Gets the shared MongoDB connection client of the cluster (see MongoDBClientManager).
 
         Returns:
             MongoClient: A MongoDB client.
         """
-        client = pymongo.MongoClient(self.__url)
+        client = MongoDBClientManager.get_client(self.__url)
+        return client
+
+    def get_async_client(self) -> pymongo.AsyncMongoClient:
+        """Gets the shared asynchronous MongoDB connection client of the cluster (see MongoDBClientManager).
+
+        Returns:
+            AsyncMongoClient: An asynchronous MongoDB client.
+        """
+        client = MongoDBClientManager.get_async_client(self.__url)
         return client
     
     def create_search_index(self, db_name: str, collection_name: str, index_dict: dict):
@@ -179,6 +189,42 @@ class MongoDBService:
         except Exception as e:
             raise e
 
+    async def aggregate_data_async(self, db_name: str, collection_name: str, aggregation_data: list[dict]) -> list:
+        """Aggregates data using specific aggregation operations without blocking the event loop.
+
+        Args:
+            db_name (str):  The name of the MongoDB database.
+            collection_name (str): The collection name.
+            aggregation_data (list[dict]): The aggregation information as dictionaries.
+
+        Returns:
+            list: A list of aggregated results.
+        """
+        Helper.ensure_type(db_name, str, "db_name must be a string!")
+        Helper.ensure_type(collection_name, str, "collection_name must be a string!")
+        Helper.ensure_list_of_type(aggregation_data, dict, "aggregation_data must be a list!", "aggregation_data must contain elements of type dict!")
+
+        collection = self.get_async_client()[db_name][collection_name]
+        cursor = await collection.aggregate(aggregation_data)
+        return await cursor.to_list(None)
+
+    async def get_data_async(self, db_name: str, collection_name: str, query: dict, projection: dict = None) -> list:
+        """Fetches data from the MongoDB database without blocking the event loop.
+
+        Args:
+            db_name (str): The name of the MongoDB database.
+            collection_name (str): The collection name.
+            query (dict): The query specified as a dictionary.
+            projection (dict, optional): The fields to return (e.g. {"_id": 0, "title": 1}). Defaults to None (all fields).
+
+        Returns:
+            list: A list of retrieved results.
+        """
+        Helper.ensure_type(db_name, str, "db_name must be a string!")
+        Helper.ensure_type(collection_name, str, "collection_name must be a string!")
+
+        collection = self.get_async_client()[db_name][collection_name]
+        return await collection.find(query, projection).to_list(None)
     
     def __set_url(self, url: str):
         """Sets the URL of the MongoDB cluster.
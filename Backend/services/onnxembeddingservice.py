@@ -0,0 +1,154 @@
+import os
+import numpy as np
+import onnxruntime
+from models.helper import Helper
+from services.embeddingservice import EmbeddingService
+from services.lrucache import LRUCache
+
+
+class ONNXEmbeddingService(EmbeddingService):
+    """Represents an embedding service that runs the transformer of a sentence transformer model
+    as an exported ONNX graph on the CPU (ONNX Runtime), optionally with dynamically int8-quantized weights.
+    Applies the same mean pooling and L2 normalization as the sentence transformer (all-MiniLM-L6-v2),
+    so that the embeddings are interchangeable with the ones of TransformerEmbeddingService.
+    Embeddings of repeated texts are served from an optional LRU/TTL cache, so that the model is not run again.
+
+    Args:
+        EmbeddingService (_type_): The base embedding service.
+    """
+    def __init__(self, session: onnxruntime.InferenceSession, tokenizer, model_name: str = "default", cache: LRUCache = None,
+                 max_length: int = 256):
+        """Initializes a new instance of ONNXEmbeddingService.
+
+        Args:
+            session (onnxruntime.InferenceSession): The inference session of the exported transformer.
+            tokenizer (_type_): The tokenizer of the model (transformers tokenizer).
+            model_name (str, optional): The name of the model (part of the cache key). Defaults to "default".
+            cache (LRUCache, optional): The cache of the embeddings. Defaults to None (no caching).
+            max_length (int, optional): The maximum amount of tokens per text (longer texts are truncated). Defaults to 256.
+        """
+        Helper.ensure_instance(session, onnxruntime.InferenceSession, "session must be of type InferenceSession!")
+        Helper.ensure_type(model_name, str, "model_name must be a str!")
+        Helper.ensure_type(max_length, int, "max_length must be an int!")
+
+        if cache is not None:
+            Helper.ensure_instance(cache, LRUCache, "cache must be of type LRUCache!")
+        if max_length <= 0:
+            raise ValueError("max_length cannot be less or equal to 0!")
+
+        self.session = session
+        self.tokenizer = tokenizer
+        self.model_name = model_name
+        self.cache = cache
+        self.max_length = max_length
+        self.__input_names = set([el.name for el in session.get_inputs()])
+
+    def create_embedding(self, text: str) -> list[float]:
+        """Creates an embedding for the given text using the ONNX graph.
+        Cached embeddings are keyed by the model name and the whitespace-normalized text.
+
+        Args:
+            text (str): The text to embed.
+
+        Returns:
+            list[float]: The resulting embedding vector.
+        """
+        Helper.ensure_type(text, str, "text must be a str!")
+        return self.create_embeddings([text])[0]
+
+    def create_embeddings(self, texts: list[str]) -> list[list[float]]:
+        """Creates embeddings for multiple texts with one batched run of the ONNX graph.
+        Texts found in the cache are not embedded again.
+
+        Args:
+            texts (list[str]): The texts to embed.
+
+        Returns:
+            list[list[float]]: The resulting embedding vectors (in the order of the texts).
+        """
+        Helper.ensure_list_of_type(texts, str, "texts must be a list!", "texts must contain elements of type str!")
+        result = [None] * len(texts)
+        missing = {}
+
+        for i, text in enumerate(texts):
+            key = (self.model_name, " ".join(text.split()))
+            found, text_embedding = self.cache.get(key) if self.cache is not None else (False, None)
+
+            if found:
+                result[i] = list(text_embedding)
+            else:
+                missing.setdefault(key, []).append(i)
+
+        if len(missing) > 0:
+            keys = list(missing.keys())
+            text_embeddings = self.encode([texts[missing[el][0]] for el in keys])
+
+            for key, text_embedding in zip(keys, text_embeddings):
+                text_embedding = text_embedding.tolist()
+
+                if self.cache is not None:
+                    self.cache.put(key, text_embedding)
+
+                for i in missing[key]:
+                    result[i] = list(text_embedding)
+
+        return result
+
+    def encode(self, texts: list[str]) -> np.ndarray:
+        """Runs the ONNX graph on the texts and pools the token embeddings (without caching).
+
+        Args:
+            texts (list[str]): The texts to embed.
+
+        Returns:
+            np.ndarray: The normalized embeddings as a float32 matrix (one row per text).
+        """
+        encoded = self.tokenizer(texts, padding=True, truncation=True, max_length=self.max_length, return_tensors="np")
+        inputs = {name: np.asarray(values, dtype=np.int64) for name, values in encoded.items() if name in self.__input_names}
+        token_embeddings = self.session.run(None, inputs)[0]
+        mask = np.asarray(encoded["attention_mask"], dtype=np.float32)[:, :, None]
+        pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+        return (pooled / np.clip(norms, 1e-12, None)).astype(np.float32)
+
+    def get_cache_statistics(self) -> dict:
+        """Gets the hit, miss and eviction counters of the embedding cache.
+
+        Returns:
+            dict: The statistics (see LRUCache.get_statistics) or an empty dictionary if caching is disabled.
+        """
+        if self.cache is None:
+            return {}
+
+        return self.cache.get_statistics()
+
+    @staticmethod
+    def export(model, onnx_file: str, quantized_file: str = None):
+        """Exports the transformer of the sentence transformer to an ONNX graph
+        and optionally stores a copy with dynamically int8-quantized weights.
+
+        Args:
+            model (SentenceTransformer): The sentence transformer.
+            onnx_file (str): The path of the exported graph.
+            quantized_file (str, optional): The path of the quantized graph. Defaults to None (no quantization).
+        """
+        import torch
+        from sentence_transformers import SentenceTransformer
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        Helper.ensure_instance(model, SentenceTransformer, "model must be of type SentenceTransformer!")
+        Helper.ensure_type(onnx_file, str, "onnx_file must be a str!")
+
+        os.makedirs(os.path.dirname(os.path.abspath(onnx_file)), exist_ok=True)
+        transformer = model[0].auto_model
+        transformer.eval()
+        tokens = model.tokenizer(["export the model"], return_tensors="pt")
+        input_names = [el for el in ["input_ids", "attention_mask", "token_type_ids"] if el in tokens]
+        dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+        dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+
+        with torch.no_grad():
+            torch.onnx.export(transformer, tuple([tokens[el] for el in input_names]), onnx_file, input_names=input_names,
+                              output_names=["last_hidden_state"], dynamic_axes=dynamic_axes, opset_version=14)
+
+        if quantized_file is not None:
+            quantize_dynamic(onnx_file, quantized_file, weight_type=QuantType.QInt8)
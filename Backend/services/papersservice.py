@@ -9,6 +9,8 @@ class PapersService(MongoDBService):
     Args:
         MongoDBService (_type_): Service that communicates with MongoDB database. 
     """
+    RESULT_PROJECTION = {"_id": 0, "id": 1, "title": 1, "abstract": 1, "publicationDate": 1, "authors.fullName": 1}
+
     def __init__(self, url):
         """Initializes a new instance of PapersService.
 
@@ -38,6 +40,18 @@ class PapersService(MongoDBService):
         """
         return self.get_data("papersDB", "papers", query)
 
+    async def get_papers_async(self, query: dict, projection: dict = None) -> list:
+        """Fetches the papers specified by a query without blocking the event loop.
+
+        Args:
+            query (dict): The query in dictionary format.
+            projection (dict, optional): The fields to return. Defaults to None (all fields).
+
+        Returns:
+            list: A list including dictionaries of fetched data.
+        """
+        return await self.get_data_async("papersDB", "papers", query, projection)
+
     def get_papers_as_df(self) -> pd.DataFrame:
         """Retrieves all papers as a data frame.
 
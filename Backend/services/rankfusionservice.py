@@ -0,0 +1,51 @@
+from models.helper import Helper
+
+
+class RankFusionService:
+    """Represents a service that fuses multiple rankings into one using reciprocal-rank fusion (RRF).
+    Every item scores the sum of 1 / (k + rank) over the rankings it appears in (rank starts at 1),
+    so that items ranked high by several searches come first without having to compare their raw scores.
+    """
+    def __init__(self, k: int = 60):
+        """Initializes a new instance of RankFusionService.
+
+        Args:
+            k (int, optional): The smoothing constant of RRF (higher values flatten the influence of the top ranks). Defaults to 60.
+
+        Raises:
+            ValueError: Is thrown if k is negative.
+        """
+        Helper.ensure_type(k, int, "k must be an int!")
+
+        if k < 0:
+            raise ValueError("k cannot be negative!")
+
+        self.k = k
+
+    def fuse(self, rankings: list[list[str]], amount: int) -> list[tuple]:
+        """Fuses the rankings (duplicates within a ranking only count at their best rank).
+        Ties are broken by the order of the first appearance.
+
+        Args:
+            rankings (list[list[str]]): The rankings as lists of item IDs ordered from best to worst.
+            amount (int): The amount of items to return.
+
+        Returns:
+            list[tuple]: The fused ranking as (item ID, score) tuples ordered by score.
+        """
+        Helper.ensure_type(rankings, list, "rankings must be a list!")
+        Helper.ensure_type(amount, int, "amount must be an int!")
+        scores = {}
+
+        for ranking in rankings:
+            seen = set()
+            rank = 0
+
+            for item_id in ranking:
+                if item_id in seen:
+                    continue
+                seen.add(item_id)
+                rank += 1
+                scores[item_id] = scores.get(item_id, 0.0) + 1.0 / (self.k + rank)
+
+        return sorted(scores.items(), key=lambda el: el[1], reverse=True)[:amount]
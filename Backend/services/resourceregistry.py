@@ -0,0 +1,275 @@
+import os
+import threading
+import time
+import nltk
+from models.helper import Helper
+
+
+class ResourceRegistry:
+    """Represents the owner of the models and NLTK resources of the application.
+    Every model (sentence transformer, tokenizer, ONNX inference session) and resource is loaded once per process and shared by all routers.
+    They are served from a local bundle (RESOURCE_BUNDLE_PATH, default: the bundle directory of the backend project)
+    that is created by bundle_resources.py, so that no network access is needed on startup.
+    Missing resources are only downloaded (into the bundle) if RESOURCE_ALLOW_DOWNLOAD is set to true.
+    sentence_transformers is imported on first use, so that the registry can be imported without the model stack.
+    The registry also records the load times, the warm-up time and the time from the start of the process
+    to the first request that was served.
+    """
+    DEFAULT_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+    NLTK_RESOURCES = {"stopwords": "corpora/stopwords"}
+    __started_at = time.monotonic()
+    __models = {}
+    __tokenizers = {}
+    __sessions = {}
+    __stopwords = {}
+    __load_seconds = {}
+    __warm_up_seconds = None
+    __first_request_seconds = None
+    __lock = threading.Lock()
+
+    @staticmethod
+    def get_bundle_path() -> str:
+        """Gets the directory of the local resource bundle.
+
+        Returns:
+            str: The path of the bundle.
+        """
+        default_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "bundle")
+        return os.getenv("RESOURCE_BUNDLE_PATH", default_path)
+
+    @staticmethod
+    def get_model_path(model_name: str) -> str:
+        """Gets the directory of a model inside the bundle.
+
+        Args:
+            model_name (str): The name of the model (e.g. sentence-transformers/all-MiniLM-L6-v2).
+
+        Returns:
+            str: The path of the model.
+        """
+        Helper.ensure_type(model_name, str, "model_name must be a str!")
+        return os.path.join(ResourceRegistry.get_bundle_path(), "models", model_name.replace("/", "__"))
+
+    @staticmethod
+    def get_model(model_name: str = DEFAULT_MODEL):
+        """Gets the shared sentence transformer of the model (loads it from the bundle on first use).
+
+        Args:
+            model_name (str, optional): The name of the model. Defaults to DEFAULT_MODEL.
+
+        Raises:
+            FileNotFoundError: Is thrown if the model is not bundled and downloads are not allowed.
+
+        Returns:
+            SentenceTransformer: The sentence transformer.
+        """
+        from sentence_transformers import SentenceTransformer, SimilarityFunction
+        Helper.ensure_type(model_name, str, "model_name must be a str!")
+
+        with ResourceRegistry.__lock:
+            if model_name not in ResourceRegistry.__models:
+                start = time.perf_counter()
+                model_path = ResourceRegistry.get_model_path(model_name)
+
+                if not os.path.isdir(model_path):
+                    ResourceRegistry.__ensure_download_allowed(model_name)
+                    SentenceTransformer(model_name).save(model_path)
+
+                ResourceRegistry.__models[model_name] = SentenceTransformer(model_path, similarity_fn_name=SimilarityFunction.COSINE,
+                                                                            local_files_only=True)
+                ResourceRegistry.__load_seconds[model_name] = time.perf_counter() - start
+
+            return ResourceRegistry.__models[model_name]
+
+    @staticmethod
+    def get_onnx_path(model_name: str, quantized: bool) -> str:
+        """Gets the path of the exported ONNX graph of a model inside the bundle.
+
+        Args:
+            model_name (str): The name of the model.
+            quantized (bool): Boolean indicating whether the int8-quantized graph is meant.
+
+        Returns:
+            str: The path of the graph.
+        """
+        Helper.ensure_type(quantized, bool, "quantized must be a bool!")
+        return os.path.join(ResourceRegistry.get_model_path(model_name), "onnx", "model.int8.onnx" if quantized else "model.onnx")
+
+    @staticmethod
+    def get_tokenizer(model_name: str = DEFAULT_MODEL):
+        """Gets the shared tokenizer of the model (loads it from the bundle on first use).
+
+        Args:
+            model_name (str, optional): The name of the model. Defaults to DEFAULT_MODEL.
+
+        Raises:
+            FileNotFoundError: Is thrown if the model is not bundled.
+
+        Returns:
+            _type_: The tokenizer (transformers tokenizer).
+        """
+        from transformers import AutoTokenizer
+        Helper.ensure_type(model_name, str, "model_name must be a str!")
+
+        with ResourceRegistry.__lock:
+            if model_name not in ResourceRegistry.__tokenizers:
+                model_path = ResourceRegistry.get_model_path(model_name)
+
+                if not os.path.isdir(model_path):
+                    raise FileNotFoundError(model_name + " is not bundled! Run python bundle_resources.py --onnx.")
+
+                ResourceRegistry.__tokenizers[model_name] = AutoTokenizer.from_pretrained(model_path, local_files_only=True)
+
+            return ResourceRegistry.__tokenizers[model_name]
+
+    @staticmethod
+    def get_onnx_session(model_name: str = DEFAULT_MODEL, quantized: bool = True):
+        """Gets the shared ONNX Runtime inference session of the model (loads it from the bundle on first use).
+        The amount of threads per inference is read from ONNX_INTRA_OP_THREADS (default: 0, chosen by ONNX Runtime).
+
+        Args:
+            model_name (str, optional): The name of the model. Defaults to DEFAULT_MODEL.
+            quantized (bool, optional): Boolean indicating whether the int8-quantized graph is used. Defaults to True.
+
+        Raises:
+            FileNotFoundError: Is thrown if the graph is not bundled.
+
+        Returns:
+            onnxruntime.InferenceSession: The inference session.
+        """
+        import onnxruntime
+        onnx_path = ResourceRegistry.get_onnx_path(model_name, quantized)
+
+        with ResourceRegistry.__lock:
+            if onnx_path not in ResourceRegistry.__sessions:
+                if not os.path.isfile(onnx_path):
+                    raise FileNotFoundError(onnx_path + " does not exist! Run python bundle_resources.py --onnx.")
+
+                start = time.perf_counter()
+                options = onnxruntime.SessionOptions()
+                options.intra_op_num_threads = int(os.getenv("ONNX_INTRA_OP_THREADS", "0"))
+                ResourceRegistry.__sessions[onnx_path] = (model_name, onnxruntime.InferenceSession(onnx_path, options,
+                                                                                                  providers=["CPUExecutionProvider"]))
+                ResourceRegistry.__load_seconds[onnx_path] = time.perf_counter() - start
+
+            return ResourceRegistry.__sessions[onnx_path][1]
+
+    @staticmethod
+    def get_stopwords(language: str = "english") -> list[str]:
+        """Gets the NLTK stopwords of the language (loads them from the bundle on first use).
+
+        Args:
+            language (str, optional): The language. Defaults to "english".
+
+        Raises:
+            FileNotFoundError: Is thrown if the stopwords are not bundled and downloads are not allowed.
+
+        Returns:
+            list[str]: The stopwords.
+        """
+        Helper.ensure_type(language, str, "language must be a str!")
+
+        with ResourceRegistry.__lock:
+            if language not in ResourceRegistry.__stopwords:
+                start = time.perf_counter()
+                ResourceRegistry.__ensure_nltk_resource("stopwords")
+                from nltk.corpus import stopwords
+                ResourceRegistry.__stopwords[language] = list(set(stopwords.words(language)))
+                ResourceRegistry.__load_seconds["stopwords/" + language] = time.perf_counter() - start
+
+            return list(ResourceRegistry.__stopwords[language])
+
+    @staticmethod
+    def bundle(model_names: list[str] = None, onnx: bool = False):
+        """Downloads the models and the NLTK resources into the bundle (used by bundle_resources.py).
+
+        Args:
+            model_names (list[str], optional): The names of the models. Defaults to None ([DEFAULT_MODEL]).
+            onnx (bool, optional): Boolean indicating whether the models are exported to ONNX graphs (plain and int8-quantized). Defaults to False.
+        """
+        from sentence_transformers import SentenceTransformer
+        model_names = [ResourceRegistry.DEFAULT_MODEL] if model_names is None else model_names
+        Helper.ensure_list_of_type(model_names, str, "model_names must be a list!", "model_names must contain elements of type str!")
+        nltk_path = os.path.join(ResourceRegistry.get_bundle_path(), "nltk")
+
+        for model_name in model_names:
+            model_path = ResourceRegistry.get_model_path(model_name)
+
+            if not os.path.isdir(model_path):
+                SentenceTransformer(model_name).save(model_path)
+
+            if onnx:
+                from services.onnxembeddingservice import ONNXEmbeddingService
+                ONNXEmbeddingService.export(SentenceTransformer(model_path), ResourceRegistry.get_onnx_path(model_name, False),
+                                            ResourceRegistry.get_onnx_path(model_name, True))
+
+        for resource in ResourceRegistry.NLTK_RESOURCES.keys():
+            nltk.download(resource, download_dir=nltk_path, quiet=True)
+
+    @staticmethod
+    def warm_up():
+        """Loads the stopwords eagerly and runs the loaded models (sentence transformers and ONNX sessions) once,
+        so that the first request does not pay for lazy initialization.
+        """
+        start = time.perf_counter()
+        ResourceRegistry.get_stopwords()
+
+        for model in list(ResourceRegistry.__models.values()):
+            model.encode("warm up")
+
+        for model_name, session in list(ResourceRegistry.__sessions.values()):
+            tokens = ResourceRegistry.get_tokenizer(model_name)(["warm up"], return_tensors="np")
+            input_names = set([el.name for el in session.get_inputs()])
+            session.run(None, {name: values.astype("int64") for name, values in tokens.items() if name in input_names})
+
+        ResourceRegistry.__warm_up_seconds = time.perf_counter() - start
+
+    @staticmethod
+    def mark_request_served():
+        """Records the time from the start of the process to the first request that was served (later calls are ignored).
+        """
+        if ResourceRegistry.__first_request_seconds is None:
+            ResourceRegistry.__first_request_seconds = time.monotonic() - ResourceRegistry.__started_at
+
+    @staticmethod
+    def get_statistics() -> dict:
+        """Gets the load times of the resources and the startup timings.
+
+        Returns:
+            dict: Dictionary format: {"loadSeconds": {<resource>: <seconds>}, "warmUpSeconds": <seconds>, "timeToFirstRequestSeconds": <seconds>}.
+        """
+        with ResourceRegistry.__lock:
+            return {"loadSeconds": dict(ResourceRegistry.__load_seconds),
+                    "warmUpSeconds": ResourceRegistry.__warm_up_seconds,
+                    "timeToFirstRequestSeconds": ResourceRegistry.__first_request_seconds}
+
+    @staticmethod
+    def __ensure_nltk_resource(resource: str):
+        """Makes the NLTK resource available from the bundle (downloads it if it is missing and downloads are allowed).
+
+        Args:
+            resource (str): The name of the resource (see NLTK_RESOURCES).
+        """
+        nltk_path = os.path.join(ResourceRegistry.get_bundle_path(), "nltk")
+
+        if nltk_path not in nltk.data.path:
+            nltk.data.path.insert(0, nltk_path)
+
+        try:
+            nltk.data.find(ResourceRegistry.NLTK_RESOURCES[resource])
+        except LookupError:
+            ResourceRegistry.__ensure_download_allowed(resource)
+            nltk.download(resource, download_dir=nltk_path, quiet=True)
+
+    @staticmethod
+    def __ensure_download_allowed(resource: str):
+        """Checks whether a missing resource may be downloaded.
+
+        Args:
+            resource (str): The name of the resource.
+
+        Raises:
+            FileNotFoundError: Is thrown if RESOURCE_ALLOW_DOWNLOAD is not set to true.
+        """
+        if os.getenv("RESOURCE_ALLOW_DOWNLOAD", "false").lower() != "true":
+            raise FileNotFoundError(resource + " is not bundled! Run python bundle_resources.py or set RESOURCE_ALLOW_DOWNLOAD=true.")
@@ -0,0 +1,102 @@
+import time
+from pydantic import BaseModel
+from models.helper import Helper
+from services.corpusversionservice import CorpusVersionService
+from services.lrucache import LRUCache
+
+
+class ResponseCache:
+    """Represents a cache of serialized search responses.
+    A response is keyed by the endpoint, the request body and the version stamp of the corpus,
+    so that all cached responses become invalid as soon as an ETL pipeline bumps the stamp.
+    The stamp is fetched from MongoDB at most once per polling interval.
+    """
+    def __init__(self, cache: LRUCache, corpus_version_service: CorpusVersionService, poll_seconds: float = 5.0):
+        """Initializes a new instance of ResponseCache.
+
+        Args:
+            cache (LRUCache): The cache storing the serialized responses.
+            corpus_version_service (CorpusVersionService): The service used to fetch the version stamp of the corpus.
+            poll_seconds (float, optional): The interval between two fetches of the version stamp in seconds. Defaults to 5.0.
+        """
+        Helper.ensure_instance(cache, LRUCache, "cache must be of type LRUCache!")
+        Helper.ensure_instance(corpus_version_service, CorpusVersionService, "corpus_version_service must be of type CorpusVersionService!")
+        self.cache = cache
+        self.corpus_version_service = corpus_version_service
+        self.poll_seconds = poll_seconds
+        self.__version = None
+        self.__version_fetched_at = 0
+
+    async def get_version(self) -> int:
+        """Gets the version stamp of the corpus (fetched again if the polling interval has passed).
+        Clears the cache if the version has changed.
+
+        Returns:
+            int: The version.
+        """
+        now = time.monotonic()
+
+        if self.__version is None or now - self.__version_fetched_at >= self.poll_seconds:
+            version = await self.corpus_version_service.get_version_async()
+            self.__version_fetched_at = now
+
+            if self.__version is not None and version != self.__version:
+                self.cache.clear()
+
+            self.__version = version
+
+        return self.__version
+
+    async def get_key(self, endpoint: str, request_body: BaseModel) -> tuple:
+        """Creates the cache key of a request.
+
+        Args:
+            endpoint (str): The path of the endpoint.
+            request_body (BaseModel): The request body.
+
+        Returns:
+            tuple: The key.
+        """
+        Helper.ensure_type(endpoint, str, "endpoint must be a str!")
+        Helper.ensure_instance(request_body, BaseModel, "request_body must be a pydantic model!")
+
+        return (endpoint, request_body.model_dump_json(), await self.get_version())
+
+    def get(self, key: tuple) -> tuple:
+        """Gets the serialized response stored under the key.
+
+        Args:
+            key (tuple): The key created by get_key.
+
+        Returns:
+            tuple: (True, JSON bytes) if the response is cached, (False, None) otherwise.
+        """
+        return self.cache.get(key)
+
+    def put(self, key: tuple, response: BaseModel) -> bytes:
+        """Serializes the response and stores it under the key.
+
+        Args:
+            key (tuple): The key created by get_key.
+            response (BaseModel): The response body.
+
+        Returns:
+            bytes: The serialized response.
+        """
+        content = response.model_dump_json().encode("utf-8")
+        self.cache.put(key, content)
+        return content
+
+    def put_content(self, key: tuple, content: bytes) -> bytes:
+        """Stores an already serialized response under the key.
+
+        Args:
+            key (tuple): The key created by get_key.
+            content (bytes): The serialized response.
+
+        Returns:
+            bytes: The serialized response.
+        """
+        Helper.ensure_type(content, bytes, "content must be bytes!")
+        self.cache.put(key, content)
+        return content
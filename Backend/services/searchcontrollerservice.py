@@ -0,0 +1,205 @@
+import asyncio
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel
+from models.base_models.search_filter import SearchFilter
+from models.helper import Helper
+from services.compactserializationservice import CompactSerializationService
+from services.embeddingbatchingservice import EmbeddingBatchingService
+from services.executormanager import ExecutorManager
+from services.lexicalindexmanager import LexicalIndexManager
+from services.metricsservice import MetricsService
+from services.papersservice import PapersService
+from services.preprocessingservice import PreprocessingService
+from services.rankfusionservice import RankFusionService
+from services.searchfilterservice import SearchFilterService
+from services.searchsessionservice import SearchSessionService
+from services.vectorsearchservice import VectorSearchService
+
+
+class SearchControllerService:
+    """Represents the search logic shared by the abstract and the title controllers
+    (field selection, response cache keys, ranking of the candidates and pages of search sessions).
+    The controllers only differ in their indexes, their page response model and the conversion of a page.
+    """
+    def __init__(self, papers_service: PapersService, lexical_index_manager: LexicalIndexManager, vector_search_service: VectorSearchService,
+                 preprocessing_service: PreprocessingService, embedding_batching_service: EmbeddingBatchingService,
+                 rank_fusion_service: RankFusionService, search_session_service: SearchSessionService,
+                 compact_serialization_service: CompactSerializationService, page_response_model: type, convert,
+                 hybrid_candidate_factor: int = 2, lexical_filter_over_fetch_factor: int = 5, over_fetch_factor: int = 3):
+        """Initializes a new instance of SearchControllerService.
+
+        Args:
+            papers_service (PapersService): The service that communicates with the papers collection.
+            lexical_index_manager (LexicalIndexManager): The manager of the lexical index.
+            vector_search_service (VectorSearchService): The service searching the chunk embeddings.
+            preprocessing_service (PreprocessingService): The service preprocessing the queries before they are embedded.
+            embedding_batching_service (EmbeddingBatchingService): The service embedding the queries.
+            rank_fusion_service (RankFusionService): The service fusing the lexical and the semantic ranking.
+            search_session_service (SearchSessionService): The store of the search sessions.
+            compact_serialization_service (CompactSerializationService): The service parsing the fields of compact responses.
+            page_response_model (type): The pydantic Base model of a page of a search session.
+            convert (_type_): The function converting a list of hydrated candidates to a list of pydantic Base models.
+            hybrid_candidate_factor (int, optional): The amount of candidates each search of the hybrid mode ranks per requested paper. Defaults to 2.
+            lexical_filter_over_fetch_factor (int, optional): The amount of lexical hits fetched per requested paper if a filter is set. Defaults to 5.
+            over_fetch_factor (int, optional): The amount of chunks fetched per requested paper by the semantic search. Defaults to 3.
+
+        Raises:
+            ValueError: Is thrown if a factor is not positive.
+        """
+        Helper.ensure_instance(papers_service, PapersService, "papers_service must be of type PapersService!")
+        Helper.ensure_instance(lexical_index_manager, LexicalIndexManager, "lexical_index_manager must be of type LexicalIndexManager!")
+        Helper.ensure_instance(vector_search_service, VectorSearchService, "vector_search_service must be of type VectorSearchService!")
+        Helper.ensure_instance(preprocessing_service, PreprocessingService, "preprocessing_service must be of type PreprocessingService!")
+        Helper.ensure_instance(embedding_batching_service, EmbeddingBatchingService, "embedding_batching_service must be of type EmbeddingBatchingService!")
+        Helper.ensure_instance(rank_fusion_service, RankFusionService, "rank_fusion_service must be of type RankFusionService!")
+        Helper.ensure_instance(search_session_service, SearchSessionService, "search_session_service must be of type SearchSessionService!")
+        Helper.ensure_instance(compact_serialization_service, CompactSerializationService,
+                               "compact_serialization_service must be of type CompactSerializationService!")
+        Helper.ensure_type(hybrid_candidate_factor, int, "hybrid_candidate_factor must be an int!")
+        Helper.ensure_type(lexical_filter_over_fetch_factor, int, "lexical_filter_over_fetch_factor must be an int!")
+        Helper.ensure_type(over_fetch_factor, int, "over_fetch_factor must be an int!")
+
+        if not(isinstance(page_response_model, type) and issubclass(page_response_model, BaseModel)):
+            raise TypeError("page_response_model must be a pydantic Base model!")
+        if not callable(convert):
+            raise TypeError("convert must be callable!")
+        if hybrid_candidate_factor <= 0:
+            raise ValueError("hybrid_candidate_factor cannot be less or equal to 0!")
+        if lexical_filter_over_fetch_factor <= 0:
+            raise ValueError("lexical_filter_over_fetch_factor cannot be less or equal to 0!")
+        if over_fetch_factor <= 0:
+            raise ValueError("over_fetch_factor cannot be less or equal to 0!")
+
+        self.papers_service = papers_service
+        self.lexical_index_manager = lexical_index_manager
+        self.vector_search_service = vector_search_service
+        self.preprocessing_service = preprocessing_service
+        self.embedding_batching_service = embedding_batching_service
+        self.rank_fusion_service = rank_fusion_service
+        self.search_session_service = search_session_service
+        self.compact_serialization_service = compact_serialization_service
+        self.page_response_model = page_response_model
+        self.convert = convert
+        self.hybrid_candidate_factor = hybrid_candidate_factor
+        self.lexical_filter_over_fetch_factor = lexical_filter_over_fetch_factor
+        self.over_fetch_factor = over_fetch_factor
+
+    def get_selected_fields(self, compact: bool, fields: str, allowed_fields: list[str]) -> list[str]:
+        """Gets the fields of the compact response mode.
+
+        Args:
+            compact (bool): Boolean indicating whether the compact response mode was requested.
+            fields (str): The comma-separated fields or None.
+            allowed_fields (list[str]): The fields that can be selected.
+
+        Raises:
+            ValueError: Is thrown if a field cannot be selected.
+
+        Returns:
+            list[str]: The selected fields or None if the response is not compact.
+        """
+        if not compact and fields is None:
+            return None
+
+        return self.compact_serialization_service.parse_fields(fields, allowed_fields)
+
+    @staticmethod
+    def get_cache_endpoint(endpoint: str, selected_fields: list[str]) -> str:
+        """Gets the endpoint part of the response cache key (compact responses are cached per field selection).
+
+        Args:
+            endpoint (str): The endpoint.
+            selected_fields (list[str]): The fields of the compact response or None.
+
+        Returns:
+            str: The endpoint part of the key.
+        """
+        return endpoint if selected_fields is None else endpoint + "?fields=" + ",".join(selected_fields)
+
+    async def embed_query(self, query: str) -> list[float]:
+        """Preprocesses the query in the inference pool (so that tokenizing a long query does not block the event loop) and embeds it.
+
+        Args:
+            query (str): The query.
+
+        Returns:
+            list[float]: The embedded query.
+        """
+        with MetricsService.measure("preprocess"):
+            query_preprocessed = await ExecutorManager.run_inference(self.preprocessing_service.preprocess, query)
+
+        with MetricsService.measure("encode"):
+            return await self.embedding_batching_service.create_embedding_async(query_preprocessed)
+
+    async def rank_candidates(self, query: str, mode: str, amount: int, search_filter: SearchFilter = None) -> list[dict]:
+        """Ranks the papers matching the query without fetching the papers.
+        The hybrid mode runs the lexical and the semantic search concurrently and fuses their rankings with reciprocal-rank fusion.
+        The lexical hits are filtered with one query on the papers (over-fetching lexical_filter_over_fetch_factor times as many hits),
+        the semantic search applies the filter itself.
+
+        Args:
+            query (str): The query.
+            mode (str): The search mode (see SearchSessionService.MODES).
+            amount (int): The maximum amount of papers.
+            search_filter (SearchFilter, optional): The filter of the papers. Defaults to None (no filtering).
+
+        Returns:
+            list[dict]: The papers ordered by rank.
+            Dictionary format: {"paperId": <paper-id>, "score": <score>, "chunks": [<chunk>, ...]} (lexical matches carry no chunks).
+        """
+        if mode == "lexical":
+            paper_query = SearchFilterService.to_paper_query(search_filter)
+
+            lexical_index = await self.lexical_index_manager.get_index()
+
+            if paper_query is None:
+                with MetricsService.measure("lexical_search"):
+                    hits = await ExecutorManager.run_inference(lexical_index.search, query, amount)
+            else:
+                with MetricsService.measure("lexical_search"):
+                    hits = await ExecutorManager.run_inference(lexical_index.search, query, amount * self.lexical_filter_over_fetch_factor)
+
+                with MetricsService.measure("filter"):
+                    papers = await self.papers_service.get_papers_async({"$and": [{"id": {"$in": [el[0] for el in hits]}}, paper_query]},
+                                                                        {"_id": 0, "id": 1})
+
+                paper_ids = set([el["id"] for el in papers])
+                hits = [el for el in hits if el[0] in paper_ids][:amount]
+
+            return [{"paperId": el[0], "score": el[1], "chunks": []} for el in hits]
+
+        if mode == "semantic":
+            query_embedded = await self.embed_query(query)
+            return await self.vector_search_service.search_papers_async(query_embedded, amount, self.papers_service, self.over_fetch_factor,
+                                                                        hydrate=False, search_filter=search_filter)
+
+        lexical, semantic = await asyncio.gather(self.rank_candidates(query, "lexical", amount * self.hybrid_candidate_factor, search_filter),
+                                                 self.rank_candidates(query, "semantic", amount * self.hybrid_candidate_factor, search_filter))
+        id_to_chunks = {el["paperId"]: el["chunks"] for el in semantic}
+        fused = self.rank_fusion_service.fuse([[el["paperId"] for el in lexical], [el["paperId"] for el in semantic]], amount)
+        return [{"paperId": el[0], "score": el[1], "chunks": id_to_chunks.get(el[0], [])} for el in fused]
+
+    async def get_page_response(self, session_id: str, candidates: list[dict], offset: int, amount: int, stream: bool, route: str) -> Response:
+        """Creates the response containing one page of a search session (as JSON or streamed as NDJSON).
+
+        Args:
+            session_id (str): The ID of the session.
+            candidates (list[dict]): The ranked candidates of the session.
+            offset (int): The index of the first candidate of the page.
+            amount (int): The amount of candidates of the page.
+            stream (bool): Boolean indicating whether the page is streamed as NDJSON.
+            route (str): The route template of the request (the hydration of a streamed page is recorded for it).
+
+        Returns:
+            Response: The response.
+        """
+        if stream:
+            return StreamingResponse(self.search_session_service.stream_page(session_id, candidates, offset, amount,
+                                                                             lambda candidate: self.convert([candidate])[0], route),
+                                     media_type="application/x-ndjson")
+
+        page = await self.search_session_service.get_page(candidates, offset, amount)
+        response = self.page_response_model(sessionId=session_id, offset=offset, total=len(candidates),
+                                            nextOffset=self.search_session_service.get_next_offset(candidates, offset, amount),
+                                            result=self.convert(page))
+        return Response(content=response.model_dump_json(), media_type="application/json")
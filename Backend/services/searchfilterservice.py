@@ -0,0 +1,63 @@
+import datetime
+from models.base_models.search_filter import SearchFilter
+
+
+class SearchFilterService:
+    """Represents a service that converts search filters into MongoDB queries.
+    The chunk collections carry denormalized copies of the filter fields (publicationDate, source, authorNames),
+    which are declared as filter fields of the vector search indexes, so that $vectorSearch can pre-filter.
+    """
+    @staticmethod
+    def to_chunk_filter(search_filter: SearchFilter) -> dict:
+        """Converts the search filter into a filter on the chunk collections (usable as the filter of $vectorSearch).
+
+        Args:
+            search_filter (SearchFilter): The search filter.
+
+        Returns:
+            dict: The filter or None if the search filter is empty.
+        """
+        return SearchFilterService.__to_query(search_filter, "authorNames")
+
+    @staticmethod
+    def to_paper_query(search_filter: SearchFilter) -> dict:
+        """Converts the search filter into a query on the papers collection.
+
+        Args:
+            search_filter (SearchFilter): The search filter.
+
+        Returns:
+            dict: The query or None if the search filter is empty.
+        """
+        return SearchFilterService.__to_query(search_filter, "authors.fullName")
+
+    @staticmethod
+    def __to_query(search_filter: SearchFilter, authors_path: str) -> dict:
+        """Converts the search filter into a MongoDB query.
+
+        Args:
+            search_filter (SearchFilter): The search filter.
+            authors_path (str): The path of the author names.
+
+        Returns:
+            dict: The query or None if the search filter is empty.
+        """
+        if search_filter is None:
+            return None
+
+        conditions = []
+
+        if search_filter.publishedFrom is not None:
+            conditions.append({"publicationDate": {"$gte": datetime.datetime.combine(search_filter.publishedFrom, datetime.time.min)}})
+        if search_filter.publishedTo is not None:
+            conditions.append({"publicationDate": {"$lte": datetime.datetime.combine(search_filter.publishedTo, datetime.time.max)}})
+        if search_filter.sources is not None:
+            conditions.append({"source": {"$in": search_filter.sources}})
+        if search_filter.authors is not None:
+            conditions.append({authors_path: {"$in": search_filter.authors}})
+
+        if len(conditions) == 0:
+            return None
+        if len(conditions) == 1:
+            return conditions[0]
+        return {"$and": conditions}
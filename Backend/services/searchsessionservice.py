@@ -0,0 +1,155 @@
+import json
+import secrets
+from models.helper import Helper
+from services.lrucache import LRUCache
+from services.metricsservice import MetricsService
+from services.papersservice import PapersService
+
+
+class SearchSessionService:
+    """Represents a store of search sessions (cursors).
+    A session keeps the ranked candidate list of a search (paper IDs with their matching chunks, without the papers)
+    for the time to live of the cache, so that further pages are served without embedding and searching again.
+    Only the papers of the requested page are fetched from MongoDB.
+    """
+    MODES = ["semantic", "lexical", "hybrid"]
+
+    def __init__(self, papers_service: PapersService, cache: LRUCache, hydration_batch_size: int = 10):
+        """Initializes a new instance of SearchSessionService.
+
+        Args:
+            papers_service (PapersService): The service that communicates with the papers collection.
+            cache (LRUCache): The cache storing the candidate lists (its time to live is the lifetime of a session).
+            hydration_batch_size (int, optional): The amount of papers fetched at once while streaming a page. Defaults to 10.
+
+        Raises:
+            ValueError: Is thrown if hydration_batch_size is not positive.
+        """
+        Helper.ensure_instance(papers_service, PapersService, "papers_service must be of type PapersService!")
+        Helper.ensure_instance(cache, LRUCache, "cache must be of type LRUCache!")
+        Helper.ensure_type(hydration_batch_size, int, "hydration_batch_size must be an int!")
+
+        if hydration_batch_size <= 0:
+            raise ValueError("hydration_batch_size cannot be less or equal to 0!")
+
+        self.papers_service = papers_service
+        self.cache = cache
+        self.hydration_batch_size = hydration_batch_size
+
+    def create(self, candidates: list[dict]) -> str:
+        """Creates a session for the ranked candidates.
+
+        Args:
+            candidates (list[dict]): The candidates ordered by rank.
+            Dictionary format: {"paperId": <paper-id>, "chunks": [<chunk>, ...], ...}.
+
+        Returns:
+            str: The ID of the session.
+        """
+        Helper.ensure_list_of_type(candidates, dict, "candidates must be a list!", "candidates must contain elements of type dict!")
+        session_id = secrets.token_urlsafe(16)
+        self.cache.put(session_id, candidates)
+        return session_id
+
+    def get_candidates(self, session_id: str) -> list[dict]:
+        """Gets the ranked candidates of a session.
+
+        Args:
+            session_id (str): The ID of the session.
+
+        Returns:
+            list[dict]: The candidates or None if the session does not exist or has expired.
+        """
+        Helper.ensure_type(session_id, str, "session_id must be a str!")
+        found, candidates = self.cache.get(session_id)
+        return candidates if found else None
+
+    async def get_page(self, candidates: list[dict], offset: int, amount: int, projection: dict = None) -> list[dict]:
+        """Gets a page of candidates with their papers attached (only the fields of the projection).
+        Candidates without a matching paper are skipped.
+
+        Args:
+            candidates (list[dict]): The candidates ordered by rank.
+            offset (int): The index of the first candidate of the page.
+            amount (int): The amount of candidates of the page.
+            projection (dict, optional): The projection of the papers (has to include the ID). Defaults to None (PapersService.RESULT_PROJECTION).
+
+        Returns:
+            list[dict]: The candidates of the page.
+            Dictionary format: {"paperId": <paper-id>, "chunks": [<chunk>, ...], "paper": <paper>, ...}.
+        """
+        Helper.ensure_type(offset, int, "offset must be an int!")
+        Helper.ensure_type(amount, int, "amount must be an int!")
+        page = candidates[offset:offset + amount]
+
+        if len(page) == 0:
+            return []
+
+        with MetricsService.measure("hydrate"):
+            papers = await self.papers_service.get_papers_async({"id": {"$in": [el["paperId"] for el in page]}},
+                                                                PapersService.RESULT_PROJECTION if projection is None else projection)
+
+        id_to_paper = {el["id"]: el for el in papers}
+        return [dict(el, paper=id_to_paper[el["paperId"]]) for el in page if el["paperId"] in id_to_paper]
+
+    async def stream_page(self, session_id: str, candidates: list[dict], offset: int, amount: int, convert, route: str = None):
+        """Streams a page as NDJSON (one JSON document per line).
+        The first line describes the page ({"sessionId": <id>, "offset": <offset>, "total": <total>, "nextOffset": <offset-or-null>}),
+        every following line is one result. The papers are fetched in batches of hydration_batch_size,
+        so that the first results are sent before the whole page is hydrated.
+        The body is sent after the request was recorded by the metrics middleware, so the hydration is timed here
+        and recorded for the route when the stream ends (it does not appear in the Server-Timing header).
+
+        Args:
+            session_id (str): The ID of the session.
+            candidates (list[dict]): The candidates ordered by rank.
+            offset (int): The index of the first candidate of the page.
+            amount (int): The amount of candidates of the page.
+            convert (_type_): The function converting a hydrated candidate to a pydantic Base model.
+            route (str, optional): The route template of the request used to record the stages. Defaults to None (not recorded).
+
+        Yields:
+            bytes: The lines of the response.
+        """
+        yield (self.get_page_header(session_id, candidates, offset, amount) + "\n").encode("utf-8")
+        end = min(offset + amount, len(candidates))
+        stages = {}
+
+        try:
+            for start in range(offset, end, self.hydration_batch_size):
+                with MetricsService.collect(stages):
+                    page = await self.get_page(candidates, start, min(self.hydration_batch_size, end - start))
+
+                for candidate in page:
+                    yield (convert(candidate).model_dump_json() + "\n").encode("utf-8")
+        finally:
+            if route is not None and len(stages) > 0:
+                MetricsService.record_stages(route, stages)
+
+    def get_page_header(self, session_id: str, candidates: list[dict], offset: int, amount: int) -> str:
+        """Creates the description of a page as JSON.
+
+        Args:
+            session_id (str): The ID of the session.
+            candidates (list[dict]): The candidates ordered by rank.
+            offset (int): The index of the first candidate of the page.
+            amount (int): The amount of candidates of the page.
+
+        Returns:
+            str: The description.
+        """
+        return json.dumps({"sessionId": session_id, "offset": offset, "total": len(candidates),
+                           "nextOffset": self.get_next_offset(candidates, offset, amount)})
+
+    def get_next_offset(self, candidates: list[dict], offset: int, amount: int) -> int:
+        """Gets the offset of the next page.
+
+        Args:
+            candidates (list[dict]): The candidates ordered by rank.
+            offset (int): The index of the first candidate of the page.
+            amount (int): The amount of candidates of the page.
+
+        Returns:
+            int: The offset or None if the page is the last one.
+        """
+        return offset + amount if offset + amount < len(candidates) else None
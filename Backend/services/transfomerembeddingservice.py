@@ -1,25 +1,37 @@
 from sentence_transformers import SentenceTransformer
 from models.helper import Helper
 from services.embeddingservice import EmbeddingService
+from services.lrucache import LRUCache
 
 class TransformerEmbeddingService(EmbeddingService):
     """Represents an embedding service that uses sentence transformers
     to embed data (neural network model designed to generate dense vector representations for sentences).
+    Embeddings of repeated texts are served from an optional LRU/TTL cache, so that the model is not run again.
 
     Args:
-        EmbeddingService (_type_): The base embedding service. 
+        EmbeddingService (_type_): The base embedding service.
     """
-    def __init__(self, embedder: SentenceTransformer):
+    def __init__(self, embedder: SentenceTransformer, model_name: str = "default", cache: LRUCache = None):
         """Initializes a new instance of TransformerEmbeddingService.
 
         Args:
             embedder (SentenceTransformer): The sentence transformer.
+            model_name (str, optional): The name of the model (part of the cache key). Defaults to "default".
+            cache (LRUCache, optional): The cache of the embeddings. Defaults to None (no caching).
         """
         Helper.ensure_instance(embedder, SentenceTransformer, "embedder must be of type SentenceTransformer!")
+        Helper.ensure_type(model_name, str, "model_name must be a str!")
+
+        if cache is not None:
+            Helper.ensure_instance(cache, LRUCache, "cache must be of type LRUCache!")
+
         self.embedder = embedder
+        self.model_name = model_name
+        self.cache = cache
 
     def create_embedding(self, text: str) -> list[float]:
         """Creates an embedding for the given text using a sentence transformer.
+        Cached embeddings are keyed by the model name and the whitespace-normalized text.
 
         Args:
             text (str): The text to embed.
@@ -28,6 +40,76 @@ class TransformerEmbeddingService(EmbeddingService):
             list[float]: The resulting embedding vector.
         """
         Helper.ensure_type(text, str, "text must be a str!")
-    
+
+        if self.cache is None:
+            return self.__encode(text)
+
+        key = (self.model_name, " ".join(text.split()))
+        found, text_embedding = self.cache.get(key)
+
+        if not found:
+            text_embedding = self.__encode(text)
+            self.cache.put(key, text_embedding)
+
+        return list(text_embedding)
+
+    def create_embeddings(self, texts: list[str]) -> list[list[float]]:
+        """Creates embeddings for multiple texts with one batched run of the sentence transformer.
+        Texts found in the cache are not embedded again.
+
+        Args:
+            texts (list[str]): The texts to embed.
+
+        Returns:
+            list[list[float]]: The resulting embedding vectors (in the order of the texts).
+        """
+        Helper.ensure_list_of_type(texts, str, "texts must be a list!", "texts must contain elements of type str!")
+        result = [None] * len(texts)
+        missing = {}
+
+        for i, text in enumerate(texts):
+            key = (self.model_name, " ".join(text.split()))
+            found, text_embedding = self.cache.get(key) if self.cache is not None else (False, None)
+
+            if found:
+                result[i] = list(text_embedding)
+            else:
+                missing.setdefault(key, []).append(i)
+
+        if len(missing) > 0:
+            keys = list(missing.keys())
+            text_embeddings = self.embedder.encode([texts[missing[el][0]] for el in keys])
+
+            for key, text_embedding in zip(keys, text_embeddings):
+                text_embedding = [float(el) for el in list(text_embedding)]
+
+                if self.cache is not None:
+                    self.cache.put(key, text_embedding)
+
+                for i in missing[key]:
+                    result[i] = list(text_embedding)
+
+        return result
+
+    def get_cache_statistics(self) -> dict:
+        """Gets the hit, miss and eviction counters of the embedding cache.
+
+        Returns:
+            dict: The statistics (see LRUCache.get_statistics) or an empty dictionary if caching is disabled.
+        """
+        if self.cache is None:
+            return {}
+
+        return self.cache.get_statistics()
+
+    def __encode(self, text: str) -> list[float]:
+        """Runs the sentence transformer on the text.
+
+        Args:
+            text (str): The text to embed.
+
+        Returns:
+            list[float]: The resulting embedding vector.
+        """
         text_embedding = [float(el) for el in list(self.embedder.encode(text))]
-        return text_embedding
\ No newline at end of file
+        return text_embedding
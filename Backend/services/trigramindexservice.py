@@ -0,0 +1,234 @@
+import heapq
+import json
+import os
+import re
+from models.helper import Helper
+
+
+class TrigramIndexService:
+    """Represents an index of character trigrams that answers substring and typo-tolerant queries over a text field of the papers.
+    Every lowercased text is split into overlapping trigrams (e.g. "care" -> "car", "are"), and every trigram maps to the papers containing it.
+    A query only touches the posting lists of its own trigrams:
+        Exact substring matches are found by intersecting the posting lists of the text trigrams and verifying the candidates.
+        Every text is padded with a space on both sides, so that queries shorter than a trigram are padded the same way
+        and match whole words (e.g. "ai" -> " ai ") instead of requiring a scan of all texts.
+        Fuzzy matches are ranked by word similarity in the style of pg_trgm: every word is padded ("  word ") and split into trigrams,
+        and the query is compared with the best matching window of as many consecutive words of the text
+        (Jaccard similarity of the trigram sets), so that long texts are not favoured and typos inside a word are tolerated.
+    """
+    def __init__(self, similarity_threshold: float = 0.25):
+        """Initializes a new (empty) instance of TrigramIndexService.
+
+        Args:
+            similarity_threshold (float, optional): The minimum word similarity of fuzzy matches. Defaults to 0.25.
+        """
+        Helper.ensure_type(similarity_threshold, float, "similarity_threshold must be a float!")
+        self.similarity_threshold = similarity_threshold
+        self.paper_ids = []
+        self.texts = []
+        self.words = []
+        self.postings = {}
+        self.word_postings = {}
+
+    def build(self, papers: list[dict], field: str):
+        """Builds the index from the given papers.
+
+        Args:
+            papers (list[dict]): The papers fetched from the papers collection. Dictionary format: {"id": <paper-id>, <field>: <text>, ...}.
+            field (str): The text field of the papers to index (e.g. "title").
+        """
+        Helper.ensure_list_of_type(papers, dict, "papers must be a list!", "papers must contain elements of type dict!")
+        Helper.ensure_type(field, str, "field must be a str!")
+        self.__set_documents([el["id"] for el in papers], [el[field] for el in papers])
+
+    def search(self, query: str, amount: int) -> list[tuple]:
+        """Searches for the papers whose text contains the query or is similar to it.
+        Exact substring matches come first (ordered by the amount of occurrences), followed by fuzzy matches
+        (ordered by word similarity). Exact matches of queries shorter than 3 characters are whole words.
+
+        Args:
+            query (str): The query (backslash escapes of regular expressions are removed).
+            amount (int): The amount of papers to return.
+
+        Returns:
+            list[tuple]: The matching papers as (paper ID, similarity) tuples ordered by relevance.
+        """
+        Helper.ensure_type(query, str, "query must be a str!")
+        Helper.ensure_type(amount, int, "amount must be an int!")
+        query = TrigramIndexService.normalize(re.sub(r"\\(.)", r"\1", query))
+
+        if len(query) == 0 or amount <= 0:
+            return []
+
+        substring = TrigramIndexService.pad(query) if len(query) < 3 else query
+        substring_trigrams = TrigramIndexService.get_trigrams(substring)
+        candidates = None
+
+        for trigram in sorted(substring_trigrams, key=lambda el: len(self.postings.get(el, []))):
+            documents = set(self.postings.get(trigram, []))
+            candidates = documents if candidates is None else candidates & documents
+
+            if len(candidates) == 0:
+                break
+
+        scored = []
+        exact_matches = set()
+
+        for document in candidates:
+            occurrences = self.texts[document].count(substring)
+
+            if occurrences > 0:
+                exact_matches.add(document)
+                scored.append((1, occurrences, 1.0, document))
+
+        query_words = query.split(" ")
+        query_trigrams = TrigramIndexService.get_word_trigrams(query_words)
+        shared_counts = {}
+
+        for trigram in query_trigrams:
+            for document in self.word_postings.get(trigram, []):
+                shared_counts[document] = shared_counts.get(document, 0) + 1
+
+        # the union contains all query trigrams, so a similarity above the threshold needs at least threshold * |query trigrams| shared trigrams
+        min_shared = self.similarity_threshold * len(query_trigrams)
+
+        for document, count in shared_counts.items():
+            if document in exact_matches or count < min_shared:
+                continue
+
+            similarity = self.__get_word_similarity(query_trigrams, len(query_words), self.words[document])
+
+            if similarity >= self.similarity_threshold:
+                scored.append((0, 0, similarity, document))
+
+        top = heapq.nlargest(amount, scored)
+        return [(self.paper_ids[el[3]], el[2]) for el in top]
+
+    def save(self, path: str):
+        """Saves the indexed texts as a JSON file (the posting lists are rebuilt when loading).
+
+        Args:
+            path (str): The path of the file.
+        """
+        Helper.ensure_type(path, str, "path must be a str!")
+        directory = os.path.dirname(path)
+
+        if directory != "":
+            os.makedirs(directory, exist_ok=True)
+
+        temp_path = path + ".tmp-" + str(os.getpid())
+
+        with open(temp_path, "w") as index_file:
+            json.dump({"paperIds": self.paper_ids, "texts": self.texts}, index_file)
+
+        os.replace(temp_path, path)
+
+    def load(self, path: str):
+        """Loads an index saved as a JSON file.
+
+        Args:
+            path (str): The path of the file.
+        """
+        Helper.ensure_type(path, str, "path must be a str!")
+
+        with open(path) as index_file:
+            data = json.load(index_file)
+
+        self.__set_documents(data["paperIds"], data["texts"])
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Lowercases the text and collapses whitespace.
+
+        Args:
+            text (str): The text.
+
+        Returns:
+            str: The normalized text.
+        """
+        return " ".join(text.lower().split())
+
+    @staticmethod
+    def pad(text: str) -> str:
+        """Pads the text with a space on both sides (the word boundaries of its first and last word).
+
+        Args:
+            text (str): The normalized text.
+
+        Returns:
+            str: The padded text.
+        """
+        return " " + text + " "
+
+    @staticmethod
+    def get_trigrams(text: str) -> set:
+        """Gets the set of character trigrams of the text.
+
+        Args:
+            text (str): The normalized text.
+
+        Returns:
+            set: The trigrams.
+        """
+        return set([text[i:i + 3] for i in range(len(text) - 2)])
+
+    @staticmethod
+    def get_word_trigrams(words: list[str]) -> set:
+        """Gets the set of trigrams of the words, every word padded like in pg_trgm (two spaces in front and one behind).
+
+        Args:
+            words (list[str]): The normalized words.
+
+        Returns:
+            set: The trigrams.
+        """
+        result = set()
+
+        for word in words:
+            result.update(TrigramIndexService.get_trigrams("  " + word + " "))
+
+        return result
+
+    def __get_word_similarity(self, query_trigrams: set, query_word_count: int, words: list[str]) -> float:
+        """Computes the similarity of the query to the best matching window of query_word_count consecutive words of a text
+        (Jaccard similarity of the padded word trigrams).
+
+        Args:
+            query_trigrams (set): The padded word trigrams of the query.
+            query_word_count (int): The amount of words of the query.
+            words (list[str]): The words of the text.
+
+        Returns:
+            float: The similarity between 0 and 1.
+        """
+        window = min(query_word_count, len(words))
+        result = 0.0
+
+        for start in range(len(words) - window + 1):
+            window_trigrams = TrigramIndexService.get_word_trigrams(words[start:start + window])
+            shared = len(query_trigrams & window_trigrams)
+
+            if shared > 0:
+                result = max(result, shared / (len(query_trigrams) + len(window_trigrams) - shared))
+
+        return result
+
+    def __set_documents(self, paper_ids: list[str], texts: list[str]):
+        """Sets the indexed documents and rebuilds the posting lists.
+
+        Args:
+            paper_ids (list[str]): The paper IDs.
+            texts (list[str]): The texts of the papers.
+        """
+        self.paper_ids = paper_ids
+        self.texts = [TrigramIndexService.pad(TrigramIndexService.normalize(el)) for el in texts]
+        self.words = [el.split() for el in self.texts]
+        self.postings = {}
+        self.word_postings = {}
+
+        for document, text in enumerate(self.texts):
+            for trigram in TrigramIndexService.get_trigrams(text):
+                self.postings.setdefault(trigram, []).append(document)
+
+            for trigram in TrigramIndexService.get_word_trigrams(self.words[document]):
+                self.word_postings.setdefault(trigram, []).append(document)
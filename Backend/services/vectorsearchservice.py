@@ -0,0 +1,188 @@
+from abc import ABC, abstractmethod
+from services.executormanager import ExecutorManager
+from services.metricsservice import MetricsService
+from models.base_models.search_filter import SearchFilter
+from services.papersservice import PapersService
+from services.searchfilterservice import SearchFilterService
+
+
+class VectorSearchService(ABC):
+    """Represents an abstract vector search service (k nearest neighbour search over chunk embeddings).
+
+    Args:
+        ABC (_type_): The abstract base class.
+    """
+    @abstractmethod
+    def search(self, query_vector: list[float], amount: int) -> list[dict]:
+        """Searches for the chunks that are the most similar to the query vector.
+
+        Args:
+            query_vector (list[float]): The embedded query.
+            amount (int): The amount of chunks to return.
+
+        Returns:
+            list[dict]: The matching chunks ordered by similarity.
+            Dictionary format: {"paperId": <paper-id>, "chunk": <chunk-text>, ...}.
+        """
+        pass
+
+    async def search_async(self, query_vector: list[float], amount: int) -> list[dict]:
+        """Searches for the chunks that are the most similar to the query vector without blocking the event loop.
+        Runs search in the inference pool unless overridden by an engine that performs asynchronous I/O.
+        Not timed by the engines: the callers measure the stage vector_search, so that every search is counted once.
+
+        Args:
+            query_vector (list[float]): The embedded query.
+            amount (int): The amount of chunks to return.
+
+        Returns:
+            list[dict]: The matching chunks ordered by similarity.
+        """
+        return await ExecutorManager.run_inference(self.search, query_vector, amount)
+
+    def search_batch(self, query_vectors: list[list[float]], amount: int) -> list[list[dict]]:
+        """Searches for the most similar chunks of multiple query vectors.
+        Performs one search per query vector unless overridden by an engine that supports batched queries.
+
+        Args:
+            query_vectors (list[list[float]]): The embedded queries.
+            amount (int): The amount of chunks to return per query.
+
+        Returns:
+            list[list[dict]]: The matching chunks of every query ordered by similarity.
+        """
+        return [self.search(el, amount) for el in query_vectors]
+
+    async def search_with_papers_async(self, query_vector: list[float], amount: int, papers_service: PapersService,
+                                       search_filter: SearchFilter = None, max_rounds: int = 4, projection: dict = None) -> list[dict]:
+        """Searches for the most similar chunks and attaches the paper of every chunk (only the fields of the projection).
+        Fetches the papers with one $in query and joins them through an id-keyed map
+        unless overridden by an engine that can join inside the search (e.g. $lookup on Atlas).
+        Chunks without a matching paper are skipped.
+        The search filter is applied to the papers of the $in query (post-filtering), so the amount of chunks is doubled
+        while fewer than amount chunks pass the filter and more chunks exist, at most max_rounds times.
+
+        Args:
+            query_vector (list[float]): The embedded query.
+            amount (int): The amount of chunks to return.
+            papers_service (PapersService): The service that communicates with the papers collection.
+            search_filter (SearchFilter, optional): The filter of the papers. Defaults to None (no filtering).
+            max_rounds (int, optional): The maximum amount of searches if a filter is given. Defaults to 4.
+            projection (dict, optional): The projection of the papers (has to include the ID). Defaults to None (PapersService.RESULT_PROJECTION).
+
+        Returns:
+            list[dict]: The matching chunks ordered by similarity.
+            Dictionary format: {"paperId": <paper-id>, "chunk": <chunk-text>, "paper": <paper>, ...}.
+        """
+        paper_query = SearchFilterService.to_paper_query(search_filter)
+        limit = amount
+
+        for i in range(max_rounds if paper_query is not None else 1):
+            with MetricsService.measure("vector_search"):
+                results = await self.search_async(query_vector, limit)
+
+            id_to_paper = await self.__get_papers_by_id(papers_service, [el["paperId"] for el in results], paper_query, projection)
+            chunks = [dict(el, paper=id_to_paper[el["paperId"]]) for el in results if el["paperId"] in id_to_paper]
+
+            if len(chunks) >= amount or len(results) < limit:
+                break
+            limit *= 2
+
+        return chunks[:amount]
+
+    async def search_papers_async(self, query_vector: list[float], amount: int, papers_service: PapersService,
+                                  over_fetch_factor: int = 3, max_rounds: int = 4, hydrate: bool = True,
+                                  search_filter: SearchFilter = None, projection: dict = None) -> list[dict]:
+        """Searches for the most similar papers by grouping the most similar chunks by paper (best chunk score first)
+        and attaches the paper of every group (only the fields of the projection).
+        Starts with amount * over_fetch_factor chunks and doubles the amount of chunks while fewer than amount papers were found
+        and the search returned as many chunks as requested (i.e. more chunks exist), at most max_rounds times.
+        The search filter is applied to the papers of every round (post-filtering), so filtered out papers do not count.
+
+        Args:
+            query_vector (list[float]): The embedded query.
+            amount (int): The amount of papers to return.
+            papers_service (PapersService): The service that communicates with the papers collection.
+            over_fetch_factor (int, optional): The amount of chunks fetched per requested paper in the first round. Defaults to 3.
+            max_rounds (int, optional): The maximum amount of searches. Defaults to 4.
+            hydrate (bool, optional): Boolean indicating whether the papers are attached. Defaults to True.
+            search_filter (SearchFilter, optional): The filter of the papers. Defaults to None (no filtering).
+            projection (dict, optional): The projection of the papers (has to include the ID). Defaults to None (PapersService.RESULT_PROJECTION).
+
+        Returns:
+            list[dict]: The matching papers ordered by similarity.
+            Dictionary format: {"paperId": <paper-id>, "score": <best-chunk-score>, "chunks": [<chunk>, ...], "paper": <paper>}.
+        """
+        if amount <= 0:
+            return []
+
+        paper_query = SearchFilterService.to_paper_query(search_filter)
+        id_to_paper = None
+        limit = amount * over_fetch_factor
+
+        for i in range(max_rounds):
+            with MetricsService.measure("vector_search"):
+                results = await self.search_async(query_vector, limit)
+
+            groups = VectorSearchService.group_by_paper(results)
+
+            if paper_query is not None:
+                id_to_paper = await self.__get_papers_by_id(papers_service, [el["paperId"] for el in groups], paper_query, projection)
+                groups = [el for el in groups if el["paperId"] in id_to_paper]
+
+            if len(groups) >= amount or len(results) < limit:
+                break
+            limit *= 2
+
+        groups = groups[:amount]
+
+        if not hydrate:
+            return groups
+
+        if id_to_paper is None:
+            id_to_paper = await self.__get_papers_by_id(papers_service, [el["paperId"] for el in groups], None, projection)
+
+        return [dict(el, paper=id_to_paper[el["paperId"]]) for el in groups if el["paperId"] in id_to_paper]
+
+    @staticmethod
+    def group_by_paper(chunks: list[dict]) -> list[dict]:
+        """Groups chunks ordered by similarity by their paper. The groups are ordered by their first (best) chunk.
+
+        Args:
+            chunks (list[dict]): The chunks ordered by similarity.
+
+        Returns:
+            list[dict]: The groups.
+            Dictionary format: {"paperId": <paper-id>, "score": <best-chunk-score>, "chunks": [<chunk>, ...]}.
+        """
+        groups = {}
+
+        for chunk in chunks:
+            if chunk["paperId"] not in groups:
+                groups[chunk["paperId"]] = {"paperId": chunk["paperId"], "score": chunk.get("score"), "chunks": []}
+            groups[chunk["paperId"]]["chunks"].append(chunk)
+
+        return list(groups.values())
+
+    async def __get_papers_by_id(self, papers_service: PapersService, paper_ids: list[str], paper_query: dict = None,
+                                 projection: dict = None) -> dict:
+        """Fetches the papers with the given IDs (only the fields of the projection) with one $in query.
+
+        Args:
+            papers_service (PapersService): The service that communicates with the papers collection.
+            paper_ids (list[str]): The IDs of the papers.
+            paper_query (dict, optional): The query the papers have to match additionally. Defaults to None.
+            projection (dict, optional): The projection of the papers. Defaults to None (PapersService.RESULT_PROJECTION).
+
+        Returns:
+            dict: The papers keyed by their ID.
+        """
+        query = {"id": {"$in": list(set(paper_ids))}}
+
+        if paper_query is not None:
+            query = {"$and": [query, paper_query]}
+
+        with MetricsService.measure("hydrate"):
+            papers = await papers_service.get_papers_async(query, PapersService.RESULT_PROJECTION if projection is None else projection)
+
+        return {el["id"]: el for el in papers}
@@ -0,0 +1,96 @@
+import os
+from models.helper import Helper
+from services.atlasvectorsearchservice import AtlasVectorSearchService
+from services.bruteforcevectorsearchservice import BruteForceVectorSearchService
+from services.chunkvectorstore import ChunkVectorStore
+from services.hnswvectorsearchservice import HNSWVectorSearchService
+from services.mongodbservice import MongoDBService
+from services.vectorsearchservice import VectorSearchService
+
+
+class VectorSearchServiceFactory:
+    """Represents a factory that creates the vector search service selected by the configuration.
+    Supported engines:
+        atlas: $vectorSearch on the MongoDB Atlas cluster (default).
+        hnsw: in-process HNSW graph (hnswlib) that is built offline by build_indexes.py and loaded on startup.
+        bruteforce: in-process exact search over the chunk vectors exported offline by build_indexes.py and memory-mapped on startup.
+    The local indexes are never built on startup, because reading and indexing a whole chunk collection would block it.
+    """
+    ENGINES = ["atlas", "hnsw", "bruteforce"]
+
+    @staticmethod
+    def create(engine: str, chunks_service: MongoDBService, index_name: str, index_path: str) -> VectorSearchService:
+        """Creates the vector search service for the given engine.
+        Falls back to Atlas if the engine is empty.
+        Falls back to the exact search over the chunk vector store if the HNSW graph is missing (or does not match the store)
+        but the store exists.
+        The size of the candidate list of the HNSW search is read from HNSW_EF_SEARCH (default: 64).
+
+        Args:
+            engine (str): The name of the engine (see ENGINES).
+            chunks_service (MongoDBService): The service that communicates with the chunk collection.
+            index_name (str): The name of the search index (also used as the name of the local index directory).
+            index_path (str): The directory that contains the local indexes.
+
+        Raises:
+            ValueError: Is thrown if the engine is not supported.
+            FileNotFoundError: Is thrown if the local index of the engine was not built.
+
+        Returns:
+            VectorSearchService: The vector search service.
+        """
+        Helper.ensure_type(engine, str, "engine must be a str!")
+        Helper.ensure_type(index_name, str, "index_name must be a str!")
+        Helper.ensure_type(index_path, str, "index_path must be a str!")
+        engine = engine.strip().lower()
+
+        if engine == "" or engine == "atlas":
+            return AtlasVectorSearchService(chunks_service, index_name, int(os.getenv("ATLAS_CANDIDATES_FACTOR", "10")))
+
+        if engine not in VectorSearchServiceFactory.ENGINES:
+            raise ValueError("Unsupported vector search engine: " + engine + "!")
+
+        directory = os.path.join(index_path, index_name)
+
+        if engine == "hnsw" and HNSWVectorSearchService.exists(directory):
+            try:
+                return HNSWVectorSearchService(directory, int(os.getenv("HNSW_EF_SEARCH", "64")))
+            except FileNotFoundError:
+                # the graph was built for another store, the exact search below stays correct
+                pass
+
+        if ChunkVectorStore.exists(directory):
+            return BruteForceVectorSearchService(directory)
+
+        raise FileNotFoundError("No " + engine + " index found in " + directory + "! Run python build_indexes.py --engine " + engine + ".")
+
+    @staticmethod
+    def index_exists(engine: str, directory: str) -> bool:
+        """Checks whether the local index of the engine exists.
+
+        Args:
+            engine (str): The name of the engine (hnsw or bruteforce).
+            directory (str): The directory of the index.
+
+        Returns:
+            bool: Boolean indicating whether the index exists.
+        """
+        if engine == "hnsw":
+            return HNSWVectorSearchService.exists(directory)
+        return ChunkVectorStore.exists(directory)
+
+    @staticmethod
+    def build_index(engine: str, chunks_service: MongoDBService, directory: str):
+        """Builds (or rebuilds) the local index of the engine from the chunk collection.
+
+        Args:
+            engine (str): The name of the engine (hnsw or bruteforce).
+            chunks_service (MongoDBService): The service that communicates with the chunk collection.
+            directory (str): The directory of the index.
+        """
+        chunks = chunks_service.get_chunks({})
+
+        if engine == "hnsw":
+            HNSWVectorSearchService.build(chunks, directory)
+        else:
+            ChunkVectorStore.export(chunks, directory)
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The backend imports its modules relative to the project directory (e.g. services.bm25indexservice).
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,59 @@
+import pytest
+from services.basicenglishpreprocessingservice import BasicEnglishPreprocessingService
+from services.bm25indexservice import BM25IndexService
+
+ABSTRACTS = {
+    "phrase": "Air quality in care homes is measured daily",
+    "scattered": "Homes with care, care and air",
+    "partial": "Air quality of cities",
+    "repeated": "Air quality air quality air quality reports",
+    "unrelated": "Neural networks for graph classification",
+}
+
+
+@pytest.fixture
+def index() -> BM25IndexService:
+    index = BM25IndexService(BasicEnglishPreprocessingService(["in", "is", "of", "for", "with", "and", "the"]))
+    index.build([{"id": key, "abstract": value} for key, value in ABSTRACTS.items()], "abstract")
+    return index
+
+
+def get_ids(results: list[tuple]) -> list[str]:
+    return [el[0] for el in results]
+
+
+def test_only_papers_containing_all_terms_match(index):
+    assert sorted(get_ids(index.search("care homes air", 10))) == ["phrase", "scattered"]
+
+
+def test_phrase_matches_come_before_higher_scored_scattered_matches(index):
+    results = index.search("care homes", 10)
+
+    assert get_ids(results) == ["phrase", "scattered"]
+    assert results[0][1] < results[1][1]
+
+
+def test_term_frequency_ranks_within_phrase_matches(index):
+    assert get_ids(index.search("air quality", 10))[0] == "repeated"
+
+
+def test_missing_term_returns_no_results(index):
+    assert index.search("air pollution", 10) == []
+
+
+def test_stopword_only_query_returns_no_results(index):
+    assert index.search("the of", 10) == []
+
+
+def test_amount_limits_the_results(index):
+    assert len(index.search("air quality", 2)) == 2
+    assert index.search("air quality", 0) == []
+
+
+def test_save_and_load_keep_the_ranking(index, tmp_path):
+    path = str(tmp_path / "AbstractLexicalIndex.json")
+    index.save(path)
+    loaded = BM25IndexService(index.preprocessing_service)
+    loaded.load(path)
+
+    assert loaded.search("care homes", 10) == index.search("care homes", 10)
@@ -0,0 +1,62 @@
+import os
+import numpy as np
+import pytest
+from services.bruteforcevectorsearchservice import BruteForceVectorSearchService
+from services.chunkvectorstore import ChunkVectorStore
+from services.hnswvectorsearchservice import HNSWVectorSearchService
+
+
+def create_chunks(count: int, dimensions: int = 8, seed: int = 1) -> list[dict]:
+    vectors = np.random.default_rng(seed).normal(size=(count, dimensions))
+    return [{"paperId": "paper-" + str(i // 2), "chunk": "chunk " + str(i), "chunkVector": vectors[i].tolist()} for i in range(count)]
+
+
+@pytest.mark.parametrize("k", [1, 3, 10, 50])
+def test_top_k_matches_a_full_sort(k):
+    scores = np.random.default_rng(2).normal(size=(4, 10)).astype(np.float32)
+    indices = BruteForceVectorSearchService.top_k(scores, k)
+
+    assert indices.shape == (4, min(k, 10))
+    assert (indices == np.argsort(-scores, axis=1)[:, :k]).all()
+
+
+def test_search_returns_the_exact_neighbours(tmp_path):
+    chunks = create_chunks(20)
+    ChunkVectorStore.export(chunks, str(tmp_path / "index"))
+    service = BruteForceVectorSearchService(str(tmp_path / "index"))
+    query = chunks[7]["chunkVector"]
+
+    results = service.search(query, 3)
+
+    assert results[0]["chunk"] == "chunk 7"
+    assert results[0]["paperId"] == "paper-3"
+    assert results[0]["score"] == pytest.approx(1.0, abs=1e-5)
+    assert [el["score"] for el in results] == sorted([el["score"] for el in results], reverse=True)
+
+
+def test_search_batch_matches_single_searches(tmp_path):
+    chunks = create_chunks(20)
+    ChunkVectorStore.export(chunks, str(tmp_path / "index"))
+    service = BruteForceVectorSearchService(str(tmp_path / "index"))
+    queries = [chunks[1]["chunkVector"], chunks[12]["chunkVector"]]
+
+    batch = service.search_batch(queries, 4)
+
+    for results, query in zip(batch, queries):
+        single = service.search(query, 4)
+        assert [el["chunk"] for el in results] == [el["chunk"] for el in single]
+        assert [el["score"] for el in results] == pytest.approx([el["score"] for el in single], abs=1e-5)
+
+    assert service.search_batch(queries, 0) == [[], []]
+
+
+def test_export_replaces_an_hnsw_index_built_before(tmp_path):
+    directory = str(tmp_path / "index")
+    HNSWVectorSearchService.build(create_chunks(20), directory, threads=1)
+    assert HNSWVectorSearchService.exists(directory)
+
+    ChunkVectorStore.export(create_chunks(6, seed=3), directory)
+
+    assert not HNSWVectorSearchService.exists(directory)
+    assert len(ChunkVectorStore(directory)) == 6
+    assert sorted(os.listdir(tmp_path)) == ["index"]
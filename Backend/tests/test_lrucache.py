@@ -0,0 +1,65 @@
+import time
+import pytest
+from services.lrucache import LRUCache
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = LRUCache(2, 0)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert cache.get("a") == (True, 1)
+    assert cache.get("b") == (False, None)
+    assert cache.get("c") == (True, 3)
+    assert cache.get_statistics() == {"size": 2, "maxSize": 2, "hits": 3, "misses": 1, "evictions": 1}
+
+
+def test_expired_entries_are_misses(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    cache = LRUCache(10, 5)
+    cache.put("a", 1)
+
+    now[0] = 104.9
+    assert cache.get("a") == (True, 1)
+
+    now[0] = 105.0
+    assert cache.get("a") == (False, None)
+    assert len(cache) == 0
+    assert cache.evictions == 1
+
+
+def test_zero_ttl_never_expires(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    cache = LRUCache(10, 0)
+    cache.put("a", 1)
+    now[0] = 1e9
+
+    assert cache.get("a") == (True, 1)
+
+
+def test_zero_size_disables_the_cache():
+    cache = LRUCache(0, 0)
+    cache.put("a", 1)
+
+    assert cache.get("a") == (False, None)
+    assert len(cache) == 0
+
+
+def test_clear_keeps_the_counters():
+    cache = LRUCache(10, 0)
+    cache.put("a", 1)
+    cache.get("a")
+    cache.clear()
+
+    assert len(cache) == 0
+    assert cache.hits == 1
+
+
+@pytest.mark.parametrize("max_size, ttl_seconds", [(-1, 0), (1, -1)])
+def test_negative_arguments_are_rejected(max_size, ttl_seconds):
+    with pytest.raises(ValueError):
+        LRUCache(max_size, ttl_seconds)
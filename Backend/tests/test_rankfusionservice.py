@@ -0,0 +1,30 @@
+import pytest
+from services.rankfusionservice import RankFusionService
+
+
+def test_items_ranked_high_by_both_rankings_come_first():
+    fused = RankFusionService(60).fuse([["a", "b", "c"], ["b", "c", "d"]], 10)
+
+    assert [el[0] for el in fused] == ["b", "c", "a", "d"]
+    assert fused[0][1] == pytest.approx(1 / 62 + 1 / 61)
+
+
+def test_duplicates_only_count_at_their_best_rank():
+    fused = dict(RankFusionService(0).fuse([["a", "a", "b"]], 10))
+
+    assert fused == {"a": pytest.approx(1.0), "b": pytest.approx(0.5)}
+
+
+def test_ties_keep_the_order_of_the_first_appearance():
+    fused = RankFusionService().fuse([["a", "b"], ["b", "a"]], 10)
+
+    assert [el[0] for el in fused] == ["a", "b"]
+
+
+def test_amount_limits_the_fused_ranking():
+    assert len(RankFusionService().fuse([["a", "b", "c"], []], 2)) == 2
+
+
+def test_negative_k_is_rejected():
+    with pytest.raises(ValueError):
+        RankFusionService(-1)
@@ -0,0 +1,66 @@
+import pytest
+from services.trigramindexservice import TrigramIndexService
+
+TITLES = {
+    "labour": "Labour energy quality energy",
+    "neural": "Neural networks for graph classification",
+    "general": "General theory of unrelated quarks",
+    "air": "Air quality in care homes",
+}
+
+
+@pytest.fixture
+def index() -> TrigramIndexService:
+    index = TrigramIndexService()
+    index.build([{"id": key, "title": value} for key, value in TITLES.items()], "title")
+    return index
+
+
+def get_ids(results: list[tuple]) -> list[str]:
+    return [el[0] for el in results]
+
+
+def test_substring_matches_come_first_with_full_similarity(index):
+    results = index.search("graph class", 10)
+
+    assert results[0] == ("neural", 1.0)
+
+
+def test_substring_matches_are_ordered_by_occurrences(index):
+    assert get_ids(index.search("energy", 10))[0] == "labour"
+
+
+def test_short_queries_match_whole_words(index):
+    assert get_ids(index.search("in", 10))[0] == "air"
+    assert "neural" not in get_ids(index.search("in", 10))
+
+
+@pytest.mark.parametrize("query", ["nerual", "nueral", "netwroks", "neural netwroks"])
+def test_typos_find_the_title_with_the_similar_word(index, query):
+    results = index.search(query, 10)
+
+    assert get_ids(results)[0] == "neural"
+    assert 0 < results[0][1] < 1
+
+
+def test_long_titles_are_not_favoured(index):
+    assert "labour" not in get_ids(index.search("nerual", 10))
+
+
+def test_no_match(index):
+    assert index.search("xyzzy", 10) == []
+    assert index.search("   ", 10) == []
+
+
+def test_amount_limits_the_results(index):
+    assert len(index.search("quality", 1)) == 1
+    assert index.search("quality", 0) == []
+
+
+def test_save_and_load_round_trip(index, tmp_path):
+    path = str(tmp_path / "TitleLexicalIndex.json")
+    index.save(path)
+    loaded = TrigramIndexService()
+    loaded.load(path)
+
+    assert loaded.search("netwroks", 10) == index.search("netwroks", 10)
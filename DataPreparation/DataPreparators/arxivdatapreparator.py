@@ -31,7 +31,7 @@ class ArxivDataPreparator(DataPreparator):
             dict: The result of data preparation.
             Format: {"arxivPapers": [
                {"id": <paper-id>, "publicationDate": <publication-date>, "title": <paper-title>, "abstract": <paper-abstract>,
-                 "authors": [{"fullName": <author-name>}, ...]},
+                 "authors": [{"fullName": <author-name>}, ...], "source": "arxiv"},
                  ...
             ]}
         """
@@ -49,6 +49,7 @@ class ArxivDataPreparator(DataPreparator):
         result_list = self.__remove_duplicate_ids(result_list)
 
         for el in result_list:
+            el["source"] = "arxiv"
             if el["publicationDate"] is None:
                 continue
             dt = datetime.datetime.strptime(el["publicationDate"], "%Y-%m-%dT%H:%M:%SZ")
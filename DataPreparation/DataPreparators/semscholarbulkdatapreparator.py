@@ -32,7 +32,7 @@ class SemanticScholarBulkDataPreparator(DataPreparator):
             dict: The result of data preparation.
             Format: {"semanticScholarPapers": [
                {"id": <paper-id>, "publicationDate": <publication-date>, "title": <paper-title>, "abstract": <paper-abstract>,
-                 "authors": [{"fullName": <author-name>}, ...]},
+                 "authors": [{"fullName": <author-name>}, ...], "source": "semanticscholar"},
                  ...
             ]}
         """
@@ -50,6 +50,7 @@ class SemanticScholarBulkDataPreparator(DataPreparator):
         result_list = self.__remove_duplicate_ids(result_list)
 
         for el in result_list:
+            el["source"] = "semanticscholar"
             if el["publicationDate"] is None:
                 continue
             el["publicationDate"] = datetime.datetime.strptime(el["publicationDate"], "%Y-%m-%d")
@@ -3,6 +3,7 @@ from ETLPipelines.pipeline import ETLPipeline
 from APIHandlers.arxivapihandler import ArxivAPIHandler
 from DataPreparators.arxivdatapreparator import ArxivDataPreparator
 from Services.papersservice import PapersService
+from Services.corpusversionservice import CorpusVersionService
 from dotenv import load_dotenv
 
 class ArxivToMongoDBPipeline(ETLPipeline):
@@ -43,9 +44,11 @@ class ArxivToMongoDBPipeline(ETLPipeline):
 
     def load(self):
         """Loads the transformed papers to a MongoDB cluster.
+        Bumps the version stamp of the corpus afterwards.
         """
         load_dotenv()
         url = os.getenv("MONGODB_URL")
         db_service = PapersService(url)
         db_service.insert_papers(self.prepared_data["arxivPapers"])
+        CorpusVersionService(url).bump_version("papers")
         
\ No newline at end of file
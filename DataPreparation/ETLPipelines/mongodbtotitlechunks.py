@@ -1,83 +1,334 @@
 from Services.preprocessingservice import PreprocessingService
 from Services.embeddingservice import EmbeddingService
-from ETLPipelines.pipeline import ETLPipeline
+from ETLPipelines.streamingpipeline import StreamingETLPipeline
 import os
+import datetime
+import hashlib
+from typing import Iterator
 import nltk
 from dotenv import load_dotenv
 from Services.titlechunksservice import TitleChunksService
 from Services.papersservice import PapersService
 from Services.helper import Helper
+from Services.corpusversionservice import CorpusVersionService
+from Services.chunkindexstateservice import ChunkIndexStateService
 
-class MongoDBPapersToTitleChunksPipeline(ETLPipeline):
+class MongoDBPapersToTitleChunksPipeline(StreamingETLPipeline):
     """Represents a pipeline that fetches papers from MongoDB
     and creates vector embeddings for the chunks of the papers' titles.
     Afterwards, the data is loaded into a new collection.
+    The papers can also be streamed in batches (see execute_streaming), so that the memory does not grow with the corpus.
+    In incremental mode, only papers that are new or whose title or filter fields changed since the last run are chunked and embedded
+    (judged by the watermark of the collection and the content hash stored per paper); their old chunks
+    and the chunks of deleted papers (tombstones written by PapersService.delete_papers) are removed and the new chunks are upserted.
     Args:
-        ETLPipeline (_type_): The abstract base class.
+        StreamingETLPipeline (_type_): The abstract base class.
     """
-    def __init__(self, embedding_service: EmbeddingService, preprocessing_service: PreprocessingService, batch_size: int, nltk_path: str):
+    def __init__(self, embedding_service: EmbeddingService, preprocessing_service: PreprocessingService, batch_size: int, nltk_path: str,
+                 embedding_batch_size: int = 64, extract_batch_size: int = 256, incremental: bool = False, reconcile_deletions: bool = False):
         """Initializes a new instance of MongoDBPapersToTitleChunksPipeline.
 
         Args:
-            embedding_service (EmbeddingService): The embedding service used to generate vectors.
+            embedding_service (EmbeddingService): The embedding service used to generate vectors
+            (an EmbeddingPoolService embeds the chunks in worker processes on all CPU cores).
             preprocessing_service (PreprocessingService): The preprocessing service used to preprocess the title chunks.
             batch_size (int): The batch size used to load the preprocessed and embedded title chunks into a new collection.
             nltk_path (str): The path to the nltk library.
+            embedding_batch_size (int, optional): The amount of chunks embedded per inference batch. Defaults to 64.
+            extract_batch_size (int, optional): The amount of papers per batch in streaming mode. Defaults to 256.
+            incremental (bool, optional): Boolean indicating whether only new and changed papers are processed by execute. Defaults to False.
+            reconcile_deletions (bool, optional): Boolean indicating whether an incremental run also compares all paper IDs of the chunks
+            with the ones of the papers (a full scan of both collections) to find papers deleted without a tombstone. Defaults to False.
         """
         self.embedding_service = embedding_service
         self.preprocessing_service = preprocessing_service
         self.batch_size = batch_size
+        self.embedding_batch_size = embedding_batch_size
+        self.extract_batch_size = extract_batch_size
+        self.incremental = incremental
+        self.reconcile_deletions = reconcile_deletions
+        self.stale_paper_ids = []
+        self.deleted_paper_ids = []
+        self.content_hashes = {}
+        self.__started_at = None
         nltk.data.path.append(nltk_path)
 
     def extract(self):
         """Extracts the papers from MongoDB.
+        In incremental mode, only the papers updated since the watermark are fetched, and of these only the ones
+        whose content hash differs from the one they were last chunked from are kept.
+        Papers inserted before updatedAt was stamped are stamped once, so that they are fetched by a single run.
+        The IDs of the papers whose chunks have to be removed are stored in stale_paper_ids.
         """
         load_dotenv()
         url = os.getenv("MONGODB_URL")
         db_service = PapersService(url)
-        papers = db_service.get_papers({})
-        self.extracted_papers = papers
+        self.__started_at = datetime.datetime.now(datetime.timezone.utc)
+
+        if not self.incremental:
+            papers = db_service.get_papers({})
+            self.extracted_papers = papers
+            return
+
+        state_service = ChunkIndexStateService(url)
+
+        if not state_service.get_state("titleChunks").get("papersStamped", False):
+            # one millisecond before the new watermark, so that the stamped papers are only fetched by this run
+            stamped_papers = db_service.stamp_unstamped_papers(self.__started_at - datetime.timedelta(milliseconds=1))
+            state_service.update_state("titleChunks", {"papersStamped": True})
+            print("Stamped papers: " + str(stamped_papers))
+
+        watermark = state_service.get_watermark("titleChunks")
+        papers = db_service.get_papers({} if watermark is None else {"updatedAt": {"$gte": watermark}})
+        stored_content_hashes = self.__get_stored_content_hashes(url, [el["id"] for el in papers])
+        self.content_hashes = {el["id"]: self.__get_content_hash(el) for el in papers}
+        self.extracted_papers = [el for el in papers if stored_content_hashes.get(el["id"]) != self.content_hashes[el["id"]]]
+        self.content_hashes = {el["id"]: self.content_hashes[el["id"]] for el in self.extracted_papers}
+        self.deleted_paper_ids = self.__get_deleted_paper_ids(url, watermark)
+        self.stale_paper_ids = [el["id"] for el in self.extracted_papers] + self.deleted_paper_ids
+        print("Papers to chunk: " + str(len(self.extracted_papers)) + ", deleted papers: " + str(len(self.deleted_paper_ids)))
 
     def transform(self):
         """Splits the papers' titles into smaller chunks.
         The chunks are sentences (English is supported).
+        Copies the filter fields of the paper (publication date, source and author names) onto every chunk.
         Preprocesses the chunks.
         Removes duplicate chunks from the preprocessing result.
         Creates embeddings for the chunks.
         """
-        papers = self.extracted_papers
-        id_to_title_chunks = [{"id": el["id"], "chunks": nltk.sent_tokenize(el["title"], language="english")} for el in papers]
-        id_to_title_chunks = self.__preprocess_chunks(id_to_title_chunks)
-        id_to_title_chunks_embedded = self.__generate_chunk_embeddings(id_to_title_chunks)
-        self.data_to_insert = self.__explode_chunk_embeddings(id_to_title_chunks_embedded)
-        self.data_to_insert = Helper.remove_duplicate_entries(self.data_to_insert, "chunk")
+        self.data_to_insert = Helper.remove_duplicate_entries(self.__transform_papers(self.extracted_papers), "chunk")
 
     def load(self):
-        """Loads the preprocessed chunks to a new MongoDB collection.
-        Creates a search index for the embedding vectors (specified by the collection's attribute of the vector).
+        """Loads the preprocessed chunks to a new MongoDB collection
+        (in incremental mode, the chunks of the stale papers are deleted, the new chunks are upserted
+        and the content hashes of all processed papers are stored, also of the papers without chunks).
+        Bumps the version stamp of the corpus.
+        Creates a vector search index for the embedding vectors (specified by the collection's attribute of the vector)
+        with the publication date, the source and the author names as filter fields.
+        """
+        load_dotenv()
+        url = os.getenv("MONGODB_URL")
+        db_service = TitleChunksService(url)
+
+        if self.incremental:
+            for i in range(0, len(self.stale_paper_ids), self.batch_size):
+                db_service.delete_chunks({"paperId": {"$in": self.stale_paper_ids[i:i + self.batch_size]}})
+
+            db_service.upsert_chunks_in_batch(self.data_to_insert, self.batch_size)
+            state_service = ChunkIndexStateService(url)
+            state_service.set_content_hashes("titleChunks", self.content_hashes, self.batch_size)
+
+            for i in range(0, len(self.deleted_paper_ids), self.batch_size):
+                state_service.delete_content_hashes("titleChunks", self.deleted_paper_ids[i:i + self.batch_size])
+        else:
+            db_service.insert_chunks_in_batch(self.data_to_insert, self.batch_size)
+
+        self.finish_loading()
+
+    def extract_batches(self) -> Iterator[list]:
+        """Extracts the papers from MongoDB in batches of extract_batch_size papers.
+
+        Raises:
+            ValueError: Is thrown if the pipeline is incremental (the incremental mode is supported by execute).
+
+        Returns:
+            Iterator[list]: The batches of papers.
+        """
+        if self.incremental:
+            raise ValueError("The incremental mode is not supported in streaming mode!")
+
+        load_dotenv()
+        url = os.getenv("MONGODB_URL")
+        self.__started_at = datetime.datetime.now(datetime.timezone.utc)
+        return PapersService(url).get_papers_in_batches({}, self.extract_batch_size)
+
+    def transform_batch(self, batch: list) -> list:
+        """Transforms a batch of papers into their preprocessed and embedded chunks (see transform).
+        Duplicate chunks are removed within the batch. Every chunk gets the hash of its text as _id,
+        so that the duplicates of chunks loaded by an earlier batch are skipped by the collection (see load_batch)
+        and no state grows with the corpus.
+
+        Args:
+            batch (list): The papers.
+
+        Returns:
+            list: The chunks.
+        """
+        result = []
+        batch_chunks = set()
+
+        for el in self.__transform_papers(batch):
+            el["_id"] = hashlib.blake2b(el["chunk"].encode("utf-8"), digest_size=16).hexdigest()
+
+            if el["_id"] not in batch_chunks:
+                batch_chunks.add(el["_id"])
+                result.append(el)
+
+        return result
+
+    def load_batch(self, batch: list):
+        """Loads a batch of chunks to the MongoDB collection (chunks whose _id is already stored are skipped).
+
+        Args:
+            batch (list): The chunks.
+        """
+        if len(batch) == 0:
+            return
+
+        load_dotenv()
+        TitleChunksService(os.getenv("MONGODB_URL")).insert_chunks_in_batch(batch, self.batch_size, True)
+
+    def finish_loading(self):
+        """Copies the filter fields onto the chunks created before the fields existed (once per collection),
+        bumps the version stamp of the corpus (unless an incremental run and the backfill changed nothing)
+        and moves the watermark of the collection to the start of the run.
+        Creates a vector search index for the embedding vectors (specified by the collection's attribute of the vector)
+        with the publication date, the source and the author names as filter fields, or migrates an existing index
+        with another definition (e.g. the former Atlas Search index without filter fields) to it.
         """
         load_dotenv()
         url = os.getenv("MONGODB_URL")
         db_service = TitleChunksService(url)
-        db_service.insert_chunks_in_batch(self.data_to_insert, self.batch_size)
-        db_service.create_search_index({
+        backfilled_chunks = self.__backfill_filter_metadata(url)
+
+        if not self.incremental or len(self.stale_paper_ids) > 0 or backfilled_chunks > 0:
+            CorpusVersionService(url).bump_version("titleChunks")
+
+        if self.__started_at is not None:
+            ChunkIndexStateService(url).set_watermark("titleChunks", self.__started_at)
+
+        result = db_service.ensure_search_index({
             "definition": {
-                "mappings":{
-                    "dynamic": True,
-                    "fields": {
-                        "chunkVector": {
-                            "dimensions": 384,
-                            "similarity": "cosine",
-                            "type": "knnVector",
-                        }
-                    }
-                }
+                "fields": [
+                    {
+                        "type": "vector",
+                        "path": "chunkVector",
+                        "numDimensions": 384,
+                        "similarity": "cosine"
+                    },
+                    {"type": "filter", "path": "publicationDate"},
+                    {"type": "filter", "path": "source"},
+                    {"type": "filter", "path": "authorNames"}
+                ]
             },
-            "name": "TitleSearchIndex"
+            "name": "TitleSearchIndex",
+            "type": "vectorSearch"
         })
+        print("TitleSearchIndex: " + result)
+
+    def __backfill_filter_metadata(self, url: str) -> int:
+        """Copies the filter fields of the papers (see __get_filter_metadata) onto the chunks that were created before the fields existed,
+        so that filtered searches do not exclude them. Runs once per collection (recorded in the state of the collection),
+        because all later chunks are created with the fields.
+
+        Args:
+            url (str): The URL of the MongoDB cluster.
+
+        Returns:
+            int: The amount of updated chunks.
+        """
+        state_service = ChunkIndexStateService(url)
+
+        if state_service.get_state("titleChunks").get("filterFieldsBackfilled", False):
+            return 0
+
+        chunks_service = TitleChunksService(url)
+        papers_service = PapersService(url)
+        paper_ids = chunks_service.get_paper_ids({"authorNames": {"$exists": False}})
+        updated_chunks = 0
+
+        for i in range(0, len(paper_ids), self.batch_size):
+            papers = papers_service.get_papers({"id": {"$in": paper_ids[i:i + self.batch_size]}})
+            updates = [({"paperId": el["id"], "authorNames": {"$exists": False}}, {"$set": self.__get_filter_metadata(el)}) for el in papers]
+            updated_chunks += chunks_service.update_chunks_in_batch(updates, self.batch_size)
+
+        state_service.update_state("titleChunks", {"filterFieldsBackfilled": True})
+        print("Chunks with backfilled filter fields: " + str(updated_chunks))
+        return updated_chunks
+
+    def __get_stored_content_hashes(self, url: str, paper_ids: list[str]) -> dict:
+        """Fetches the content hashes the papers were last chunked from (in batches of batch_size papers).
+        Falls back to the content hashes on the chunks for papers chunked before the hashes were stored per paper.
+
+        Args:
+            url (str): The URL of the MongoDB cluster.
+            paper_ids (list[str]): The IDs of the papers.
+
+        Returns:
+            dict: Dictionary format: {<paper-id>: <content-hash>, ...} (papers that were never chunked are missing).
+        """
+        state_service = ChunkIndexStateService(url)
+        chunks_service = TitleChunksService(url)
+        result = {}
+
+        for i in range(0, len(paper_ids), self.batch_size):
+            batch = paper_ids[i:i + self.batch_size]
+            content_hashes = state_service.get_content_hashes("titleChunks", batch)
+            missing_paper_ids = [el for el in batch if el not in content_hashes]
+
+            if len(missing_paper_ids) > 0:
+                content_hashes.update(chunks_service.get_content_hashes(missing_paper_ids))
+
+            result.update(content_hashes)
+
+        return result
+
+    def __get_deleted_paper_ids(self, url: str, watermark: datetime.datetime) -> list[str]:
+        """Gets the IDs of the papers whose chunks have to be removed because the papers were deleted:
+        the papers with a tombstone since the watermark that were not inserted again
+        (and, if reconcile_deletions is set, the papers that have chunks but no longer exist).
+
+        Args:
+            url (str): The URL of the MongoDB cluster.
+            watermark (datetime.datetime): The watermark of the collection (None if there was no incremental run yet).
+
+        Returns:
+            list[str]: The IDs of the papers.
+        """
+        papers_service = PapersService(url)
+        deleted_paper_ids = set(papers_service.get_deleted_paper_ids(watermark))
+
+        if self.reconcile_deletions:
+            deleted_paper_ids.update(TitleChunksService(url).get_paper_ids())
+
+        deleted_paper_ids = list(deleted_paper_ids)
+        result = []
+
+        for i in range(0, len(deleted_paper_ids), self.batch_size):
+            batch = deleted_paper_ids[i:i + self.batch_size]
+            existing_paper_ids = set(papers_service.get_paper_ids({"id": {"$in": batch}}))
+            result += [el for el in batch if el not in existing_paper_ids]
+
+        return result
+
+    def __transform_papers(self, papers: list[dict]) -> list[dict]:
+        """Splits the titles of the papers into chunks, preprocesses and embeds the chunks
+        and copies the filter fields of the papers onto them.
+
+        Args:
+            papers (list[dict]): The papers.
+
+        Returns:
+            list[dict]: The chunks (duplicates are not removed).
+            Format:  [{"paperId": <paper-id>, "chunk": <chunk>, "chunkVector": <embedding-vector>,
+            "publicationDate": <publication-date>, "source": <source>, "authorNames": [<author-name>, ...],
+            "contentHash": <content-hash-of-the-paper>}, ...] (with "_id": "<paper-id>:<chunk-index>" in incremental mode).
+        """
+        id_to_title_chunks = [{"id": el["id"], "chunks": nltk.sent_tokenize(el["title"], language="english"),
+                                 "metadata": self.__get_filter_metadata(el)} for el in papers]
+        id_to_title_chunks = self.__preprocess_chunks(id_to_title_chunks)
+        id_to_title_chunks_embedded = self.__generate_chunk_embeddings(id_to_title_chunks)
+        result = self.__explode_chunk_embeddings(id_to_title_chunks_embedded)
+        content_hashes = {el["id"]: self.__get_content_hash(el) for el in papers}
+
+        for el in result:
+            el["contentHash"] = content_hashes[el["paperId"]]
+
+        return result
 
     def __generate_chunk_embeddings(self, id_to_sentences_dict: list[dict]) -> list[dict]:
         """Generates vector embeddings for the chunks.
+        The chunks of all papers are embedded together in batches of embedding_batch_size chunks.
 
         Args:
             id_to_sentences_dict (list[dict]): A list of dictionaries.
@@ -85,12 +336,16 @@ class MongoDBPapersToTitleChunksPipeline(ETLPipeline):
         Returns:
             list[dict]: A list of dictionaries.
             Format: [{"id": <paper-id>, "chunks": ["chunk1", ...], "preprocessed": ["preprocessed1", ...], 
-            "embedded": ["embedded1", ...]}, ...].
+            "embedded": <float32-matrix>}, ...] (one row per chunk).
         """
         result = id_to_sentences_dict
+        chunks = [chunk for el in result for chunk in el["preprocessed"]]
+        embedded = self.embedding_service.create_embeddings(chunks, self.embedding_batch_size)
+        start = 0
 
         for el in result:
-            el["embedded"] = [self.embedding_service.create_embedding(chunk) for chunk in el["preprocessed"]]
+            el["embedded"] = embedded[start:start + len(el["preprocessed"])]
+            start += len(el["preprocessed"])
 
         return result
     
@@ -118,20 +373,46 @@ class MongoDBPapersToTitleChunksPipeline(ETLPipeline):
         Args:
             id_to_title_chunks_embeddings (list[dict]): A list of dictionaries.
             Format: [{"id": <paper-id>, "chunks": ["chunk1", ...], "preprocessed": ["preprocessed1", ...], 
-            "embedded": ["embedded1", ...]}, ...].
+            "embedded": <float32-matrix>}, ...].
         Returns:
             list[dict]: A list of dictionaries.
-            Format:  [{"paperId": <paper-id>, "chunk": <chunk>, "chunkVector": <embedding-vector>}, ...].
+            Format:  [{"paperId": <paper-id>, "chunk": <chunk>, "chunkVector": <embedding-vector>,
+            "publicationDate": <publication-date>, "source": <source>, "authorNames": [<author-name>, ...]}, ...].
         """
         result = []
 
         for el in id_to_title_chunks_embeddings:
             for i, chunk in enumerate(el["chunks"]):
-                to_append = {"paperId": el["id"], "chunk": chunk, "chunkVector": [float(e) for e in el["embedded"][i]]}
+                to_append = {"paperId": el["id"], "chunk": chunk, "chunkVector": el["embedded"][i].tolist()}
+
+                if self.incremental:
+                    to_append["_id"] = el["id"] + ":" + str(i)
+
+                to_append.update(el["metadata"])
                 result.append(to_append)
 
         return result
 
+    def __get_filter_metadata(self, paper: dict) -> dict:
+        """Gets the fields of the paper that are denormalized onto its chunks to pre-filter the vector search.
+
+        Args:
+            paper (dict): The paper.
+
+        Returns:
+            dict: Dictionary format: {"publicationDate": <publication-date>, "source": <source>, "authorNames": [<author-name>, ...]}.
+        """
+        return {"publicationDate": paper.get("publicationDate"), "source": paper.get("source"),
+                "authorNames": [el["fullName"] for el in paper.get("authors", [])]}
+
+    def __get_content_hash(self, paper: dict) -> str:
+        """Computes the hash of the content of the paper that its chunks are created from (the title and the filter fields).
 
+        Args:
+            paper (dict): The paper.
 
-        
\ No newline at end of file
+        Returns:
+            str: The hash.
+        """
+        content = repr((paper.get("title"), sorted(self.__get_filter_metadata(paper).items())))
+        return hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
@@ -4,6 +4,7 @@ from ETLPipelines.pipeline import ETLPipeline
 from APIHandlers.semanticscholarapihandler import SemanticScholarBulkAPIHandler
 from DataPreparators.semscholarbulkdatapreparator import SemanticScholarBulkDataPreparator
 from Services.papersservice import PapersService
+from Services.corpusversionservice import CorpusVersionService
 from DataPreparators.semscholarbulkdatapreparator import SemanticScholarBulkDataPreparator
 
 class SemanticScholarToMongoDBPipeline(ETLPipeline):
@@ -44,9 +45,11 @@ class SemanticScholarToMongoDBPipeline(ETLPipeline):
 
     def load(self):
         """Loads the transformed papers to a MongoDB cluster.
+        Bumps the version stamp of the corpus afterwards.
         """
         load_dotenv()
         url = os.getenv("MONGODB_URL")
         db_service = PapersService(url)
         db_service.insert_papers(self.prepared_data["semanticScholarPapers"])
+        CorpusVersionService(url).bump_version("papers")
         
\ No newline at end of file
@@ -0,0 +1,162 @@
+from abc import abstractmethod
+from typing import Iterator
+from ETLPipelines.pipeline import ETLPipeline
+from Services.helper import Helper
+import datetime
+import queue
+import threading
+
+class StreamingETLPipeline(ETLPipeline):
+    """Represents an abstract ETL pipeline that can also stream its data in batches.
+    In streaming mode (execute_streaming), the extraction, the transformation and the loading run concurrently in their own threads
+    and pass batches through bounded queues. A stage waits while the queue to the next stage is full (backpressure),
+    so that only a few batches are held in memory at any time, regardless of the size of the data.
+
+    Args:
+        ETLPipeline (_type_): The abstract base class.
+    """
+    __END = object()
+
+    @abstractmethod
+    def extract_batches(self) -> Iterator[list]:
+        """Extracts the data in batches.
+
+        Returns:
+            Iterator[list]: The batches.
+        """
+        pass
+
+    @abstractmethod
+    def transform_batch(self, batch: list) -> list:
+        """Transforms a batch of extracted data.
+
+        Args:
+            batch (list): The extracted batch.
+
+        Returns:
+            list: The transformed batch.
+        """
+        pass
+
+    @abstractmethod
+    def load_batch(self, batch: list):
+        """Loads a batch of transformed data.
+
+        Args:
+            batch (list): The transformed batch.
+        """
+        pass
+
+    def finish_loading(self):
+        """Finishes the loading after the last batch was loaded (e.g. bumps version stamps or creates indexes).
+        Does nothing unless overridden.
+        """
+        pass
+
+    def execute_streaming(self, queue_size: int = 2):
+        """Executes the pipeline in streaming mode.
+        Stops all stages and raises the error if a stage fails (finish_loading is not called then).
+
+        Args:
+            queue_size (int, optional): The maximum amount of batches waiting between two stages. Defaults to 2.
+
+        Raises:
+            ValueError: Is thrown if queue_size is not positive.
+        """
+        Helper.ensure_type(queue_size, int, "queue_size must be an int!")
+
+        if queue_size <= 0:
+            raise ValueError("queue_size must be positive!")
+
+        print("Streaming started: " + str(datetime.datetime.now()))
+        extracted = queue.Queue(queue_size)
+        transformed = queue.Queue(queue_size)
+        stop = threading.Event()
+        errors = []
+        threads = [
+            threading.Thread(target=self.__run_stage, args=(lambda: self.extract_batches(), extracted, stop, errors), daemon=True),
+            threading.Thread(target=self.__run_stage, args=(lambda: (self.transform_batch(el) for el in self.__get_batches(extracted, stop)),
+                                                            transformed, stop, errors), daemon=True)
+        ]
+        loaded_batches = 0
+
+        for thread in threads:
+            thread.start()
+
+        try:
+            for batch in self.__get_batches(transformed, stop):
+                self.load_batch(batch)
+                loaded_batches += 1
+        except Exception as e:
+            errors.append(e)
+            stop.set()
+
+        for thread in threads:
+            thread.join()
+
+        if len(errors) > 0:
+            raise errors[0]
+
+        self.finish_loading()
+        print("Streaming ended: " + str(datetime.datetime.now()) + " (" + str(loaded_batches) + " batches loaded)")
+
+    def __run_stage(self, create_batches, target: queue.Queue, stop: threading.Event, errors: list):
+        """Runs a stage in its thread: puts every batch it creates into the queue of the next stage, followed by an end marker.
+
+        Args:
+            create_batches (_type_): The function that creates the iterator over the batches of the stage.
+            target (queue.Queue): The queue of the next stage.
+            stop (threading.Event): The event that is set if a stage failed.
+            errors (list): The errors of the stages.
+        """
+        try:
+            for batch in create_batches():
+                if not self.__put(target, batch, stop):
+                    return
+        except Exception as e:
+            errors.append(e)
+            stop.set()
+            return
+
+        self.__put(target, StreamingETLPipeline.__END, stop)
+
+    def __put(self, target: queue.Queue, item, stop: threading.Event) -> bool:
+        """Puts an item into a queue and waits while the queue is full.
+
+        Args:
+            target (queue.Queue): The queue.
+            item (_type_): The item.
+            stop (threading.Event): The event that is set if a stage failed.
+
+        Returns:
+            bool: Boolean indicating whether the item was put (False if a stage failed while waiting).
+        """
+        while not stop.is_set():
+            try:
+                target.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+
+        return False
+
+    def __get_batches(self, source: queue.Queue, stop: threading.Event) -> Iterator[list]:
+        """Gets the batches of a queue until the end marker arrives or a stage failed.
+
+        Args:
+            source (queue.Queue): The queue.
+            stop (threading.Event): The event that is set if a stage failed.
+
+        Returns:
+            Iterator[list]: The batches.
+        """
+        while not stop.is_set():
+            try:
+                batch = source.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+            if batch is StreamingETLPipeline.__END:
+                return
+
+            yield batch
@@ -0,0 +1,116 @@
+import datetime
+from Services.mongodbservice import MongoDBService
+from Services.helper import Helper
+
+class ChunkIndexStateService(MongoDBService):
+    """Represents a service that deals with data from MongoDB.
+    It communicates with a collection that stores the state of every chunk collection (abstractChunks and titleChunks),
+    e.g. the watermark: the start time of the last run of the chunk pipeline. Papers updated before the watermark were already chunked and embedded.
+    The content hash every paper was last chunked from is stored per chunk collection in the collection chunkIndexPaperState
+    (also for papers without chunks).
+
+    Args:
+        MongoDBService (_type_): Service that communicates with MongoDB database.
+    """
+    def __init__(self, url):
+        """Initializes a new instance of ChunkIndexStateService.
+
+        Args:
+            url (str): The URL of the MongoDB cluster.
+        """
+        MongoDBService.__init__(self, url)
+
+    def get_watermark(self, collection_name: str) -> datetime.datetime:
+        """Fetches the watermark of a chunk collection.
+
+        Args:
+            collection_name (str): The name of the chunk collection (abstractChunks or titleChunks).
+
+        Returns:
+            datetime.datetime: The watermark or None if the collection was never indexed.
+        """
+        Helper.ensure_type(collection_name, str, "collection_name must be a string!")
+        result = self.get_data("papersDB", "chunkIndexState", {"_id": collection_name})
+        return result[0].get("watermark") if len(result) > 0 else None
+
+    def set_watermark(self, collection_name: str, watermark: datetime.datetime):
+        """Stores the watermark of a chunk collection.
+
+        Args:
+            collection_name (str): The name of the chunk collection (abstractChunks or titleChunks).
+            watermark (datetime.datetime): The start time of the run of the chunk pipeline.
+        """
+        Helper.ensure_type(collection_name, str, "collection_name must be a string!")
+        Helper.ensure_type(watermark, datetime.datetime, "watermark must be a datetime!")
+
+        self.update_one_data("papersDB", "chunkIndexState", {"_id": collection_name}, {"$set": {"watermark": watermark}}, True)
+
+    def get_state(self, collection_name: str) -> dict:
+        """Fetches the state of a chunk collection.
+
+        Args:
+            collection_name (str): The name of the chunk collection (abstractChunks or titleChunks).
+
+        Returns:
+            dict: The state (empty if the collection was never indexed).
+        """
+        Helper.ensure_type(collection_name, str, "collection_name must be a string!")
+        result = self.get_data("papersDB", "chunkIndexState", {"_id": collection_name})
+        return result[0] if len(result) > 0 else {}
+
+    def update_state(self, collection_name: str, values: dict):
+        """Stores values in the state of a chunk collection (other values are kept).
+
+        Args:
+            collection_name (str): The name of the chunk collection (abstractChunks or titleChunks).
+            values (dict): The values.
+        """
+        Helper.ensure_type(collection_name, str, "collection_name must be a string!")
+        Helper.ensure_type(values, dict, "values must be a dict!")
+
+        self.update_one_data("papersDB", "chunkIndexState", {"_id": collection_name}, {"$set": values}, True)
+
+    def get_content_hashes(self, collection_name: str, paper_ids: list[str]) -> dict:
+        """Fetches the content hashes the papers were last chunked from.
+
+        Args:
+            collection_name (str): The name of the chunk collection (abstractChunks or titleChunks).
+            paper_ids (list[str]): The IDs of the papers.
+
+        Returns:
+            dict: Dictionary format: {<paper-id>: <content-hash>, ...} (papers that were never chunked are missing).
+        """
+        Helper.ensure_type(collection_name, str, "collection_name must be a string!")
+        Helper.ensure_list_of_type(paper_ids, str, "paper_ids must be a list!", "paper_ids must contain elements of type str!")
+        result = self.get_data("papersDB", "chunkIndexPaperState", {"_id": {"$in": [collection_name + ":" + el for el in paper_ids]}},
+                               {"_id": 0, "paperId": 1, "contentHash": 1})
+        return {el["paperId"]: el["contentHash"] for el in result}
+
+    def set_content_hashes(self, collection_name: str, content_hashes: dict, batch_size: int):
+        """Stores the content hashes the papers were chunked from.
+
+        Args:
+            collection_name (str): The name of the chunk collection (abstractChunks or titleChunks).
+            content_hashes (dict): Dictionary format: {<paper-id>: <content-hash>, ...}.
+            batch_size (int): The batch size.
+        """
+        Helper.ensure_type(collection_name, str, "collection_name must be a string!")
+        Helper.ensure_type(content_hashes, dict, "content_hashes must be a dict!")
+        states = [{"_id": collection_name + ":" + paper_id, "collection": collection_name, "paperId": paper_id, "contentHash": content_hash}
+                  for paper_id, content_hash in content_hashes.items()]
+        self.upsert_data_batch("papersDB", "chunkIndexPaperState", states, batch_size)
+
+    def delete_content_hashes(self, collection_name: str, paper_ids: list[str]) -> int:
+        """Removes the content hashes of the papers (e.g. of deleted papers).
+
+        Args:
+            collection_name (str): The name of the chunk collection (abstractChunks or titleChunks).
+            paper_ids (list[str]): The IDs of the papers.
+
+        Returns:
+            int: The amount of removed content hashes.
+        """
+        Helper.ensure_type(collection_name, str, "collection_name must be a string!")
+        Helper.ensure_list_of_type(paper_ids, str, "paper_ids must be a list!", "paper_ids must contain elements of type str!")
+
+        return self.delete_data("papersDB", "chunkIndexPaperState", {"_id": {"$in": [collection_name + ":" + el for el in paper_ids]}})
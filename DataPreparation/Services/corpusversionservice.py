@@ -0,0 +1,32 @@
+import datetime
+from Services.mongodbservice import MongoDBService
+from Services.helper import Helper
+
+class CorpusVersionService(MongoDBService):
+    """Represents a service that deals with data from MongoDB.
+    It communicates with a collection that stores the version stamp of the corpus
+    (papers, abstract chunks and title chunks). The stamp is bumped after every write,
+    so that the backend can invalidate its cached search responses.
+
+    Args:
+        MongoDBService (_type_): Service that communicates with MongoDB database.
+    """
+    def __init__(self, url):
+        """Initializes a new instance of CorpusVersionService.
+
+        Args:
+            url (str): The URL of the MongoDB cluster.
+        """
+        MongoDBService.__init__(self, url)
+
+    def bump_version(self, collection_name: str):
+        """Increments the version stamp of the corpus.
+
+        Args:
+            collection_name (str): The name of the collection that was written (papers, abstractChunks or titleChunks).
+        """
+        Helper.ensure_type(collection_name, str, "collection_name must be a string!")
+
+        self.update_one_data("papersDB", "corpusVersion", {"_id": "corpus"},
+                             {"$inc": {"version": 1}, "$set": {"updatedAt": datetime.datetime.now(datetime.timezone.utc), "lastCollection": collection_name}},
+                             True)
@@ -0,0 +1,234 @@
+import multiprocessing
+import os
+from multiprocessing import shared_memory
+import numpy as np
+from Services.embeddingservice import EmbeddingService
+from Services.embeddingstore import EmbeddingStore
+from Services.helper import Helper
+
+class EmbeddingPoolService(EmbeddingService):
+    """Represents an embedding service that spreads the inference over a pool of worker processes (one per CPU core by default).
+    Every worker loads the sentence transformer once and limits its own inference threads, so that the workers do not compete for the cores.
+    The texts are sorted by length and sent to the workers in shards; the workers write the vectors directly into a shared memory block,
+    so that only the texts (and no vectors) are pickled between the processes.
+    If the path of an embedding store is given, every worker opens the store itself (SQLite in WAL mode allows one connection per process),
+    so that the workers only embed the texts missing in the store and write the new embeddings through to it.
+    The pool is started on first use and has to be closed (close or a with statement).
+
+    Args:
+        EmbeddingService (_type_): The base embedding service.
+    """
+    __worker_embedding_service = None
+    __THREAD_VARIABLES = ["OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"]
+
+    def __init__(self, model_name: str, workers: int = None, threads_per_worker: int = 1, shard_size: int = 512,
+                 store_path: str = None, model_id: str = None, store_max_entries: int = 0):
+        """Initializes a new instance of EmbeddingPoolService.
+
+        Args:
+            model_name (str): The name or the path of the sentence transformer loaded by the workers.
+            workers (int, optional): The amount of worker processes. Defaults to None (the amount of CPU cores).
+            threads_per_worker (int, optional): The amount of inference threads of every worker. Defaults to 1.
+            shard_size (int, optional): The amount of texts sent to a worker at once. Defaults to 512.
+            store_path (str, optional): The path of the SQLite database of the persistent embedding store. Defaults to None (no caching).
+            model_id (str, optional): The ID of the model in the store (e.g. all-MiniLM-L6-v2). Defaults to None.
+            store_max_entries (int, optional): The maximum amount of stored embeddings (see EmbeddingStore). Defaults to 0 (unlimited).
+
+        Raises:
+            ValueError: Is thrown if workers, threads_per_worker or shard_size is not positive or if a store path is given without model_id.
+        """
+        Helper.ensure_type(model_name, str, "model_name must be a str!")
+        workers = (os.cpu_count() or 1) if workers is None else workers
+        Helper.ensure_type(workers, int, "workers must be an int!")
+        Helper.ensure_type(threads_per_worker, int, "threads_per_worker must be an int!")
+        Helper.ensure_type(shard_size, int, "shard_size must be an int!")
+
+        if workers <= 0:
+            raise ValueError("workers must be positive!")
+        if threads_per_worker <= 0:
+            raise ValueError("threads_per_worker must be positive!")
+        if shard_size <= 0:
+            raise ValueError("shard_size must be positive!")
+
+        if store_path is not None:
+            Helper.ensure_type(store_path, str, "store_path must be a str!")
+            Helper.ensure_type(model_id, str, "model_id must be a str!")
+            Helper.ensure_type(store_max_entries, int, "store_max_entries must be an int!")
+
+            if model_id.strip() == "":
+                raise ValueError("model_id cannot be empty!")
+            if store_max_entries < 0:
+                raise ValueError("store_max_entries cannot be negative!")
+
+        self.model_name = model_name
+        self.workers = workers
+        self.threads_per_worker = threads_per_worker
+        self.shard_size = shard_size
+        self.store_path = store_path
+        self.model_id = model_id
+        self.store_max_entries = store_max_entries
+        self.dimensions = None
+        self.__pool = None
+
+    def __enter__(self):
+        """Starts the worker processes.
+
+        Returns:
+            EmbeddingPoolService: The service.
+        """
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Stops the worker processes.
+        """
+        self.close()
+
+    def start(self):
+        """Starts the worker processes (every worker loads the model) unless they are running.
+        The thread limits of the native libraries (OMP_NUM_THREADS, MKL_NUM_THREADS and OPENBLAS_NUM_THREADS) are read once
+        when numpy and torch are imported, which happens in a spawned worker before the initializer runs.
+        Therefore they are set in the environment of this process while the workers are spawned (the workers inherit it)
+        and restored afterwards.
+        The embedding store is created (and switched to WAL mode) before the workers are spawned, so that they do not race to create it.
+        """
+        if self.__pool is not None:
+            return
+
+        if self.store_path is not None:
+            EmbeddingStore(self.store_path, self.store_max_entries).close()
+
+        context = multiprocessing.get_context("spawn")
+        variables = EmbeddingPoolService.__THREAD_VARIABLES + ["TOKENIZERS_PARALLELISM"]
+        previous_values = {el: os.environ.get(el) for el in variables}
+
+        try:
+            for variable in EmbeddingPoolService.__THREAD_VARIABLES:
+                os.environ[variable] = str(self.threads_per_worker)
+
+            os.environ["TOKENIZERS_PARALLELISM"] = "false"
+            self.__pool = context.Pool(self.workers, initializer=EmbeddingPoolService.initialize_worker,
+                                       initargs=(self.model_name, self.threads_per_worker, self.store_path, self.model_id,
+                                                 self.store_max_entries))
+        finally:
+            for variable, value in previous_values.items():
+                if value is None:
+                    os.environ.pop(variable, None)
+                else:
+                    os.environ[variable] = value
+
+        self.dimensions = self.__pool.apply(EmbeddingPoolService.get_worker_dimensions)
+
+    def close(self):
+        """Stops the worker processes.
+        """
+        if self.__pool is None:
+            return
+
+        self.__pool.close()
+        self.__pool.join()
+        self.__pool = None
+
+    def create_embedding(self, text: str) -> list[float]:
+        """Creates an embedding for the given text in a worker process.
+
+        Args:
+            text (str): The text to embed.
+
+        Returns:
+            list[float]: The resulting embedding vector.
+        """
+        Helper.ensure_type(text, str, "text must be a str!")
+        return self.create_embeddings([text])[0].tolist()
+
+    def create_embeddings(self, texts: list[str], batch_size: int = 64) -> np.ndarray:
+        """Creates embeddings for multiple texts in the worker processes.
+        The texts are sorted by length and split into shards of shard_size texts that are embedded concurrently.
+
+        Args:
+            texts (list[str]): The texts to embed.
+            batch_size (int, optional): The amount of texts per inference batch of a worker. Defaults to 64.
+
+        Raises:
+            ValueError: Is thrown if batch_size is not positive.
+
+        Returns:
+            np.ndarray: The resulting embedding vectors as float32 matrix (one row per text, in the order of the texts).
+        """
+        Helper.ensure_list_of_type(texts, str, "texts must be a list!", "texts must contain elements of type str!")
+        Helper.ensure_type(batch_size, int, "batch_size must be an int!")
+
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive!")
+
+        self.start()
+
+        if len(texts) == 0:
+            return np.zeros((0, self.dimensions), dtype=np.float32)
+
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]), reverse=True)
+        memory = shared_memory.SharedMemory(create=True, size=len(texts) * self.dimensions * 4)
+
+        try:
+            shards = [(memory.name, len(texts), order[i:i + self.shard_size], [texts[el] for el in order[i:i + self.shard_size]], batch_size)
+                      for i in range(0, len(order), self.shard_size)]
+
+            for _ in self.__pool.imap_unordered(EmbeddingPoolService.embed_shard, shards):
+                pass
+
+            return np.ndarray((len(texts), self.dimensions), dtype=np.float32, buffer=memory.buf).copy()
+        finally:
+            memory.close()
+            memory.unlink()
+
+    @staticmethod
+    def initialize_worker(model_name: str, threads: int, store_path: str = None, model_id: str = None, store_max_entries: int = 0):
+        """Limits the inference threads of torch, loads the sentence transformer and opens the embedding store of the worker
+        (runs once in every worker process).
+        The thread limits of the native libraries are already inherited from the environment set by start.
+
+        Args:
+            model_name (str): The name or the path of the sentence transformer.
+            threads (int): The amount of inference threads.
+            store_path (str, optional): The path of the SQLite database of the embedding store. Defaults to None (no caching).
+            model_id (str, optional): The ID of the model in the store. Defaults to None.
+            store_max_entries (int, optional): The maximum amount of stored embeddings. Defaults to 0 (unlimited).
+        """
+        import torch
+        from sentence_transformers import SentenceTransformer
+        from Services.transfomerembeddingservice import TransformerEmbeddingService
+        torch.set_num_threads(threads)
+        store = EmbeddingStore(store_path, store_max_entries) if store_path is not None else None
+        EmbeddingPoolService.__worker_embedding_service = TransformerEmbeddingService(SentenceTransformer(model_name), store, model_id)
+
+    @staticmethod
+    def get_worker_dimensions() -> int:
+        """Gets the dimensions of the embeddings of the model loaded by the worker process (without writing to the embedding store).
+
+        Returns:
+            int: The dimensions.
+        """
+        return int(len(EmbeddingPoolService.__worker_embedding_service.embedder.encode("dimensions")))
+
+    @staticmethod
+    def embed_shard(shard: tuple) -> int:
+        """Embeds a shard of texts in the worker process and writes the vectors into their rows of the shared memory block.
+
+        Args:
+            shard (tuple): (name of the shared memory block, amount of rows of the block, row of every text, texts, inference batch size).
+
+        Returns:
+            int: The amount of embedded texts.
+        """
+        memory_name, rows, indices, texts, batch_size = shard
+        embeddings = EmbeddingPoolService.__worker_embedding_service.create_embeddings(texts, batch_size)
+        memory = shared_memory.SharedMemory(name=memory_name)
+
+        try:
+            result = np.ndarray((rows, embeddings.shape[1]), dtype=np.float32, buffer=memory.buf)
+            result[indices] = embeddings
+            del result
+        finally:
+            memory.close()
+
+        return len(texts)
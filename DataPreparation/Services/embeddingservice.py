@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+import numpy as np
 
 class EmbeddingService(ABC):
     """Represents an abstract embedding service.
@@ -16,4 +17,18 @@ class EmbeddingService(ABC):
         Returns:
             list[float]: The resulting embedding vector.
         """
-        pass
\ No newline at end of file
+        pass
+
+    def create_embeddings(self, texts: list[str], batch_size: int = 64) -> np.ndarray:
+        """Creates embeddings for multiple texts.
+        Embeds the texts one by one unless overridden by a service that supports batched inference.
+
+        Args:
+            texts (list[str]): The texts to embed.
+            batch_size (int, optional): The amount of texts per inference batch. Defaults to 64.
+
+        Returns:
+            np.ndarray: The resulting embedding vectors as float32 matrix (one row per text, in the order of the texts).
+        """
+        embeddings = np.asarray([self.create_embedding(el) for el in texts], dtype=np.float32)
+        return embeddings.reshape(len(texts), -1) if len(texts) > 0 else np.zeros((0, 0), dtype=np.float32)
\ No newline at end of file
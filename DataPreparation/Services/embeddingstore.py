@@ -0,0 +1,169 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import numpy as np
+from Services.helper import Helper
+
+class EmbeddingStore:
+    """Represents a persistent embedding cache stored in a SQLite database.
+    The embeddings are keyed by the model ID and the hash of the (preprocessed) text and stored as float32 blobs,
+    so that texts embedded by an earlier run of a pipeline are not embedded again.
+    If the store holds more than max_entries embeddings, the oldest ones are removed.
+    """
+    __LOOKUP_BATCH_SIZE = 500
+
+    def __init__(self, path: str, max_entries: int = 0):
+        """Initializes a new instance of EmbeddingStore.
+
+        Args:
+            path (str): The path of the SQLite database (created if it does not exist).
+            max_entries (int, optional): The maximum amount of stored embeddings. Defaults to 0 (unlimited).
+
+        Raises:
+            ValueError: Is thrown if max_entries is negative.
+        """
+        Helper.ensure_type(path, str, "path must be a str!")
+        Helper.ensure_type(max_entries, int, "max_entries must be an int!")
+
+        if max_entries < 0:
+            raise ValueError("max_entries cannot be negative!")
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.__lock = threading.Lock()
+        self.__connection = sqlite3.connect(path, check_same_thread=False)
+        self.__connection.execute("PRAGMA journal_mode=WAL")
+        self.__connection.execute("PRAGMA synchronous=NORMAL")
+        self.__connection.execute("CREATE TABLE IF NOT EXISTS embeddings (model TEXT NOT NULL, hash BLOB NOT NULL, vector BLOB NOT NULL, "
+                                  "PRIMARY KEY (model, hash))")
+        self.__connection.commit()
+
+    def get_embeddings(self, model_id: str, texts: list[str]) -> dict:
+        """Looks up the stored embeddings of multiple texts.
+
+        Args:
+            model_id (str): The ID of the model.
+            texts (list[str]): The texts.
+
+        Returns:
+            dict: The found embeddings by the index of their text.
+            Dictionary format: {<text-index>: <float32-vector>, ...}.
+        """
+        Helper.ensure_type(model_id, str, "model_id must be a str!")
+        Helper.ensure_list_of_type(texts, str, "texts must be a list!", "texts must contain elements of type str!")
+        hash_to_indices = {}
+
+        for i, text in enumerate(texts):
+            hash_to_indices.setdefault(self.__get_hash(text), []).append(i)
+
+        hashes = list(hash_to_indices.keys())
+        result = {}
+
+        with self.__lock:
+            for start in range(0, len(hashes), EmbeddingStore.__LOOKUP_BATCH_SIZE):
+                batch = hashes[start:start + EmbeddingStore.__LOOKUP_BATCH_SIZE]
+                rows = self.__connection.execute("SELECT hash, vector FROM embeddings WHERE model = ? AND hash IN (" + ",".join("?" * len(batch)) + ")",
+                                                 [model_id] + batch).fetchall()
+
+                for text_hash, vector in rows:
+                    for i in hash_to_indices[text_hash]:
+                        result[i] = np.frombuffer(vector, dtype=np.float32)
+
+            self.hits += len(result)
+            self.misses += len(texts) - len(result)
+
+        return result
+
+    def put_embeddings(self, model_id: str, texts: list[str], embeddings: np.ndarray):
+        """Stores the embeddings of multiple texts (existing ones are replaced).
+        Removes the oldest embeddings afterwards if the store holds more than max_entries embeddings.
+
+        Args:
+            model_id (str): The ID of the model.
+            texts (list[str]): The texts.
+            embeddings (np.ndarray): The embeddings (one row per text).
+
+        Raises:
+            ValueError: Is thrown if the amount of embeddings does not match the amount of texts.
+        """
+        Helper.ensure_type(model_id, str, "model_id must be a str!")
+        Helper.ensure_list_of_type(texts, str, "texts must be a list!", "texts must contain elements of type str!")
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+
+        if len(embeddings) != len(texts):
+            raise ValueError("The amount of embeddings must match the amount of texts!")
+
+        rows = [(model_id, self.__get_hash(text), embedding.tobytes()) for text, embedding in zip(texts, embeddings)]
+
+        with self.__lock:
+            self.__connection.executemany("INSERT OR REPLACE INTO embeddings (model, hash, vector) VALUES (?, ?, ?)", rows)
+
+            if self.max_entries > 0:
+                excess = self.__connection.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0] - self.max_entries
+
+                if excess > 0:
+                    self.__connection.execute("DELETE FROM embeddings WHERE rowid IN (SELECT rowid FROM embeddings ORDER BY rowid LIMIT ?)", (excess,))
+
+            self.__connection.commit()
+
+    def compact(self, keep_model_ids: list[str] = None) -> dict:
+        """Removes the embeddings of other models (if keep_model_ids is given), trims the store to max_entries
+        and rebuilds the database file, so that the space of removed embeddings is returned to the file system.
+
+        Args:
+            keep_model_ids (list[str], optional): The IDs of the models whose embeddings are kept. Defaults to None (all models).
+
+        Returns:
+            dict: Dictionary format: {"removedEntries": <amount>, "entries": <amount>, "sizeBytes": <size-of-the-database-file>}.
+        """
+        if keep_model_ids is not None:
+            Helper.ensure_list_of_type(keep_model_ids, str, "keep_model_ids must be a list!", "keep_model_ids must contain elements of type str!")
+
+        with self.__lock:
+            before = self.__connection.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+            if keep_model_ids is not None:
+                self.__connection.execute("DELETE FROM embeddings WHERE model NOT IN (" + ",".join("?" * len(keep_model_ids)) + ")", keep_model_ids)
+
+            if self.max_entries > 0:
+                self.__connection.execute("DELETE FROM embeddings WHERE rowid NOT IN (SELECT rowid FROM embeddings ORDER BY rowid DESC LIMIT ?)",
+                                          (self.max_entries,))
+
+            self.__connection.commit()
+            self.__connection.execute("VACUUM")
+            self.__connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            after = self.__connection.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+        return {"removedEntries": before - after, "entries": after, "sizeBytes": os.path.getsize(self.path)}
+
+    def get_statistics(self) -> dict:
+        """Gets the amount of stored embeddings per model and the hit and miss counters.
+
+        Returns:
+            dict: Dictionary format: {"entries": {<model-id>: <amount>, ...}, "hits": <hits>, "misses": <misses>}.
+        """
+        with self.__lock:
+            rows = self.__connection.execute("SELECT model, COUNT(*) FROM embeddings GROUP BY model").fetchall()
+            return {"entries": {model: count for model, count in rows}, "hits": self.hits, "misses": self.misses}
+
+    def close(self):
+        """Closes the database.
+        """
+        with self.__lock:
+            self.__connection.close()
+
+    def __get_hash(self, text: str) -> bytes:
+        """Computes the key of a text.
+
+        Args:
+            text (str): The text.
+
+        Returns:
+            bytes: The hash of the text.
+        """
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
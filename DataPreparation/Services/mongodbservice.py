@@ -1,9 +1,13 @@
 from Services.helper import Helper
 import pymongo
+import time
+from typing import Iterator
 
 class MongoDBService:
     """Represents a service that communicates with a MongoDB cluster.
     """
+    DUPLICATE_KEY_ERROR = 11000
+
     def __init__(self, url):
         """Initializes a new instance of MongoDBService.
 
@@ -95,7 +99,7 @@ class MongoDBService:
         except Exception as e:
             raise e
         
-    def insert_data_batch(self, db_name: str, collection_name: str, data: list[dict], batch_size: int):
+    def insert_data_batch(self, db_name: str, collection_name: str, data: list[dict], batch_size: int, skip_duplicates: bool = False):
         """Inserts data in batches of specific size. 
 
         Args:
@@ -103,6 +107,8 @@ class MongoDBService:
             collection_name (str): The collection name.
             data (list[dict]):  The data stored as list of dictionaries.
             batch_size (int): The batch size. 
+            skip_duplicates (bool, optional): Boolean indicating whether documents whose _id (or another unique key) is already stored are skipped
+            (the batches are inserted unordered and duplicate key errors are ignored). Defaults to False.
 
         Raises:
             ValueError: Is thrown if batch_size is either 0 or negative.
@@ -111,6 +117,7 @@ class MongoDBService:
         Helper.ensure_type(collection_name, str, "collection_name must be a string!")
         Helper.ensure_list_of_type(data, dict, "data must be a list!", "data must contain elements of type dict!")
         Helper.ensure_type(batch_size, int, "batch_size must be an int!")
+        Helper.ensure_type(skip_duplicates, bool, "skip_duplicates must be a bool!")
 
         if batch_size <= 0:
             raise ValueError("batch_size cannot be less or equal to 0!")
@@ -126,7 +133,15 @@ class MongoDBService:
 
         current_index = 0
         for i in range(iteration_count):
-            collection.insert_many(data[current_index:current_index + batch_size])
+            if not skip_duplicates:
+                collection.insert_many(data[current_index:current_index + batch_size])
+            else:
+                try:
+                    collection.insert_many(data[current_index:current_index + batch_size], ordered=False)
+                except pymongo.errors.BulkWriteError as e:
+                    if any([el["code"] != MongoDBService.DUPLICATE_KEY_ERROR for el in e.details["writeErrors"]]) or e.details.get("writeConcernErrors"):
+                        raise e
+
             current_index += batch_size
         
     def insert_one_data(self, db_name: str, collection_name: str, data: dict):
@@ -153,13 +168,41 @@ class MongoDBService:
             raise e
         
         
-    def get_data(self, db_name: str, collection_name: str, query: dict) -> list:
+    def update_one_data(self, db_name: str, collection_name: str, query: dict, update: dict, upsert: bool):
+        """Updates the first document matching the query.
+
+        Args:
+            db_name (str): The name of the MongoDB database.
+            collection_name (str): The collection name.
+            query (dict): The query specified as a dictionary.
+            update (dict): The update operations specified as a dictionary.
+            upsert (bool): Boolean indicating whether the document should be inserted if no document matches the query.
+
+        Raises:
+            e: Error that occurred during the operation.
+        """
+        Helper.ensure_type(db_name, str, "db_name must be a string!")
+        Helper.ensure_type(collection_name, str, "collection_name must be a string!")
+        Helper.ensure_type(query, dict, "query must be a dict!")
+        Helper.ensure_type(update, dict, "update must be a dict!")
+        Helper.ensure_type(upsert, bool, "upsert must be a bool!")
+
+        try:
+            client = self.get_client()
+            db = client[db_name]
+            collection = db[collection_name]
+            collection.update_one(query, update, upsert=upsert)
+        except Exception as e:
+            raise e
+
+    def get_data(self, db_name: str, collection_name: str, query: dict, projection: dict = None) -> list:
         """Fetches data from the MongoDB database.
 
         Args:
             db_name (str): The name of the MongoDB database.
             collection_name (str): The collection name.
             query (dict): The query specified as a dictionary.
+            projection (dict, optional): The fields to return. Defaults to None (all fields).
 
         Raises:
             e: Error that occurred during the operation.
@@ -174,12 +217,262 @@ class MongoDBService:
             client = self.get_client()
             db = client[db_name]
             collection = db[collection_name]
-            result = collection.find(query)
+            result = collection.find(query, projection)
             return list(result)
         except Exception as e:
             raise e
 
-    
+    def get_distinct_values(self, db_name: str, collection_name: str, field: str, query: dict) -> list:
+        """Fetches the distinct values of a field of the documents matching the query.
+        The values are grouped by an aggregation (not by distinct, whose result is limited to 16 MB).
+
+        Args:
+            db_name (str): The name of the MongoDB database.
+            collection_name (str): The collection name.
+            field (str): The field.
+            query (dict): The query specified as a dictionary.
+
+        Raises:
+            e: Error that occurred during the operation.
+
+        Returns:
+            list: The distinct values.
+        """
+        Helper.ensure_type(db_name, str, "db_name must be a string!")
+        Helper.ensure_type(collection_name, str, "collection_name must be a string!")
+        Helper.ensure_type(field, str, "field must be a string!")
+
+        try:
+            client = self.get_client()
+            db = client[db_name]
+            collection = db[collection_name]
+            return [el["_id"] for el in collection.aggregate([{"$match": query}, {"$group": {"_id": "$" + field}}], allowDiskUse=True)
+                    if el["_id"] is not None]
+        except Exception as e:
+            raise e
+
+    def delete_data(self, db_name: str, collection_name: str, query: dict) -> int:
+        """Deletes the documents matching the query.
+
+        Args:
+            db_name (str): The name of the MongoDB database.
+            collection_name (str): The collection name.
+            query (dict): The query specified as a dictionary.
+
+        Raises:
+            e: Error that occurred during the operation.
+
+        Returns:
+            int: The amount of deleted documents.
+        """
+        Helper.ensure_type(db_name, str, "db_name must be a string!")
+        Helper.ensure_type(collection_name, str, "collection_name must be a string!")
+        Helper.ensure_type(query, dict, "query must be a dict!")
+
+        try:
+            client = self.get_client()
+            db = client[db_name]
+            collection = db[collection_name]
+            return collection.delete_many(query).deleted_count
+        except Exception as e:
+            raise e
+
+    def upsert_data_batch(self, db_name: str, collection_name: str, data: list[dict], batch_size: int):
+        """Inserts or replaces documents (matched by their _id) in batches of specific size.
+
+        Args:
+            db_name (str): The name of the MongoDB database.
+            collection_name (str): The collection name.
+            data (list[dict]): The data stored as list of dictionaries (every dictionary needs an _id).
+            batch_size (int): The batch size.
+
+        Raises:
+            ValueError: Is thrown if batch_size is either 0 or negative.
+        """
+        Helper.ensure_type(db_name, str, "db_name must be a string!")
+        Helper.ensure_type(collection_name, str, "collection_name must be a string!")
+        Helper.ensure_list_of_type(data, dict, "data must be a list!", "data must contain elements of type dict!")
+        Helper.ensure_type(batch_size, int, "batch_size must be an int!")
+
+        if batch_size <= 0:
+            raise ValueError("batch_size cannot be less or equal to 0!")
+
+        client = self.get_client()
+        db = client[db_name]
+        collection = db[collection_name]
+
+        for current_index in range(0, len(data), batch_size):
+            collection.bulk_write([pymongo.ReplaceOne({"_id": el["_id"]}, el, upsert=True) for el in data[current_index:current_index + batch_size]],
+                                  ordered=False)
+
+    def get_search_index(self, db_name: str, collection_name: str, index_name: str) -> dict:
+        """Fetches the description of a search index (its type, status and latest definition).
+
+        Args:
+            db_name (str): The name of the MongoDB database.
+            collection_name (str): The collection name.
+            index_name (str): The name of the search index.
+
+        Raises:
+            e: Error that occurred during the operation.
+
+        Returns:
+            dict: The description or None if the search index does not exist.
+            Dictionary format: {"name": <name>, "type": <search|vectorSearch>, "latestDefinition": <definition>, ...}.
+        """
+        Helper.ensure_type(db_name, str, "db_name must be a string!")
+        Helper.ensure_type(collection_name, str, "collection_name must be a string!")
+        Helper.ensure_type(index_name, str, "index_name must be a string!")
+
+        try:
+            client = self.get_client()
+            db = client[db_name]
+            collection = db[collection_name]
+            result = list(collection.list_search_indexes(index_name))
+            return result[0] if len(result) > 0 else None
+        except Exception as e:
+            raise e
+
+    def ensure_search_index(self, db_name: str, collection_name: str, index_dict: dict, timeout_seconds: float = 600) -> str:
+        """Makes the search index match the given index information.
+        The index is created if it does not exist and its definition is updated in place if its fields differ.
+        An index of another type (e.g. an Atlas Search index with a knnVector field instead of a vectorSearch index) cannot be updated,
+        so it is dropped and created again (the index cannot be queried until it has been rebuilt).
+
+        Args:
+            db_name (str): The name of the MongoDB database.
+            collection_name (str): The collection name.
+            index_dict (dict): The index information as a dictionary. Dictionary format: {"name": <name>, "type": <type>, "definition": <definition>}.
+            timeout_seconds (float, optional): The maximum time to wait for a dropped index to disappear. Defaults to 600.
+
+        Raises:
+            TimeoutError: Is thrown if a dropped index did not disappear within timeout_seconds.
+
+        Returns:
+            str: What was done ("created", "updated", "recreated" or "unchanged").
+        """
+        Helper.ensure_type(index_dict, dict, "index_dict must be a dict!")
+        index_name = index_dict["name"]
+        index_type = index_dict.get("type", "search")
+        existing = self.get_search_index(db_name, collection_name, index_name)
+
+        if existing is None:
+            MongoDBService.create_search_index(self, db_name, collection_name, index_dict)
+            return "created"
+
+        if existing.get("type", "search") == index_type:
+            if MongoDBService.__definition_matches(index_dict["definition"], existing.get("latestDefinition", {})):
+                return "unchanged"
+
+            client = self.get_client()
+            client[db_name][collection_name].update_search_index(index_name, index_dict["definition"])
+            return "updated"
+
+        client = self.get_client()
+        collection = client[db_name][collection_name]
+        collection.drop_search_index(index_name)
+        deadline = time.monotonic() + timeout_seconds
+
+        while self.get_search_index(db_name, collection_name, index_name) is not None:
+            if time.monotonic() > deadline:
+                raise TimeoutError("The search index " + index_name + " was not dropped within " + str(timeout_seconds) + " seconds!")
+            time.sleep(5)
+
+        MongoDBService.create_search_index(self, db_name, collection_name, index_dict)
+        return "recreated"
+
+    def update_data_batch(self, db_name: str, collection_name: str, updates: list[tuple], batch_size: int) -> int:
+        """Updates all documents matching the queries in batches of specific size.
+
+        Args:
+            db_name (str): The name of the MongoDB database.
+            collection_name (str): The collection name.
+            updates (list[tuple]): The updates as (query, update operations) tuples of dictionaries.
+            batch_size (int): The batch size.
+
+        Raises:
+            ValueError: Is thrown if batch_size is either 0 or negative.
+
+        Returns:
+            int: The amount of modified documents.
+        """
+        Helper.ensure_type(db_name, str, "db_name must be a string!")
+        Helper.ensure_type(collection_name, str, "collection_name must be a string!")
+        Helper.ensure_list_of_type(updates, tuple, "updates must be a list!", "updates must contain elements of type tuple!")
+        Helper.ensure_type(batch_size, int, "batch_size must be an int!")
+
+        if batch_size <= 0:
+            raise ValueError("batch_size cannot be less or equal to 0!")
+
+        client = self.get_client()
+        db = client[db_name]
+        collection = db[collection_name]
+        modified = 0
+
+        for current_index in range(0, len(updates), batch_size):
+            result = collection.bulk_write([pymongo.UpdateMany(query, update) for query, update in updates[current_index:current_index + batch_size]],
+                                           ordered=False)
+            modified += result.modified_count
+
+        return modified
+
+    def get_data_batches(self, db_name: str, collection_name: str, query: dict, batch_size: int) -> Iterator[list]:
+        """Fetches data from the MongoDB database in batches, so that only one batch is held in memory at a time.
+
+        Args:
+            db_name (str): The name of the MongoDB database.
+            collection_name (str): The collection name.
+            query (dict): The query specified as a dictionary.
+            batch_size (int): The amount of documents per batch.
+
+        Raises:
+            ValueError: Is thrown if batch_size is either 0 or negative.
+
+        Returns:
+            Iterator[list]: The batches of retrieved results.
+        """
+        Helper.ensure_type(db_name, str, "db_name must be a string!")
+        Helper.ensure_type(collection_name, str, "collection_name must be a string!")
+        Helper.ensure_type(batch_size, int, "batch_size must be an int!")
+
+        if batch_size <= 0:
+            raise ValueError("batch_size cannot be less or equal to 0!")
+
+        client = self.get_client()
+        db = client[db_name]
+        collection = db[collection_name]
+        batch = []
+
+        for document in collection.find(query, batch_size=batch_size):
+            batch.append(document)
+
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+
+        if len(batch) > 0:
+            yield batch
+
+    @staticmethod
+    def __definition_matches(definition: dict, latest_definition: dict) -> bool:
+        """Checks whether the fields of a search index definition are part of the latest definition reported by the cluster
+        (the cluster adds default values, so only the given keys are compared).
+
+        Args:
+            definition (dict): The wanted definition.
+            latest_definition (dict): The latest definition of the existing index.
+
+        Returns:
+            bool: Boolean indicating whether the definitions match.
+        """
+        if "fields" in definition:
+            wanted = definition["fields"]
+            existing = latest_definition.get("fields", [])
+            return len(wanted) == len(existing) and all([any([all([other.get(key) == value for key, value in el.items()]) for other in existing])
+                                                         for el in wanted])
+
+        return definition == {key: latest_definition.get(key) for key in definition.keys()}
+
     def __set_url(self, url: str):
         """Sets the URL of the MongoDB cluster.
 
@@ -1,6 +1,8 @@
+import datetime
 from Services.mongodbservice import MongoDBService
 from Services.helper import Helper
 import pandas as pd
+from typing import Iterator
 
 class PapersService(MongoDBService):
     """Represents a service that deals with data from MongoDB.
@@ -19,12 +21,17 @@ class PapersService(MongoDBService):
 
     def insert_papers(self, dict_papers: list[dict]):
         """Inserts papers into MongoDB database.
+        Stamps every paper with the time of the insertion (updatedAt), which the incremental chunk pipelines use as watermark.
 
         Args:
             dict_papers (list[dict]): The paper information stored as list of dictionaries.
         """
         Helper.ensure_list_of_type(dict_papers, dict, "dict_papers must be a list!", "dict_papers must contain elements of type dict!")
-        
+        updated_at = datetime.datetime.now(datetime.timezone.utc)
+
+        for el in dict_papers:
+            el["updatedAt"] = updated_at
+
         self.insert_data("papersDB", "papers", dict_papers)
 
     def get_papers(self, query: dict) -> list:
@@ -38,6 +45,73 @@ class PapersService(MongoDBService):
         """
         return self.get_data("papersDB", "papers", query)
 
+    def get_papers_in_batches(self, query: dict, batch_size: int) -> Iterator[list]:
+        """Fetches the papers specified by a query in batches.
+
+        Args:
+            query (dict): The query in dictionary format.
+            batch_size (int): The amount of papers per batch.
+
+        Returns:
+            Iterator[list]: The batches of papers.
+        """
+        return self.get_data_batches("papersDB", "papers", query, batch_size)
+
+    def get_paper_ids(self, query: dict = None) -> list:
+        """Fetches the IDs of the papers (matching the query).
+
+        Args:
+            query (dict, optional): The query in dictionary format. Defaults to None (all papers).
+
+        Returns:
+            list: The IDs of the papers.
+        """
+        return self.get_distinct_values("papersDB", "papers", "id", {} if query is None else query)
+
+    def stamp_unstamped_papers(self, updated_at: datetime.datetime) -> int:
+        """Stamps the papers inserted before the papers were stamped (without updatedAt) with the given time.
+
+        Args:
+            updated_at (datetime.datetime): The time.
+
+        Returns:
+            int: The amount of stamped papers.
+        """
+        Helper.ensure_type(updated_at, datetime.datetime, "updated_at must be a datetime!")
+
+        return self.update_data_batch("papersDB", "papers", [({"updatedAt": {"$exists": False}}, {"$set": {"updatedAt": updated_at}})], 1)
+
+    def delete_papers(self, query: dict) -> int:
+        """Deletes the papers specified by a query and records a tombstone (paper ID and time of the deletion) for every deleted paper
+        in the collection deletedPapers, from which the incremental chunk pipelines learn which chunks to remove.
+
+        Args:
+            query (dict): The query in dictionary format.
+
+        Returns:
+            int: The amount of deleted papers.
+        """
+        Helper.ensure_type(query, dict, "query must be a dict!")
+        paper_ids = self.get_paper_ids(query)
+
+        if len(paper_ids) == 0:
+            return 0
+
+        deleted_at = datetime.datetime.now(datetime.timezone.utc)
+        self.insert_data("papersDB", "deletedPapers", [{"paperId": el, "deletedAt": deleted_at} for el in paper_ids])
+        return self.delete_data("papersDB", "papers", {"id": {"$in": paper_ids}})
+
+    def get_deleted_paper_ids(self, since: datetime.datetime = None) -> list:
+        """Fetches the IDs of the papers deleted by delete_papers.
+
+        Args:
+            since (datetime.datetime, optional): The earliest time of deletion. Defaults to None (all deleted papers).
+
+        Returns:
+            list: The IDs of the papers.
+        """
+        return self.get_distinct_values("papersDB", "deletedPapers", "paperId", {} if since is None else {"deletedAt": {"$gte": since}})
+
     def get_papers_as_df(self):
         """Retrieves all papers as a data frame.
 
@@ -26,12 +26,13 @@ class TitleChunksService(MongoDBService):
         
         self.insert_data("papersDB", "titleChunks", dict_chunks)
 
-    def insert_chunks_in_batch(self, dict_chunks: list[dict], batch_size: int):
+    def insert_chunks_in_batch(self, dict_chunks: list[dict], batch_size: int, skip_duplicates: bool = False):
         """Inserts title chunks in batches of specific size.
 
         Args:
             dict_chunks (list[dict]): The chunk information stored as list of dictionaries.
             batch_size (int): The batch size. 
+            skip_duplicates (bool, optional): Boolean indicating whether chunks whose _id is already stored are skipped. Defaults to False.
 
         Raises:
             ValueError: Is thrown if batch_size is either 0 or negative.
@@ -42,7 +43,7 @@ class TitleChunksService(MongoDBService):
         if batch_size <= 0:
             raise ValueError("batch_size cannot be less or equal to 0!")
         
-        self.insert_data_batch("papersDB", "titleChunks", dict_chunks, batch_size)
+        self.insert_data_batch("papersDB", "titleChunks", dict_chunks, batch_size, skip_duplicates)
 
     def aggregate_data(self, aggregation_data: list[dict]):
         """Aggregates the data using specific operations.
@@ -76,3 +77,74 @@ class TitleChunksService(MongoDBService):
         """
         Helper.ensure_type(index_data, dict, "index_data must be a dict!")
         MongoDBService.create_search_index(self, "papersDB", "titleChunks", index_data)
+
+    def upsert_chunks_in_batch(self, dict_chunks: list[dict], batch_size: int):
+        """Inserts or replaces title chunks (matched by their _id) in batches of specific size.
+
+        Args:
+            dict_chunks (list[dict]): The chunks stored as list of dictionaries (every dictionary needs an _id).
+            batch_size (int): The batch size.
+        """
+        self.upsert_data_batch("papersDB", "titleChunks", dict_chunks, batch_size)
+
+    def delete_chunks(self, query: dict) -> int:
+        """Deletes the title chunks specified by a query.
+
+        Args:
+            query (dict): The query in dictionary format.
+
+        Returns:
+            int: The amount of deleted chunks.
+        """
+        return self.delete_data("papersDB", "titleChunks", query)
+
+    def get_content_hashes(self, paper_ids: list[str]) -> dict:
+        """Fetches the content hashes of the papers that the title chunks were created from.
+
+        Args:
+            paper_ids (list[str]): The IDs of the papers.
+
+        Returns:
+            dict: Dictionary format: {<paper-id>: <content-hash>, ...} (papers without chunks or without hash are missing).
+        """
+        Helper.ensure_list_of_type(paper_ids, str, "paper_ids must be a list!", "paper_ids must contain elements of type str!")
+        chunks = self.get_data("papersDB", "titleChunks", {"paperId": {"$in": paper_ids}, "contentHash": {"$exists": True}},
+                               {"_id": 0, "paperId": 1, "contentHash": 1})
+        return {el["paperId"]: el["contentHash"] for el in chunks}
+
+    def get_paper_ids(self, query: dict = None) -> list:
+        """Fetches the IDs of the papers that have title chunks (matching the query).
+
+        Args:
+            query (dict, optional): The query of the chunks in dictionary format. Defaults to None (all chunks).
+
+        Returns:
+            list: The IDs of the papers.
+        """
+        return self.get_distinct_values("papersDB", "titleChunks", "paperId", {} if query is None else query)
+
+    def ensure_search_index(self, index_data: dict) -> str:
+        """Creates the search index of the title chunks or migrates an existing one to the given index data
+        (see MongoDBService.ensure_search_index).
+
+        Args:
+            index_data (dict): Index data stored as a dictionary.
+
+        Returns:
+            str: What was done ("created", "updated", "recreated" or "unchanged").
+        """
+        Helper.ensure_type(index_data, dict, "index_data must be a dict!")
+
+        return MongoDBService.ensure_search_index(self, "papersDB", "titleChunks", index_data)
+
+    def update_chunks_in_batch(self, updates: list[tuple], batch_size: int) -> int:
+        """Updates the title chunks matching the queries in batches of specific size.
+
+        Args:
+            updates (list[tuple]): The updates as (query, update operations) tuples of dictionaries.
+            batch_size (int): The batch size.
+
+        Returns:
+            int: The amount of modified chunks.
+        """
+        return self.update_data_batch("papersDB", "titleChunks", updates, batch_size)
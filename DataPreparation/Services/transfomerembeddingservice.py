@@ -1,22 +1,41 @@
+import numpy as np
 from sentence_transformers import SentenceTransformer
 from Services.embeddingservice import EmbeddingService
+from Services.embeddingstore import EmbeddingStore
 from Services.helper import Helper
 
 class TransformerEmbeddingService(EmbeddingService):
     """Represents an embedding service that uses sentence transformers
     to embed data (neural network model designed to generate dense vector representations for sentences).
+    Multiple texts are embedded in batches of texts of similar length, so that little padding is computed.
+    Embeddings found in an optional persistent embedding store are not computed again; computed embeddings are written through to it.
 
     Args:
         EmbeddingService (_type_): The base embedding service. 
     """
-    def __init__(self, embedder: SentenceTransformer):
+    def __init__(self, embedder: SentenceTransformer, store: EmbeddingStore = None, model_id: str = None):
         """Initializes a new instance of TransformerEmbeddingService.
 
         Args:
             embedder (SentenceTransformer): The sentence transformer.
+            store (EmbeddingStore, optional): The persistent embedding store. Defaults to None (no caching).
+            model_id (str, optional): The ID of the model in the store (e.g. all-MiniLM-L6-v2). Defaults to None.
+
+        Raises:
+            ValueError: Is thrown if a store is given without model_id.
         """
         Helper.ensure_instance(embedder, SentenceTransformer, "embedder must be of type SentenceTransformer!")
+
+        if store is not None:
+            Helper.ensure_instance(store, EmbeddingStore, "store must be of type EmbeddingStore!")
+            Helper.ensure_type(model_id, str, "model_id must be a str!")
+
+            if model_id.strip() == "":
+                raise ValueError("model_id cannot be empty!")
+
         self.embedder = embedder
+        self.store = store
+        self.model_id = model_id
 
     def create_embedding(self, text: str) -> list[float]:
         """Creates an embedding for the given text using a sentence transformer.
@@ -31,6 +50,78 @@ class TransformerEmbeddingService(EmbeddingService):
 
         if type(text) != str:
             raise TypeError("text must be a str!")
+
+        if self.store is not None:
+            return self.create_embeddings([text])[0].tolist()
     
         text_embedding = [float(el) for el in list(self.embedder.encode(text))]
-        return text_embedding
\ No newline at end of file
+        return text_embedding
+
+    def create_embeddings(self, texts: list[str], batch_size: int = 64) -> np.ndarray:
+        """Creates embeddings for multiple texts using a sentence transformer.
+        The texts are sorted by length and split into batches, so that every batch is padded to a similar length.
+        Texts found in the embedding store are not embedded again.
+
+        Args:
+            texts (list[str]): The texts to embed.
+            batch_size (int, optional): The amount of texts per inference batch. Defaults to 64.
+
+        Raises:
+            ValueError: Is thrown if batch_size is not positive.
+
+        Returns:
+            np.ndarray: The resulting embedding vectors as float32 matrix (one row per text, in the order of the texts).
+        """
+        Helper.ensure_list_of_type(texts, str, "texts must be a list!", "texts must contain elements of type str!")
+        Helper.ensure_type(batch_size, int, "batch_size must be an int!")
+
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive!")
+
+        if self.store is None:
+            return self.__encode(texts, batch_size)
+
+        found = self.store.get_embeddings(self.model_id, texts)
+        missing = [i for i in range(len(texts)) if i not in found]
+        computed = self.__encode([texts[i] for i in missing], batch_size)
+
+        if len(missing) > 0:
+            self.store.put_embeddings(self.model_id, [texts[i] for i in missing], computed)
+
+        dimensions = len(next(iter(found.values()))) if len(found) > 0 else computed.shape[1]
+        result = np.empty((len(texts), dimensions), dtype=np.float32)
+
+        for i, embedding in found.items():
+            result[i] = embedding
+
+        if len(missing) > 0:
+            result[missing] = computed
+
+        return result
+
+    def __encode(self, texts: list[str], batch_size: int) -> np.ndarray:
+        """Runs the sentence transformer on batches of texts of similar length.
+
+        Args:
+            texts (list[str]): The texts to embed.
+            batch_size (int): The amount of texts per inference batch.
+
+        Returns:
+            np.ndarray: The resulting embedding vectors as float32 matrix (one row per text, in the order of the texts).
+        """
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]), reverse=True)
+        result = None
+
+        for start in range(0, len(order), batch_size):
+            indices = order[start:start + batch_size]
+            embeddings = self.embedder.encode([texts[i] for i in indices], batch_size=len(indices), convert_to_numpy=True)
+
+            if result is None:
+                result = np.empty((len(texts), embeddings.shape[1]), dtype=np.float32)
+
+            result[indices] = embeddings
+
+        if result is None:
+            return np.zeros((0, self.embedder.get_sentence_embedding_dimension() or 0), dtype=np.float32)
+
+        return result
\ No newline at end of file
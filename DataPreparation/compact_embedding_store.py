@@ -0,0 +1,19 @@
+import argparse
+from Services.embeddingstore import EmbeddingStore
+
+# Compacts the persistent embedding store of the chunk pipelines.
+# Run "python compact_embedding_store.py embeddings.sqlite" (rebuilds the file)
+# or "python compact_embedding_store.py embeddings.sqlite --keep-model all-MiniLM-L6-v2 --max-entries 1000000".
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compacts the persistent embedding store.")
+    parser.add_argument("path", help="The path of the SQLite database of the store.")
+    parser.add_argument("--keep-model", action="append", default=None, help="The ID of a model whose embeddings are kept (repeatable, default: all models).")
+    parser.add_argument("--max-entries", type=int, default=0, help="The maximum amount of kept embeddings, the newest are kept (default: 0, unlimited).")
+    args = parser.parse_args()
+
+    store = EmbeddingStore(args.path, args.max_entries)
+    print("before: " + str(store.get_statistics()["entries"]))
+    result = store.compact(args.keep_model)
+    print("after: " + str(store.get_statistics()["entries"]))
+    print("removed " + str(result["removedEntries"]) + " embeddings, " + str(result["entries"]) + " left, file size: " + str(result["sizeBytes"]) + " bytes")
+    store.close()
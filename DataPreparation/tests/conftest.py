@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The pipelines import their modules relative to the project directory (e.g. Services.embeddingstore).
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+from Services.embeddingstore import EmbeddingStore
+
+
+@pytest.fixture
+def path(tmp_path) -> str:
+    return str(tmp_path / "embeddings.sqlite")
+
+
+def create_embeddings(count: int, start: int = 0) -> np.ndarray:
+    return np.arange(start, start + count, dtype=np.float32).reshape(-1, 1).repeat(3, axis=1)
+
+
+def test_stored_embeddings_are_found_by_model_and_text(path):
+    store = EmbeddingStore(path)
+    store.put_embeddings("model-a", ["first", "second"], create_embeddings(2))
+
+    found = store.get_embeddings("model-a", ["second", "missing", "first", "second"])
+
+    assert sorted(found.keys()) == [0, 2, 3]
+    assert found[0].tolist() == [1.0, 1.0, 1.0]
+    assert found[2].tolist() == [0.0, 0.0, 0.0]
+    assert store.get_embeddings("model-b", ["first"]) == {}
+    assert store.get_statistics() == {"entries": {"model-a": 2}, "hits": 3, "misses": 2}
+    store.close()
+
+
+def test_embeddings_survive_reopening(path):
+    store = EmbeddingStore(path)
+    store.put_embeddings("model-a", ["first"], create_embeddings(1, 5))
+    store.close()
+    store = EmbeddingStore(path)
+
+    assert store.get_embeddings("model-a", ["first"])[0].tolist() == [5.0, 5.0, 5.0]
+    store.close()
+
+
+def test_oldest_embeddings_are_evicted_beyond_max_entries(path):
+    store = EmbeddingStore(path, 3)
+    store.put_embeddings("model-a", ["t0", "t1"], create_embeddings(2))
+    store.put_embeddings("model-a", ["t2", "t3"], create_embeddings(2, 2))
+
+    assert sorted(store.get_embeddings("model-a", ["t0", "t1", "t2", "t3"]).keys()) == [1, 2, 3]
+    store.close()
+
+
+def test_compact_removes_other_models_and_trims_to_the_newest(path):
+    store = EmbeddingStore(path)
+    store.put_embeddings("old-model", ["t" + str(i) for i in range(50)], create_embeddings(50))
+    store.put_embeddings("model-a", ["t0", "t1", "t2"], create_embeddings(3))
+    store.max_entries = 2
+
+    result = store.compact(["model-a"])
+
+    assert result["removedEntries"] == 51
+    assert result["entries"] == 2
+    assert result["sizeBytes"] > 0
+    assert store.get_statistics()["entries"] == {"model-a": 2}
+    assert sorted(store.get_embeddings("model-a", ["t0", "t1", "t2"]).keys()) == [1, 2]
+    store.close()
+
+
+def test_mismatching_amount_of_embeddings_is_rejected(path):
+    store = EmbeddingStore(path)
+
+    with pytest.raises(ValueError):
+        store.put_embeddings("model-a", ["first", "second"], create_embeddings(1))
+
+    store.close()
+
+
+def test_negative_max_entries_is_rejected(path):
+    with pytest.raises(ValueError):
+        EmbeddingStore(path, -1)
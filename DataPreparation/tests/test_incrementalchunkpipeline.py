@@ -0,0 +1,219 @@
+import copy
+import datetime
+import numpy as np
+import nltk
+import pytest
+from ETLPipelines.mongodbtoabstractchunks import MongoDBPapersToAbstractChunksPipeline
+from Services.embeddingservice import EmbeddingService
+from Services.mongodbservice import MongoDBService
+from Services.papersservice import PapersService
+from Services.preprocessingservice import PreprocessingService
+
+
+class InMemoryCollections:
+    """Stands in for the data access methods of MongoDBService (equality, $in, $gte and $exists queries, $set and $inc updates).
+    """
+    def __init__(self):
+        self.collections = {}
+
+    def get(self, collection_name: str) -> list[dict]:
+        return self.collections.setdefault(collection_name, [])
+
+    def matches(self, document: dict, query: dict) -> bool:
+        for key, condition in query.items():
+            if not isinstance(condition, dict):
+                if document.get(key) != condition:
+                    return False
+            elif "$in" in condition and document.get(key) not in condition["$in"]:
+                return False
+            elif "$gte" in condition and (key not in document or document[key] < condition["$gte"]):
+                return False
+            elif "$exists" in condition and (key in document) != condition["$exists"]:
+                return False
+
+        return True
+
+    def update(self, document: dict, update: dict):
+        document.update(update.get("$set", {}))
+
+        for key, value in update.get("$inc", {}).items():
+            document[key] = document.get(key, 0) + value
+
+    def install(self, monkeypatch):
+        collections = self
+
+        def insert_data(self, db_name, collection_name, data):
+            collections.get(collection_name).extend(copy.deepcopy(data))
+
+        def get_data(self, db_name, collection_name, query, projection=None):
+            return [copy.deepcopy(el) for el in collections.get(collection_name) if collections.matches(el, query)]
+
+        def get_distinct_values(self, db_name, collection_name, field, query):
+            return list(dict.fromkeys([el[field] for el in collections.get(collection_name) if collections.matches(el, query)]))
+
+        def delete_data(self, db_name, collection_name, query):
+            documents = collections.get(collection_name)
+            kept = [el for el in documents if not collections.matches(el, query)]
+            collections.collections[collection_name] = kept
+            return len(documents) - len(kept)
+
+        def update_one_data(self, db_name, collection_name, query, update, upsert):
+            documents = [el for el in collections.get(collection_name) if collections.matches(el, query)]
+
+            if len(documents) == 0 and upsert:
+                documents = [dict(query)]
+                collections.get(collection_name).append(documents[0])
+
+            for el in documents[:1]:
+                collections.update(el, update)
+
+        def update_data_batch(self, db_name, collection_name, updates, batch_size):
+            modified = 0
+
+            for query, update in updates:
+                for el in collections.get(collection_name):
+                    if collections.matches(el, query):
+                        collections.update(el, update)
+                        modified += 1
+
+            return modified
+
+        def upsert_data_batch(self, db_name, collection_name, data, batch_size):
+            ids = set([el["_id"] for el in data])
+            collections.collections[collection_name] = [el for el in collections.get(collection_name) if el.get("_id") not in ids]
+            collections.get(collection_name).extend(copy.deepcopy(data))
+
+        for method in [insert_data, get_data, get_distinct_values, delete_data, update_one_data, update_data_batch, upsert_data_batch]:
+            monkeypatch.setattr(MongoDBService, method.__name__, method)
+
+        monkeypatch.setattr(MongoDBService, "ensure_search_index", lambda self, db_name, collection_name, index_dict, timeout_seconds=600: "unchanged")
+
+
+class CountingEmbeddingService(EmbeddingService):
+    def __init__(self):
+        self.embedded = []
+
+    def create_embedding(self, text: str) -> list[float]:
+        return self.create_embeddings([text])[0].tolist()
+
+    def create_embeddings(self, texts: list[str], batch_size: int = 64) -> np.ndarray:
+        self.embedded += texts
+        return np.ones((len(texts), 2), dtype=np.float32)
+
+
+class LowercasePreprocessingService(PreprocessingService):
+    def preprocess(self, data: str) -> str:
+        return data.lower()
+
+
+@pytest.fixture
+def collections(monkeypatch) -> InMemoryCollections:
+    collections = InMemoryCollections()
+    collections.install(monkeypatch)
+    monkeypatch.setenv("MONGODB_URL", "mongodb://localhost")
+    monkeypatch.setattr(nltk, "sent_tokenize", lambda text, language="english": [el for el in text.split(". ") if el != ""])
+    return collections
+
+
+def create_paper(paper_id: str, abstract: str) -> dict:
+    return {"id": paper_id, "abstract": abstract, "source": "arxiv", "authors": [{"fullName": "Jane Doe"}]}
+
+
+def run(reconcile_deletions: bool = False) -> tuple:
+    embedding_service = CountingEmbeddingService()
+    pipeline = MongoDBPapersToAbstractChunksPipeline(embedding_service, LowercasePreprocessingService(), 2, "nltk_data",
+                                                     incremental=True, reconcile_deletions=reconcile_deletions)
+    pipeline.extract()
+    pipeline.transform()
+    pipeline.load()
+    return pipeline, embedding_service
+
+
+def get_chunk_ids(collections: InMemoryCollections) -> list[str]:
+    return sorted([el["_id"] for el in collections.get("abstractChunks")])
+
+
+def get_version(collections: InMemoryCollections) -> int:
+    versions = collections.get("corpusVersion")
+    return versions[0]["version"] if len(versions) > 0 else 0
+
+
+def touch(collections: InMemoryCollections, paper_id: str, **fields):
+    for el in collections.get("papers"):
+        if el["id"] == paper_id:
+            el.update(fields, updatedAt=datetime.datetime.now(datetime.timezone.utc))
+
+
+def test_unchanged_papers_are_not_chunked_again(collections):
+    PapersService("mongodb://localhost").insert_papers([create_paper("p1", "Care homes. Elderly people."), create_paper("p2", "Digital health.")])
+
+    pipeline, embedding_service = run()
+
+    assert sorted([el["id"] for el in pipeline.extracted_papers]) == ["p1", "p2"]
+    assert get_chunk_ids(collections) == ["p1:0", "p1:1", "p2:0"]
+    assert len(collections.get("chunkIndexPaperState")) == 2
+
+    pipeline, embedding_service = run()
+
+    assert pipeline.extracted_papers == []
+    assert embedding_service.embedded == []
+    assert get_version(collections) == 1
+
+
+def test_only_papers_whose_content_changed_are_chunked_again(collections):
+    PapersService("mongodb://localhost").insert_papers([create_paper("p1", "Care homes. Elderly people."), create_paper("p2", "Digital health.")])
+    run()
+    touch(collections, "p1", abstract="Care homes.")
+    touch(collections, "p2")
+
+    pipeline, embedding_service = run()
+
+    assert [el["id"] for el in pipeline.extracted_papers] == ["p1"]
+    assert embedding_service.embedded == ["care homes."]
+    assert get_chunk_ids(collections) == ["p1:0", "p2:0"]
+
+
+def test_changed_filter_fields_are_chunked_again(collections):
+    PapersService("mongodb://localhost").insert_papers([create_paper("p1", "Care homes.")])
+    run()
+    touch(collections, "p1", source="scholar")
+    run()
+
+    assert [el["source"] for el in collections.get("abstractChunks")] == ["scholar"]
+
+
+def test_chunk_hashes_of_earlier_runs_are_used_if_no_hash_was_stored(collections):
+    PapersService("mongodb://localhost").insert_papers([create_paper("p1", "Care homes.")])
+    run()
+    collections.collections["chunkIndexPaperState"] = []
+    touch(collections, "p1")
+
+    assert run()[0].extracted_papers == []
+
+
+def test_tombstones_remove_the_chunks_of_deleted_papers(collections):
+    papers_service = PapersService("mongodb://localhost")
+    papers_service.insert_papers([create_paper("p1", "Care homes."), create_paper("p2", "Digital health."), create_paper("p3", "Air quality.")])
+    run()
+    papers_service.delete_papers({"id": {"$in": ["p1", "p3"]}})
+    papers_service.insert_papers([create_paper("p3", "Air quality.")])
+
+    pipeline, embedding_service = run()
+
+    assert pipeline.deleted_paper_ids == ["p1"]
+    assert get_chunk_ids(collections) == ["p2:0", "p3:0"]
+    assert sorted([el["paperId"] for el in collections.get("chunkIndexPaperState")]) == ["p2", "p3"]
+
+
+def test_reconciliation_finds_papers_deleted_without_tombstone(collections):
+    papers_service = PapersService("mongodb://localhost")
+    papers_service.insert_papers([create_paper("p1", "Care homes."), create_paper("p2", "Digital health.")])
+    run()
+    collections.collections["papers"] = [el for el in collections.get("papers") if el["id"] != "p1"]
+
+    assert run()[0].deleted_paper_ids == []
+
+    pipeline, embedding_service = run(reconcile_deletions=True)
+
+    assert pipeline.deleted_paper_ids == ["p1"]
+    assert get_chunk_ids(collections) == ["p2:0"]
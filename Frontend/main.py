@@ -71,7 +71,7 @@ with title_block as tab_subblock_1:
     slider_val = gr.Slider(app_settings["perTitleMin"], app_settings["perTitleMax"], step=1, label="Amount",
                            info=f"Choose between {app_settings['perTitleMin']} and {app_settings['perTitleMax']}", interactive=True,
                            show_label=True, render=True)
-    choice = gr.Radio(choices=["lexical", "semantic"], label="Query type", value="lexical")
+    choice = gr.Radio(choices=["lexical", "semantic", "hybrid"], label="Query type", value="lexical")
     submit_button = gr.Button(variant='primary', value="Submit", size='sm', elem_classes="submit-button")
     gr.Markdown("## Results: ")
 
@@ -86,14 +86,17 @@ with title_block as tab_subblock_1:
             return
         
         if choice is None:
-            gr.Warning("Pick either semantic or lexical search!", 5)
+            gr.Warning("Pick either semantic, lexical or hybrid search!", 5)
             return
         
         gr.Info("Fetching data... Please wait...", duration=0)
         
         try:
-             if choice == "semantic":   
-                response = title_service.search_by_title(query, slider_val)    
+             if choice == "semantic" or choice == "hybrid":   
+                if choice == "semantic":
+                    response = title_service.search_by_title(query, slider_val)    
+                else:
+                    response = title_service.search_by_title_hybrid(query, slider_val)
 
                 if len(response) == 0:
                     gr.Markdown("### No results found!")
@@ -130,7 +133,7 @@ with abstract_block as tab_subblock_2:
     slider_val = gr.Slider(app_settings["perAbstractMin"], app_settings["perAbstractMax"], step=1, label="Amount",
                            info=f"Choose between {app_settings['perAbstractMin']} and {app_settings['perAbstractMax']}", interactive=True,
                            show_label=True, render=True)
-    choice = gr.Radio(choices=["lexical", "semantic"], label="Query type", value="lexical")
+    choice = gr.Radio(choices=["lexical", "semantic", "hybrid"], label="Query type", value="lexical")
     submit_button = gr.Button(variant='primary', value="Submit", size='sm', elem_classes="submit-button")
     gr.Markdown("## Results: ")
 
@@ -145,14 +148,17 @@ with abstract_block as tab_subblock_2:
             return
         
         if choice is None:
-            gr.Warning("Pick either semantic or lexical search!", 5)
+            gr.Warning("Pick either semantic, lexical or hybrid search!", 5)
             return
         
         gr.Info("Fetching data... Please wait...", duration=0)
         
         try:
-            if choice == "semantic":   
-                response = abstract_service.search_by_abstract(query, slider_val) 
+            if choice == "semantic" or choice == "hybrid":   
+                if choice == "semantic":
+                    response = abstract_service.search_by_abstract(query, slider_val) 
+                else:
+                    response = abstract_service.search_by_abstract_hybrid(query, slider_val)
 
                 if len(response) == 0:
                     gr.Markdown("### No results found!")
@@ -84,6 +84,40 @@ class AbstractSearchService:
         except Exception as e:
             raise
 
+    def search_by_abstract_hybrid(self, query: str, amount: int) -> list[PaperToAbstractChunks]:
+        """Creates a HTTP request to search for abstracts using hybrid (lexical and semantic) search.
+
+        Args:
+            query (str): The query.
+            amount (int): The amount of matches to return.
+
+        Raises:
+            ValueError: Is thrown if the length of the query is 0.
+            ValueError: Is thrown if the amount of matches is negative.
+
+        Returns:
+            list[PaperToAbstractChunks]: The matches (papers matched only lexically carry no chunks).
+        """
+        Helper.ensure_type(query, str, "query must be a string!")
+        Helper.ensure_type(amount, int, "amount must be an int!")
+
+        if len(query) == 0:
+            raise ValueError("query cannot be empty!")
+        
+        if amount < 0:
+            raise ValueError("amount cannot be negative!")
+        
+        try:
+            request_body = json.dumps({"query": query, "amount": amount})
+            headers = {"Content-Type": "application/json"}
+            response = requests.post(self.__config.backend_url + "/abstract/hybrid", data=request_body, headers=headers)
+            response_json = response.json()
+            result_list = response_json["result"]      
+            result = self.__parse_search_by_abstract_result_list(result_list)
+            return result
+        except Exception as e:
+            raise
+
     def __parse_search_by_abstract_result_list(self, result_list: list) -> list[PaperToAbstractChunks]:
         """Parses the response dictionary of a semantic search in abstracts to the corresponding classes.
 
@@ -81,6 +81,39 @@ class TitleSearchService:
             raise
 
     
+    def search_by_title_hybrid(self, query: str, amount: int) -> list[Paper]:
+        """Creates a HTTP request to search for titles using hybrid (lexical and semantic) search.
+
+        Args:
+            query (str): The query.
+            amount (int): The amount of matches to return.
+
+        Raises:
+            ValueError: Is thrown if the length of the query is 0.
+            ValueError: Is thrown if the amount of matches is negative.
+
+        Returns:
+            list[Paper]: The matches (list of instances of Paper).
+        """
+        Helper.ensure_type(query, str, "query must be a string!")
+        Helper.ensure_type(amount, int, "amount must be an int!")
+
+        if len(query) == 0:
+            raise ValueError("query cannot be empty!")
+        
+        if amount < 0:
+            raise ValueError("amount cannot be negative!")
+        
+        try:
+            request_body = json.dumps({"query": query, "amount": amount})
+            headers = {"Content-Type": "application/json"}
+            response = requests.post(self.__config.backend_url + "/title/hybrid", data=request_body, headers=headers)
+            response_json = response.json()
+            result = self.__parse_search_by_title_result_list(response_json["result"])
+            return result
+        except Exception as e:
+            raise
+
     def __parse_search_by_title_lex_result_list(self, result_list: list) -> list[Paper]:
         """Parses the response dictionary of a lexical search in titles to the corresponding classes.
 